@@ -1,23 +1,40 @@
-from typing import Dict
+import contextlib
+import json
+import threading
+from typing import Dict, Set, Tuple
 
 from rdflib.store import Store
 from neo4j import GraphDatabase, Driver
-from neo4j import WRITE_ACCESS
+from neo4j import WRITE_ACCESS, READ_ACCESS
 import logging
 
 from rdflib_neo4j.Neo4jTriple import Neo4jTriple
+from rdflib_neo4j.ProgressTracker import ProgressTracker
+from rdflib_neo4j.QueryProfiler import QueryProfiler
+from rdflib_neo4j.SeenUriCache import SeenUriCache
+from rdflib_neo4j.UriInterner import UriInterner
 from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
-from rdflib_neo4j.config.const import NEO4J_DRIVER_USER_AGENT_NAME
+from rdflib_neo4j.config.const import NEO4J_DRIVER_USER_AGENT_NAME, HANDLE_CONTEXT_STRATEGY, GRAPH_LABEL_PREFIX, \
+    GRAPH_URI_PROPERTY, DatabaseNotEmptyException, CypherMultipleTypesMultiValueException, CONTENT_HASH_PROPERTY, \
+    INTERNAL_PROPERTIES, DEFAULT_GRAPH_URI, NEO4J_ROW_ERROR_CODES
 from rdflib_neo4j.config.utils import check_auth_data
-from rdflib_neo4j.query_composers.NodeQueryComposer import NodeQueryComposer
+from rdflib_neo4j.query_composers.NodeQueryComposer import NodeQueryComposer, resource_pattern
+from rdflib_neo4j.query_composers.NodeDeleteQueryComposer import NodeDeleteQueryComposer
+from rdflib_neo4j.query_composers.ParamBuffer import in_transactions
 from rdflib_neo4j.query_composers.RelationshipQueryComposer import RelationshipQueryComposer
+from rdflib_neo4j.query_composers.RelationshipDeleteQueryComposer import RelationshipDeleteQueryComposer
+from rdflib_neo4j.query_composers.TripleQueryComposer import TripleQueryComposer
+from rdflib import Graph, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.plugins.serializers.nt import _nt_row
 from rdflib.term import BNode
-from rdflib_neo4j.utils import handle_neo4j_driver_exception, bnode_to_uri
+from rdflib_neo4j.utils import handle_neo4j_driver_exception, bnode_to_uri, context_to_graph_uri, escape_identifier
 
 
 class Neo4jStore(Store):
 
     context_aware = True
+    graph_aware = True
 
     def __init__(self, config: Neo4jStoreConfig, neo4j_driver: Driver | None = None):
         self.__open = False
@@ -37,15 +54,59 @@ class Neo4jStore(Store):
         self.buffer_max_size = config.batch_size
 
         self.total_triples = 0
+        self.total_subjects = 0
+        self.flushed_rows = 0
+        self.progress_tracker = ProgressTracker(config.progress_callback, config.progress_interval)
         self.node_buffer_size = 0
         self.rel_buffer_size = 0
-        self.node_buffer: Dict[str, NodeQueryComposer] = {}
-        self.rel_buffer: Dict[str, RelationshipQueryComposer] = {}
+        # Buffers are partitioned by (context, label key, new nodes) and
+        # (context, relationship type, endpoints known to exist)
+        self.node_buffer: Dict[Tuple[str, str, bool], NodeQueryComposer] = {}
+        self.rel_buffer: Dict[Tuple[str, str, bool], RelationshipQueryComposer] = {}
         self.current_subject: Neo4jTriple = None
+        self.node_delete_buffer_size = 0
+        self.rel_delete_buffer_size = 0
+        self.node_delete_buffer: Dict[Tuple[str, str], NodeDeleteQueryComposer] = {}
+        self.rel_delete_buffer: Dict[Tuple[str, str], RelationshipDeleteQueryComposer] = {}
+        self.current_removal: Neo4jTriple = None
+        self.pending_removals = False
         self.mappings = config.custom_mappings
         self.handle_vocab_uri_strategy = config.handle_vocab_uri_strategy
         self.handle_multival_strategy = config.handle_multival_strategy
         self.multival_props_predicates = config.multival_props_names
+        self.handle_context_strategy = config.handle_context_strategy
+        self.uri_interner = UriInterner(config.uri_intern_limit)
+        self.seen_uris = SeenUriCache(config.seen_uri_cache_size) if config.seen_uri_cache_size else None
+        # Under initial_load, the nodes created so far (buffered or flushed), None once initial_load_uri_limit is reached
+        self.created_uris = set()
+        # Under skip_unchanged, the subjects waiting for the stored hashes of their batch,
+        # and the nodes whose hash must be dropped because triples were removed from them, by context
+        self.staged_subjects = []
+        self.stale_hashes: Dict[str, list] = {}
+        self.skipped_subjects = 0
+        # Rows that could not be written are recorded in the dead letter file, with their source triples
+        self.track_sources = config.dead_letter_file is not None
+        self.dead_letter_count = 0
+        self.profiler = QueryProfiler(config.profile_sample_rate) if config.profile_sample_rate else None
+        # The predicates are resolved once for the accumulators, which are reset and reused for every subject
+        self.compiled = config.compile()
+        prefixes = {value: key for key, value in config.get_prefixes().items()}  # Reversing the Prefix dictionary
+        self.subject_accumulator = self.__new_accumulator(prefixes, removal=False)
+        self.removal_accumulator = self.__new_accumulator(prefixes, removal=True)
+        # Under thread_safe, every thread accumulates its own subjects, swapped in while it holds the lock.
+        # The buffers it detaches are written once it releases the lock, one thread at a time under the write lock
+        self.lock = threading.RLock() if config.thread_safe else None
+        self.write_lock = threading.Lock() if config.thread_safe else None
+        self.thread_states: Dict[int, list] = {}
+        self.detached = []
+        # The threads with subjects in the node and relationship buffers, and the errors of the failed writes
+        # holding their rows, raised by their next call
+        self.row_owner = None
+        self.node_writers: Set[int] = set()
+        self.rel_writers: Set[int] = set()
+        self.thread_errors: Dict[int, Exception] = {}
+        # Guards the errors, which are kept while holding the write lock
+        self.errors_lock = threading.Lock()
 
     def open(self, configuration, create=True):
         """
@@ -58,6 +119,9 @@ class Neo4jStore(Store):
         """
         self.__create_session()
         self.__constraint_check(create)
+        if self.config.initial_load:
+            self.__empty_check()
+            self.created_uris = set()
         self.__set_open(True)
 
     def close(self, commit_pending_transaction=True):
@@ -72,8 +136,90 @@ class Neo4jStore(Store):
             self.commit(commit_rels=True)
         self.session.close()
         self.__set_open(False)
+        self.progress_tracker.report(self.total_triples, self.total_subjects, self.flushed_rows, done=True)
         print(f"IMPORTED {self.total_triples} TRIPLES")
+        if self.profiler is not None and self.profiler.stats:
+            print(f"QUERY PROFILE:\n{self.profiler.report()}")
+        if self.skipped_subjects:
+            print(f"SKIPPED {self.skipped_subjects} UNCHANGED SUBJECTS")
+        if self.dead_letter_count:
+            print(f"{self.dead_letter_count} ROWS WRITTEN TO {self.config.dead_letter_file}")
         self.total_triples=0
+        self.total_subjects = 0
+        self.flushed_rows = 0
+        self.skipped_subjects = 0
+        self.progress_tracker.restart()
+        self.dead_letter_count = 0
+
+    def progress(self):
+        """
+        Returns a snapshot of the progress of the import, with the same content as the events sent to the
+        progress_callback of the configuration.
+
+        Returns:
+            ProgressEvent: The triples and subjects added and their rates, the rows flushed and, if an input is
+                tracked, the bytes consumed and an ETA.
+        """
+        return self.progress_tracker.event(self.total_triples, self.total_subjects, self.flushed_rows)
+
+    def track_input(self, stream, total_bytes=None):
+        """
+        Tracks the position in the input being parsed, so that the progress reports the bytes consumed and an ETA.
+
+        Args:
+            stream: The binary file object passed to Graph.parse.
+            total_bytes: The size of the input. Default: the size of the file behind the stream, if any
+        """
+        self.progress_tracker.track_input(stream, total_bytes)
+
+    def profile_summary(self):
+        """
+        Returns the cost of the queries written so far, by composer signature, the most expensive first.
+        Empty unless profile_sample_rate is set in the configuration.
+
+        Returns:
+            list: A dict per composer signature with its composer, query, runs, profiled_runs, db_hits, rows,
+                time_ms (server-side), the ResultSummary counters and the operator tree of the last profiled run.
+        """
+        return self.profiler.summary() if self.profiler is not None else []
+
+    def dedup_relationships(self, rel_types=None, batch_size=10000) -> int:
+        """
+        Deletes the duplicate relationships, keeping one relationship per type, start node, end node and graphUri.
+        Meant to follow a load with create_relationships, whose input was not fully deduplicated.
+
+        The start nodes are processed in transactions of batch_size nodes, so the memory used doesn't depend
+        on the size of the graph.
+
+        Args:
+            rel_types: The relationship types to deduplicate, None for every type. Default: None
+            batch_size: The number of start nodes processed per transaction. Default: 10000
+
+        Returns:
+            int: The number of relationships deleted.
+        """
+        assert self.is_open(), "The Store must be open."
+        # The pending writes must be in the database to be deduplicated
+        self.commit()
+        type_filter = "WHERE type(r) IN $rel_types " if rel_types is not None else ""
+        query = f"""MATCH (from:Resource)
+                    CALL {{ WITH from
+                        MATCH (from)-[r]->(to:Resource) {type_filter}
+                        WITH to, type(r) AS rel_type, r.`{GRAPH_URI_PROPERTY}` AS graph, collect(r) AS rels
+                        WHERE size(rels) > 1
+                        UNWIND tail(rels) AS duplicate
+                        DELETE duplicate
+                    }} IN TRANSACTIONS OF $batch_size ROWS"""
+        params = {"rel_types": list(rel_types) if rel_types is not None else None, "batch_size": batch_size}
+        try:
+            # CALL IN TRANSACTIONS must run in an auto-commit transaction
+            with self.write_lock if self.write_lock is not None else contextlib.nullcontext():
+                summary = self.session.run(query, parameters=params).consume()
+        except Exception as e:
+            e = handle_neo4j_driver_exception(e)
+            logging.error(e)
+            raise e
+        return summary.counters.relationships_deleted
 
     def is_open(self):
         """
@@ -90,28 +236,42 @@ class Neo4jStore(Store):
 
         Args:
             triple: The triple to add.
-            context: The context of the triple (default: None).
+            context: The context of the triple (default: None). Used according to the handle_context_strategy.
             quoted (bool): Flag indicating whether the triple is quoted (default: False).
         """
         assert self.is_open(), "The Store must be open."
         assert context != self, "Can not add triple directly to store"
+        if self.lock is None:
+            self.__add_triple(triple, context)
+            return
+        self.__locked(self.__add_triple, triple, context)
 
+    def __add_triple(self, triple, context):
+        """
+        Adds a triple to the subject being accumulated, flushing the buffers when they are full.
+        """
         # Unpacking the triple
         (subject, predicate, object) = triple
 
-        self.__check_current_subject(subject=subject)
-        self.current_subject.parse_triple(triple=triple, mappings=self.mappings)
+        # Removals and additions must reach the database in the order they were made
+        if self.pending_removals:
+            self.__commit()
+
+        self.__check_current_subject(subject=subject, context=context)
+        self.current_subject.parse_triple(triple=triple)
         self.total_triples += 1
+        if self.total_triples >= self.progress_tracker.next_check:
+            self.progress_tracker.report(self.total_triples, self.total_subjects, self.flushed_rows)
 
         # If batching, we push whenever the buffers are filled with enough data
         try:
             if self.batching:
                 if self.node_buffer_size >= self.buffer_max_size:
-                    self.commit(commit_nodes=True)
+                    self.__commit(commit_nodes=True)
                 if self.rel_buffer_size >= self.buffer_max_size:
-                    self.commit(commit_rels=True)
+                    self.__commit(commit_rels=True)
             else:
-                self.commit()
+                self.__commit()
         except Exception as e:
             print(f"Flushing all query params due to error: {e}")
             self.__close_on_error()
@@ -125,14 +285,288 @@ class Neo4jStore(Store):
             commit_nodes (bool): Flag indicating whether to commit the nodes in the buffer.
             commit_rels (bool): Flag indicating whether to commit the relationships in the buffer.
         """
+        if self.lock is None:
+            self.__commit(commit_nodes, commit_rels)
+            return
+        self.__locked(self.__commit_threads, commit_nodes, commit_rels, accumulators=False)
+
+    def rollback(self):
+        """
+        Discards the changes buffered since the last commit, including the subjects being accumulated by every
+        thread. The batches already flushed stay in the database.
+        """
+        with self.lock if self.lock is not None else contextlib.nullcontext():
+            for state in self.thread_states.values():
+                state[0] = state[2] = None
+            self.current_subject = self.current_removal = None
+            self.staged_subjects = []
+            self.stale_hashes = {}
+            self.__close_on_error()
+            self.node_buffer_size = self.rel_buffer_size = 0
+            self.node_delete_buffer_size = self.rel_delete_buffer_size = 0
+            self.pending_removals = False
+            self.node_writers, self.rel_writers = set(), set()
+            if self.created_uris:
+                # Some of the nodes marked as created were discarded, the rest of the load MERGEs its nodes
+                self.created_uris = None
+
+    def __commit_threads(self, commit_nodes, commit_rels):
+        """
+        Stores the subjects being accumulated by every thread, each of them starts a new one with its next triple,
+        then flushes the buffers. The states of the threads that are gone are dropped.
+        """
+        alive = {thread.ident for thread in threading.enumerate()}
+        try:
+            for ident, state in list(self.thread_states.items()):
+                self.row_owner = ident
+                self.__swap_accumulators(state)
+                try:
+                    self.__store_pending()
+                finally:
+                    self.__swap_accumulators(state)
+                if ident not in alive:
+                    del self.thread_states[ident]
+            self.row_owner = threading.get_ident()
+            self.__commit(commit_nodes, commit_rels)
+        finally:
+            self.row_owner = None
+
+    def __commit(self, commit_nodes=False, commit_rels=False):
+        """
+        Stores the subject and removal being accumulated, then flushes the buffers.
+        """
+        self.__store_pending()
+        self.__flushBuffer(commit_nodes, commit_rels)
+
+    def __store_pending(self):
+        """
+        Stores the subject and removal being accumulated in the buffers.
+        """
         # To prevent edge cases for the last declaration in the file.
         if self.current_subject:
             self.__store_current_subject()
             self.current_subject = None
-        self.__flushBuffer(commit_nodes, commit_rels)
+        if self.current_removal:
+            self.__store_current_removal()
+            self.current_removal = None
+
+    def __locked(self, action, *args, accumulators=True):
+        """
+        Runs an action on the store under the lock, with the accumulators of the calling thread swapped in, then
+        writes the buffers it detached once the lock is released, so that the other threads keep parsing meanwhile.
+        The errors of the failed writes of other threads that held rows of the calling thread are raised afterwards,
+        and a commit raises the ones of every thread.
+
+        Args:
+            action: The method to run.
+            args: The arguments of the method.
+            accumulators: If the accumulators of the calling thread are swapped in, False for a commit. Default: True
+        """
+        self.lock.acquire()
+        try:
+            if accumulators:
+                with self.__thread_accumulators():
+                    action(*args)
+            else:
+                action(*args)
+            flushes, self.detached = self.detached, []
+            if flushes:
+                # Taken before the lock is released, so that the buffers are written in the order they were detached
+                self.write_lock.acquire()
+        finally:
+            self.lock.release()
+        if flushes:
+            try:
+                self.__write_flushes(flushes)
+            finally:
+                self.write_lock.release()
+        with self.errors_lock:
+            if accumulators:
+                errors = [self.thread_errors.pop(threading.get_ident())] \
+                    if threading.get_ident() in self.thread_errors else []
+            else:
+                errors, self.thread_errors = list(self.thread_errors.values()), {}
+        if errors:
+            raise errors[0]
+
+    @contextlib.contextmanager
+    def __thread_accumulators(self):
+        """
+        Swaps in the subject and removal accumulated by the calling thread for the duration of the block.
+        Must be entered while holding the lock.
+        """
+        self.row_owner = threading.get_ident()
+        state = self.thread_states.get(self.row_owner)
+        if state is None:
+            state = self.thread_states[threading.get_ident()] = [
+                None, self.__new_accumulator(self.subject_accumulator.prefixes, removal=False),
+                None, self.__new_accumulator(self.subject_accumulator.prefixes, removal=True)]
+        self.__swap_accumulators(state)
+        try:
+            yield
+        finally:
+            self.__swap_accumulators(state)
+            self.row_owner = None
+
+    def __swap_accumulators(self, state):
+        """
+        Exchanges the current subject and removal, and their accumulators, with the ones held by a thread state.
+        """
+        shared = [self.current_subject, self.subject_accumulator, self.current_removal, self.removal_accumulator]
+        self.current_subject, self.subject_accumulator, self.current_removal, self.removal_accumulator = state
+        state[:] = shared
+
+    def triples(self, triple_pattern, context=None):
+        """
+        Streams the triples matching a pattern from the Neo4j database.
+
+        Pending buffered data is committed first, so that the read sees everything added so far.
+        Results are fetched lazily, `fetch_size` records at a time.
+
+        Args:
+            triple_pattern: The (subject, predicate, object) pattern to match. None is a wildcard.
+            context: The context to read from (default: None). Unless the handle_context_strategy is IGNORE,
+                a named graph restricts the match to the triples added to it.
+
+        Yields:
+            tuple: The matching triple and an iterator over its contexts: the named graphs it was added to, or the
+                default graph (the Dataset default graph identifier).
+        """
+        assert self.is_open(), "The Store must be open."
+        self.commit()
+        graph = self.__read_graph_uri(context)
+        composer = TripleQueryComposer(triple_pattern=triple_pattern, config=self.config, context=graph)
+        graphs = {graph: context} if graph is not None else {}
+        for shape, query, params in composer.write_queries():
+            for record in self.stream_query(query=query, params=params):
+                contexts = [graphs.get(uri) or graphs.setdefault(uri, self.__context_graph(uri))
+                            for uri in composer.read_graphs(record)]
+                for triple in composer.read_triples(shape, record):
+                    yield triple, iter(contexts)
+
+    def __context_graph(self, graph_uri):
+        """
+        Returns the Graph backed by the store for a named graph URI, or for the default graph when None.
+        """
+        return Graph(store=self, identifier=URIRef(graph_uri) if graph_uri is not None else DATASET_DEFAULT_GRAPH_ID)
+
+    def contexts(self, triple=None):
+        """
+        Lists the named graphs stored in the database. Under the IGNORE strategy there are none.
+
+        Args:
+            triple: Kept to respect the signature but currently not used.
+
+        Yields:
+            Graph: One graph per named graph URI.
+        """
+        assert self.is_open(), "The Store must be open."
+        self.commit()
+        if self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+            query = f"""MATCH (n:Resource) WHERE n.{GRAPH_URI_PROPERTY} <> '{DEFAULT_GRAPH_URI}'
+                        RETURN DISTINCT n.{GRAPH_URI_PROPERTY} AS graph"""
+        elif self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.LABEL:
+            query = f"""CALL db.labels() YIELD label WHERE label STARTS WITH '{GRAPH_LABEL_PREFIX}'
+                        RETURN substring(label, size('{GRAPH_LABEL_PREFIX}')) AS graph"""
+        else:
+            return
+        for record in self.stream_query(query=query, params={}):
+            yield self.__context_graph(record["graph"])
+
+    def add_graph(self, graph):
+        """
+        Adds a graph to the store. Named graphs only exist in the database through their triples, so nothing is written.
+
+        Args:
+            graph: The graph to add.
+        """
+        assert self.is_open(), "The Store must be open."
+
+    def remove_graph(self, graph):
+        """
+        Removes every triple of a named graph, or of the default graph of a Dataset. Under HANDLE_CONTEXT_STRATEGY.IGNORE,
+        and for a graph without URI, triples can't be told apart by graph and nothing is removed.
+
+        Args:
+            graph: The graph to remove.
+        """
+        assert self.is_open(), "The Store must be open."
+        if self.__read_graph_uri(graph) is not None:
+            self.remove((None, None, None), context=graph)
+
+    def stream_query(self, query, params):
+        """
+        Runs a read query on a dedicated session and lazily yields its records.
+
+        The driver pulls `fetch_size` records at a time, so large results are never held fully in memory.
+        The session is closed when the records are exhausted or the generator is discarded.
+
+        Args:
+            query (str): The Cypher query to execute.
+            params: The parameters to pass to the query.
+        """
+        with self.__get_driver().session(default_access_mode=READ_ACCESS,
+                                         fetch_size=self.config.fetch_size) as session:
+            try:
+                result = session.run(query, parameters=params)
+                for record in result:
+                    yield record
+            except Exception as e:
+                e = handle_neo4j_driver_exception(e)
+                logging.error(e)
+                raise e
 
     def remove(self, triple, context=None, txn=None):
-        raise NotImplementedError("This is a streamer so it doesn't preserve the state, there is no removal feature.")
+        """
+        Removes a triple from the Neo4j store.
+
+        Removals are buffered and flushed in batches exactly like additions: a literal removes (or shrinks, under
+        ARRAY) the property, an rdf:type removes the label and a resource deletes the relationship.
+        Nodes themselves are never deleted. A pattern with wildcards (None) is first resolved with triples().
+
+        Args:
+            triple: The triple (or triple pattern) to remove.
+            context: The context of the triple (default: None). Used according to the handle_context_strategy.
+            txn: Kept to respect the signature but currently not used.
+        """
+        assert self.is_open(), "The Store must be open."
+        (subject, predicate, object) = triple
+        if subject is None or predicate is None or object is None:
+            # The matches are collected before removing, so that the read is not affected by the deletes
+            for matched in [t for t, _ in self.triples(triple, context=context)]:
+                self.remove(matched, context=context)
+            return
+        if self.lock is None:
+            self.__remove_triple(triple, context)
+            return
+        self.__locked(self.__remove_triple, triple, context)
+
+    def __remove_triple(self, triple, context):
+        """
+        Adds a triple to the removal being accumulated, flushing the delete buffers when they are full.
+        """
+        (subject, predicate, object) = triple
+
+        # Removals and additions must reach the database in the order they were made
+        if not self.pending_removals:
+            self.__commit()
+            self.pending_removals = True
+
+        self.__check_current_removal(subject=subject, context=context)
+        self.current_removal.parse_triple(triple=triple)
+
+        try:
+            if self.batching:
+                if self.node_delete_buffer_size >= self.buffer_max_size:
+                    self.__commit(commit_nodes=True)
+                if self.rel_delete_buffer_size >= self.buffer_max_size:
+                    self.__commit(commit_rels=True)
+            else:
+                self.__commit()
+        except Exception as e:
+            print(f"Flushing all query params due to error: {e}")
+            self.__close_on_error()
+            raise e
 
     def __close_on_error(self):
         """
@@ -144,6 +578,10 @@ class Neo4jStore(Store):
             node_buffer.empty_query_params()
         for rel_buffer in self.rel_buffer.values():
             rel_buffer.empty_query_params()
+        for node_buffer in self.node_delete_buffer.values():
+            node_buffer.empty_query_params()
+        for rel_buffer in self.rel_delete_buffer.values():
+            rel_buffer.empty_query_params()
 
     def __set_open(self, val: bool):
         """
@@ -185,13 +623,24 @@ class Neo4jStore(Store):
             create (bool): Flag indicating whether to create the constraint if not found.
 
         """
+        # Under the PROPERTY context strategy a resource has one node per named graph, so (uri, graphUri) is the key
+        if self.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+            properties = '["uri", "graphUri"]'
+            create_constraint = """
+               CREATE CONSTRAINT n10s_unique_uri_graph IF NOT EXISTS FOR (r:Resource) REQUIRE (r.uri, r.graphUri) IS UNIQUE
+               """
+        else:
+            properties = '["uri"]'
+            create_constraint = """
+               CREATE CONSTRAINT n10s_unique_uri IF NOT EXISTS FOR (r:Resource) REQUIRE r.uri IS UNIQUE
+               """
         # Test connectivity to backend and check that constraint on :Resource(uri) is present
-        constraint_check = """
+        constraint_check = f"""
            SHOW CONSTRAINTS YIELD * 
            WHERE type = "UNIQUENESS" 
                AND entityType = "NODE" 
                AND labelsOrTypes = ["Resource"] 
-               AND properties = ["uri"] 
+               AND properties = {properties} 
            RETURN COUNT(*) = 1 AS constraint_found
            """
         result = self.session.run(constraint_check)
@@ -200,11 +649,8 @@ class Neo4jStore(Store):
         if not constraint_found and create:
             try:
                 # Create the uniqueness constraint
-                create_constraint = """
-                   CREATE CONSTRAINT n10s_unique_uri IF NOT EXISTS FOR (r:Resource) REQUIRE r.uri IS UNIQUE
-                   """
                 self.session.run(create_constraint)
-                print("Uniqueness constraint on :Resource(uri) is created.")
+                print(f"Uniqueness constraint on :Resource({properties}) is created.")
             except Exception as e:
                 print("Error: Unable to create the uniqueness constraint. Make sure you have the necessary privileges.")
                 print("Exception: ", e)
@@ -214,38 +660,188 @@ class Neo4jStore(Store):
                                             "CREATE CONSTRAINT n10s_unique_uri FOR (r:Resource) REQUIRE r.uri IS UNIQUE. Or provide create=True to create it."} 
                 """)
 
-    def __store_current_subject_props(self):
+    def __graph_uri(self, context):
+        """
+        Returns the graph URI to partition the writes by, None under the IGNORE strategy. The default graph is written
+        as DEFAULT_GRAPH_URI, so that its nodes and relationships never match the ones of a named graph.
+        """
+        if self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.IGNORE:
+            return None
+        return context_to_graph_uri(context) or DEFAULT_GRAPH_URI
+
+    def __read_graph_uri(self, context):
+        """
+        Returns the graph URI to restrict the reads to, DEFAULT_GRAPH_URI for the default graph of a Dataset.
+        None reads every graph: no context, a graph without URI (e.g. a plain Graph) or the IGNORE strategy.
+        """
+        if self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.IGNORE:
+            return None
+        if getattr(context, "identifier", None) == DATASET_DEFAULT_GRAPH_ID:
+            return DEFAULT_GRAPH_URI
+        return context_to_graph_uri(context)
+
+    def __node_labels(self, triple: Neo4jTriple):
+        """
+        Returns the labels to set on the node of a subject, including the graph label under the LABEL strategy.
+        """
+        # The composer keeps its own copy, since the accumulator is reused for the next subject
+        if triple.context not in (None, DEFAULT_GRAPH_URI) and self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.LABEL:
+            return frozenset(triple.labels | {f"{GRAPH_LABEL_PREFIX}{triple.context}"})
+        return frozenset(triple.labels)
+
+    def __empty_check(self):
+        """
+        Checks that the database is empty, as required by the initial_load mode.
+
+        Raises:
+            DatabaseNotEmptyException: If the database contains any node.
+        """
+        result = self.session.run("MATCH (n) WITH n LIMIT 1 RETURN count(n) AS nodes")
+        if next((x["nodes"] for x in result), 0):
+            self.session.close()
+            raise DatabaseNotEmptyException()
+
+    def __store_subject_props(self, subject):
+        """
+        Stores the properties of a subject in the respective node buffer.
+
+        This function adds the properties of the subject to the node buffer for later insertion into the Neo4j database.
+        """
+        create = self.config.initial_load and self.__mark_created(subject.context, subject.uri)
+        key = (subject.context, subject.extract_label_key(), create)
+        composer = self.node_buffer.get(key)
+        if composer is None:
+            composer = self.node_buffer[key] = NodeQueryComposer(
+                labels=self.__node_labels(subject),
+                handle_multival_strategy=self.handle_multival_strategy,
+                multival_props_predicates=self.multival_props_predicates,
+                context=subject.context,
+                handle_context_strategy=self.handle_context_strategy,
+                columnar=self.config.columnar_params,
+                create=create,
+                handle_multival_append_strategy=self.config.handle_multival_append_strategy,
+                track_sources=self.track_sources)
+
+        composer.add_props(subject.props.keys())
+        if subject.multi_props:
+            composer.add_props(subject.multi_props.keys(), multi=True)
+        composer.add_query_param(subject.emit_params(), subject.node_sources or ())
+        self.node_buffer_size += 1
+
+    def __store_subject_rels(self, subject):
+        """
+        Stores the relationships of a subject in the respective relationship buffer.
+
+        This function adds the relationships of the subject to the relationship buffer for later insertion into the Neo4j database.
         """
-        Stores the properties of the current subject in the respective node buffer.
+        if self.config.initial_load:
+            self.__store_initial_load_rels(subject)
+            return
+        from_seen = self.__is_seen(subject.context, subject.uri)
+        for rel_type, to_nodes in subject.relationships.items():
+            sources = self.__rel_sources(subject, rel_type)
+            # Relationships between nodes already written are sent to a MATCH-based composer
+            seen_to_nodes, unseen_to_nodes = [], to_nodes
+            if from_seen:
+                unseen_to_nodes = []
+                for to in to_nodes:
+                    (seen_to_nodes if self.__is_seen(subject.context, to) else unseen_to_nodes).append(to)
+            if seen_to_nodes:
+                self.__rel_composer(subject.context, rel_type, True).add_query_params(
+                    from_node=subject.uri, to_nodes=seen_to_nodes, sources=sources)
+            if unseen_to_nodes:
+                self.__rel_composer(subject.context, rel_type, False).add_query_params(
+                    from_node=subject.uri, to_nodes=unseen_to_nodes, sources=sources)
+            self.rel_buffer_size += len(to_nodes)
 
-        This function adds the properties of the current subject to the node buffer for later insertion into the Neo4j database.
+    def __store_initial_load_rels(self, subject):
+        """
+        Stores the relationships of the current subject for the initial_load mode: they are CREATEd, and a bare node
+        is created for every target that was not created yet, so that both ends exist when the relationships are flushed.
         """
-        label_key = self.current_subject.extract_label_key()
-        if label_key not in self.node_buffer:
-            self.node_buffer[label_key] = NodeQueryComposer(labels=self.current_subject.labels,
-                                                            handle_multival_strategy=self.handle_multival_strategy,
-                                                            multival_props_predicates=self.multival_props_predicates)
+        for rel_type, to_nodes in subject.relationships.items():
+            for to_node in to_nodes:
+                if self.__mark_created(subject.context, to_node):
+                    self.__store_bare_node(subject.context, to_node)
+            # Once the created nodes are no longer tracked, the ends can't be known to exist and are MERGEd
+            self.__rel_composer(subject.context, rel_type, self.created_uris is not None).add_query_params(
+                from_node=subject.uri, to_nodes=to_nodes, sources=self.__rel_sources(subject, rel_type))
+            self.rel_buffer_size += len(to_nodes)
 
-        self.node_buffer[label_key].add_props(self.current_subject.extract_props_names())
-        self.node_buffer[label_key].add_props(self.current_subject.extract_props_names(multi=True), multi=True)
-        query_params = self.current_subject.extract_params()
-        self.node_buffer[label_key].add_query_param(query_params)
+    @staticmethod
+    def __rel_sources(subject, rel_type):
+        # The source triples of the relationships of a type, by target URI, when they are tracked
+        return subject.rel_sources.get(rel_type) if subject.rel_sources is not None else None
+
+    def __store_bare_node(self, context, uri):
+        """
+        Buffers the creation of a node without labels or properties.
+        """
+        key = (context, "Resource", True)
+        composer = self.node_buffer.get(key)
+        if composer is None:
+            composer = self.node_buffer[key] = NodeQueryComposer(
+                labels=frozenset(),
+                handle_multival_strategy=self.handle_multival_strategy,
+                multival_props_predicates=self.multival_props_predicates,
+                context=context,
+                handle_context_strategy=self.handle_context_strategy,
+                columnar=self.config.columnar_params,
+                create=True,
+                track_sources=self.track_sources)
+        composer.add_query_param({"uri": uri})
         self.node_buffer_size += 1
 
-    def __store_current_subject_rels(self):
+    def __mark_created(self, context, uri) -> bool:
+        """
+        Records that the node of a URI is created by the initial load. Once initial_load_uri_limit nodes are tracked,
+        the tracking is dropped to bound the memory used, and every node left is MERGEd.
+
+        Returns:
+            bool: True if the node was not created yet (it must be CREATEd), False otherwise (it must be MERGEd).
+        """
+        if self.created_uris is None:
+            return False
+        key = self.__seen_key(context, uri)
+        if key in self.created_uris:
+            return False
+        if len(self.created_uris) >= self.config.initial_load_uri_limit:
+            logging.warning(f"{len(self.created_uris)} nodes created, the rest of the initial load MERGEs its nodes.")
+            self.created_uris = None
+            return False
+        self.created_uris.add(key)
+        return True
+
+    def __rel_composer(self, context, rel_type, match_endpoints) -> RelationshipQueryComposer:
+        """
+        Returns the relationship composer buffering the given type in the given context, creating it if needed.
+        """
+        key = (context, rel_type, match_endpoints)
+        composer = self.rel_buffer.get(key)
+        if composer is None:
+            composer = self.rel_buffer[key] = RelationshipQueryComposer(
+                rel_type, context=context, handle_context_strategy=self.handle_context_strategy,
+                columnar=self.config.columnar_params, grouped=self.config.group_rels_by_source,
+                match_endpoints=match_endpoints, create=self.config.initial_load or self.config.create_relationships,
+                track_sources=self.track_sources)
+        return composer
+
+    def __seen_key(self, context, uri):
+        # Under the PROPERTY strategy, the same uri is a different node in every graph
+        return (context, uri) if self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY else uri
+
+    def __is_seen(self, context, uri) -> bool:
+        """
+        Checks if the node of a URI is known to exist in the database. Always False when the cache is disabled.
         """
-        Stores the relationships of the current subject in the respective relationship buffer.
+        return self.seen_uris is not None and self.__seen_key(context, uri) in self.seen_uris
 
-        This function adds the relationships of the current subject to the relationship buffer for later insertion into the Neo4j database.
+    def __mark_seen(self, composer):
         """
-        rel_types_and_relationships = self.current_subject.extract_rels()
-        if self.current_subject.extract_rels():
-            for rel_type in rel_types_and_relationships:
-                if rel_type not in self.rel_buffer:
-                    self.rel_buffer[rel_type] = RelationshipQueryComposer(rel_type)
-                for to_node in rel_types_and_relationships[rel_type]:
-                    self.rel_buffer[rel_type].add_query_param(from_node=self.current_subject.uri, to_node=to_node)
-                    self.rel_buffer_size += 1
+        Records the nodes written by a composer that was just flushed successfully.
+        """
+        if self.seen_uris is not None:
+            self.seen_uris.update(self.__seen_key(composer.context, uri) for uri in composer.written_uris())
 
     def __store_current_subject(self):
         """
@@ -253,90 +849,417 @@ class Neo4jStore(Store):
 
         This function stores the current subject's properties and relationships in the respective buffers.
         """
-        self.__store_current_subject_props()
-        self.__store_current_subject_rels()
+        self.total_subjects += 1
+        subject = self.current_subject
+        self.__mark_row_owner()
+        if self.config.skip_unchanged:
+            # The subject waits for the stored hashes of its batch, a new accumulator takes the next one
+            self.staged_subjects.append(subject)
+            self.subject_accumulator = self.__new_accumulator(subject.prefixes, removal=False)
+            if len(self.staged_subjects) >= self.buffer_max_size:
+                self.__store_staged_subjects()
+            return
+        self.__store_subject_props(subject)
+        self.__store_subject_rels(subject)
+
+    def __mark_row_owner(self):
+        """
+        Under thread_safe, records the thread whose subject is being stored, which must hear of the write errors
+        of the buffers it goes to.
+        """
+        if self.row_owner is not None:
+            self.node_writers.add(self.row_owner)
+            self.rel_writers.add(self.row_owner)
 
-    def __create_current_subject(self, subject):
-        uri = bnode_to_uri(subject) if isinstance(subject, BNode) else subject
-        return Neo4jTriple(uri=uri,
-                           prefixes={value: key for key, value in self.config.get_prefixes().items()},
-                           # Reversing the Prefix dictionary
+    def __store_staged_subjects(self):
+        """
+        Fetches the content hashes stored on the nodes of the staged subjects in one query, and stores in the
+        buffers only the subjects that are new or whose hash changed. The others are already in the database as is.
+        """
+        staged, self.staged_subjects = self.staged_subjects, []
+        stored_hashes = self.__stored_hashes(staged)
+        for subject in staged:
+            content_hash = subject.content_hash()
+            if stored_hashes.get(self.__seen_key(subject.context, subject.uri)) == {content_hash}:
+                self.skipped_subjects += 1
+                continue
+            subject.props[CONTENT_HASH_PROPERTY] = content_hash
+            self.__store_subject_props(subject)
+            self.__store_subject_rels(subject)
+
+    def __stored_hashes(self, subjects):
+        """
+        Returns the content hashes stored on the nodes of some subjects, as sets by __seen_key.
+        """
+        if self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+            query = f"UNWIND $keys AS key MATCH (n:Resource {{uri: key.uri, `{GRAPH_URI_PROPERTY}`: key.graph}}) "
+        else:
+            query = "UNWIND $keys AS key MATCH (n:Resource {uri: key.uri}) "
+        query += f"RETURN n.uri AS uri, n.`{GRAPH_URI_PROPERTY}` AS graph, n.`{CONTENT_HASH_PROPERTY}` AS hash"
+        keys = [{"uri": subject.uri, "graph": subject.context} for subject in subjects]
+        res = {}
+        for record in self.stream_query(query=query, params={"keys": keys}):
+            res.setdefault(self.__seen_key(record["graph"], record["uri"]), set()).add(record["hash"])
+        return res
+
+    def __store_current_removal(self):
+        """
+        Stores the labels, property values and relationships to remove for the current subject
+        in the respective delete buffers.
+        """
+        removal = self.current_removal
+        context = removal.context
+        self.__mark_row_owner()
+        if self.config.skip_unchanged:
+            self.stale_hashes.setdefault(context, []).append(removal.uri)
+        if removal.labels or removal.props or removal.multi_props:
+            key = (context, removal.extract_label_key())
+            composer = self.node_delete_buffer.get(key)
+            if composer is None:
+                composer = self.node_delete_buffer[key] = NodeDeleteQueryComposer(
+                    labels=frozenset(removal.labels),
+                    handle_multival_strategy=self.handle_multival_strategy,
+                    multival_props_predicates=self.multival_props_predicates,
+                    context=context,
+                    handle_context_strategy=self.handle_context_strategy,
+                    columnar=self.config.columnar_params)
+            composer.add_props(removal.props.keys())
+            if removal.multi_props:
+                composer.add_props(removal.multi_props.keys(), multi=True)
+            composer.add_query_param(removal.emit_params())
+            self.node_delete_buffer_size += 1
+        for rel_type, to_nodes in removal.relationships.items():
+            key = (context, rel_type)
+            composer = self.rel_delete_buffer.get(key)
+            if composer is None:
+                composer = self.rel_delete_buffer[key] = RelationshipDeleteQueryComposer(
+                    rel_type, context=context, handle_context_strategy=self.handle_context_strategy,
+                    columnar=self.config.columnar_params, grouped=self.config.group_rels_by_source)
+            composer.add_query_params(from_node=removal.uri, to_nodes=to_nodes)
+            self.rel_delete_buffer_size += len(to_nodes)
+
+    def __new_accumulator(self, prefixes, removal):
+        return Neo4jTriple(uri=None,
+                           prefixes=prefixes,
                            handle_vocab_uri_strategy=self.handle_vocab_uri_strategy,
                            handle_multival_strategy=self.handle_multival_strategy,
-                           multival_props_names=self.multival_props_predicates)
+                           multival_props_names=self.multival_props_predicates,
+                           removal=removal,
+                           intern_uri=self.uri_interner.intern,
+                           keep_sources=self.track_sources and not removal,
+                           compiled=self.compiled)
 
-    def __check_current_subject(self, subject):
+    def __create_current_subject(self, subject, context, removal=False):
+        """
+        Resets the accumulator of additions (or removals) for a new subject and returns it.
+        """
+        accumulator = self.removal_accumulator if removal else self.subject_accumulator
+        accumulator.reset(self.__subject_uri(subject), context)
+        return accumulator
+
+    def __subject_uri(self, subject) -> str:
+        """
+        Returns the interned URI of a subject, rewriting blank nodes to bnode:// URIs.
+        """
+        return self.uri_interner.intern(bnode_to_uri(subject) if isinstance(subject, BNode) else subject)
+
+    def __check_current_removal(self, subject, context):
+        """
+        Checks the subject and context of the triple being removed and stores the previous one if they have changed.
+
+        Args:
+            subject: The subject to check.
+            context: The context of the triple.
+        """
+        graph = self.__graph_uri(context)
+        if self.current_removal is None:
+            self.current_removal = self.__create_current_subject(subject, graph, removal=True)
+        else:
+            if self.current_removal.uri != self.__subject_uri(subject) or self.current_removal.context != graph:
+                self.__store_current_removal()
+                self.current_removal = self.__create_current_subject(subject, graph, removal=True)
+
+    def __check_current_subject(self, subject, context):
         """
         Checks the current subject and stores the previous subject if it has changed.
 
-        This function checks if the provided subject is the same as the current subject.
-        If the current subject is different, it stores the properties and relationships of the previous subject.
+        This function checks if the provided subject and context are the same as the current ones.
+        If they are different, it stores the properties and relationships of the previous subject.
 
         Args:
             subject: The subject to check.
+            context: The context of the triple.
         """
+        graph = self.__graph_uri(context)
         if self.current_subject is None:
-            self.current_subject = self.__create_current_subject(subject)
+            self.current_subject = self.__create_current_subject(subject, graph)
         else:
-            normalized = bnode_to_uri(subject) if isinstance(subject, BNode) else subject
-            if self.current_subject.uri != normalized:
+            if self.current_subject.uri != self.__subject_uri(subject) or self.current_subject.context != graph:
                 self.__store_current_subject()
-                self.current_subject = self.__create_current_subject(subject)
+                self.current_subject = self.__create_current_subject(subject, graph)
 
     def __len__(self, context=None):
-        # no triple state, just a streamer
-        return 0
+        """
+        Counts the triples stored in the Neo4j database: one per label (except Resource),
+        one per property value and one per relationship between two resources.
+        Unless the handle_context_strategy is IGNORE, a named graph restricts the count to the triples added to it.
+        """
+        assert self.is_open(), "The Store must be open."
+        self.commit()
+        graph = self.__read_graph_uri(context)
+        match, node_filter, rel_filter = "MATCH (n:Resource)", "true", ""
+        if graph is not None and self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+            match = f"MATCH (n:Resource {{ `{GRAPH_URI_PROPERTY}` : $graph }})"
+        elif graph is not None:
+            # Under LABEL the relationships carry their graph, the nodes are shared by the graphs of their labels
+            # and the ones of the default graph have no graph label
+            rel_filter = f" WHERE r.`{GRAPH_URI_PROPERTY}` = $graph"
+            if graph == DEFAULT_GRAPH_URI:
+                node_filter = f"NOT any(l IN labels(n) WHERE l STARTS WITH '{GRAPH_LABEL_PREFIX}')"
+            else:
+                match = f"MATCH (n:Resource:`{escape_identifier(GRAPH_LABEL_PREFIX + graph)}`)"
+        query = f"""{match} WITH n, {node_filter} AS counted
+                   RETURN CASE WHEN counted THEN size([l IN labels(n) WHERE l <> 'Resource'
+                                                       AND NOT l STARTS WITH '{GRAPH_LABEL_PREFIX}']) ELSE 0 END AS labels,
+                          CASE WHEN counted THEN properties(n) ELSE {{}} END AS props,
+                          COUNT {{ (n)-[r]->(:Resource){rel_filter} }} AS rels"""
+        total = 0
+        for record in self.stream_query(query=query, params={"graph": graph}):
+            total += record["labels"] + record["rels"]
+            total += sum(len(value) if isinstance(value, list) else 1
+                         for key, value in record["props"].items() if key not in INTERNAL_PROPERTIES)
+        return total
 
     def __flushBuffer(self, only_nodes, only_rels):
         """
         Flushes the buffer by committing the changes to the Neo4j database.
+        Under thread_safe, the buffers are detached and written by the calling thread once it releases the lock.
 
         Args:
             only_nodes (bool): Flag indicating whether to flush only nodes.
             only_rels (bool): Flag indicating whether to flush only relationships.
         """
         assert self.is_open(), "The Store must be open."
-        if not only_rels:
-            self.__flushNodeBuffer()
+        flushes = self.__detach_buffers(only_nodes, only_rels)
+        if self.lock is None:
+            self.__write_flushes(flushes)
+        else:
+            self.detached.extend(flushes)
+
+    def __detach_buffers(self, only_nodes, only_rels):
+        """
+        Returns the writes of the buffers to flush, as (method, arguments, threads with rows in them) tuples, and
+        resets their sizes. Under thread_safe, the buffers are replaced by empty ones, that the other threads fill
+        during the writes.
+        """
+        if self.staged_subjects:
+            self.__store_staged_subjects()
+        replace = self.lock is not None
+        flushes = []
+        # Under initial_load, relationships MATCH their ends, which must have been created before
+        if not only_rels or self.config.initial_load:
+            flushes.append((self.__flushNodeBuffer, (self.node_buffer, self.node_buffer_size), self.node_writers))
+            flushes.append((self.__flushNodeDeleteBuffer,
+                            (self.node_delete_buffer, self.node_delete_buffer_size, self.stale_hashes),
+                            self.node_writers))
+            self.node_buffer_size = self.node_delete_buffer_size = 0
+            self.stale_hashes = {}
+            self.node_writers = set()
+            if replace:
+                self.node_buffer, self.node_delete_buffer = {}, {}
         if not only_nodes:
-            self.__flushRelBuffer()
+            flushes.append((self.__flushRelBuffer, (self.rel_buffer, self.rel_buffer_size), self.rel_writers))
+            flushes.append((self.__flushRelDeleteBuffer, (self.rel_delete_buffer, self.rel_delete_buffer_size),
+                            self.rel_writers))
+            self.rel_buffer_size = self.rel_delete_buffer_size = 0
+            self.rel_writers = set()
+            if replace:
+                self.rel_buffer, self.rel_delete_buffer = {}, {}
+        if not self.node_delete_buffer_size and not self.rel_delete_buffer_size:
+            self.pending_removals = False
+        return flushes
 
-    def __flushNodeBuffer(self):
+    def __write_flushes(self, flushes):
+        """
+        Writes the buffers returned by __detach_buffers, in order. Under thread_safe, when a write fails, the buffers
+        left are dropped and the error is kept for the other threads with rows in them, to be raised by their next
+        call. It is raised to the calling thread if it had rows in them too (or if nobody did).
+        """
+        try:
+            for index, (flush, args, _) in enumerate(flushes):
+                flush(*args)
+        except Exception as e:
+            if self.lock is None:
+                raise e
+            owners = set().union(*(owners for _, _, owners in flushes[index:]))
+            caller = threading.get_ident()
+            with self.errors_lock:
+                for ident in owners - {caller}:
+                    self.thread_errors.setdefault(ident, e)
+            if caller in owners or not owners:
+                raise e
+            logging.error(f"Write failed for the rows of threads {sorted(owners)}: {e}")
+        finally:
+            self.uri_interner.prune()
+
+    def __flushNodeBuffer(self, node_buffer, size):
         """
         Flushes the node buffer by committing the changes to the Neo4j database.
         """
-        for key in self.node_buffer:
-            cur = self.node_buffer[key]
+        # New nodes are created before the others are merged, so that a MERGE never creates a node a CREATE would duplicate
+        for cur in sorted(node_buffer.values(), key=lambda composer: not composer.create):
             if not cur.is_redundant():
-                query = cur.write_query()
-                params = cur.query_params
-                self.__query_database(query=query, params=params)
+                self.__write_composer(cur)
                 cur.empty_query_params()
-        self.node_buffer_size = 0
+        self.flushed_rows += size
 
-    def __flushRelBuffer(self):
+    def __flushRelBuffer(self, rel_buffer, size):
         """
         Flushes the relationship buffer by committing the changes to the Neo4j database.
         """
-        for key in self.rel_buffer:
-            cur = self.rel_buffer[key]
+        for key in rel_buffer:
+            cur = rel_buffer[key]
+            if not cur.is_redundant():
+                self.__write_composer(cur)
+                cur.empty_query_params()
+        self.flushed_rows += size
+
+    def __flushNodeDeleteBuffer(self, node_delete_buffer, size, stale_hashes):
+        """
+        Flushes the node delete buffer by committing the removals to the Neo4j database.
+        """
+        for key in node_delete_buffer:
+            cur = node_delete_buffer[key]
+            if not cur.is_redundant():
+                query = cur.write_query()
+                params = cur.get_query_parameters()
+                self.__query_database(query=query, params=params, composer=cur)
+            cur.empty_query_params()
+        self.flushed_rows += size
+        for context, uris in stale_hashes.items():
+            # The hash no longer matches the content of the node, so the next import of its subject must write it
+            query = f"UNWIND $params AS uri MATCH {resource_pattern('n', 'uri', context, self.handle_context_strategy)} " \
+                    f"REMOVE n.`{CONTENT_HASH_PROPERTY}`"
+            self.__query_database(query=query, params={"params": uris, "graph": context},
+                                  signature="StaleContentHash")
+
+    def __flushRelDeleteBuffer(self, rel_delete_buffer, size):
+        """
+        Flushes the relationship delete buffer by committing the removals to the Neo4j database.
+        """
+        for key in rel_delete_buffer:
+            cur = rel_delete_buffer[key]
             if not cur.is_redundant():
                 query = cur.write_query()
-                params = cur.query_params
-                self.__query_database(query=query, params=params)
+                params = cur.get_query_parameters()
+                self.__query_database(query=query, params=params, composer=cur)
                 cur.empty_query_params()
-        self.rel_buffer_size = 0
+        self.flushed_rows += size
 
-    def __query_database(self, query, params):
+    def __run(self, query, params, composer, signature=None):
+        """
+        Runs a write query and, when profiling, records its ResultSummary (running it with PROFILE if sampled),
+        under the signature given or else the class name of its composer.
+        """
+        profiled = self.profiler is not None and self.profiler.should_profile()
+        # Consuming the result makes errors surface here, before the flushed rows are considered written
+        summary = self.session.run(f"PROFILE {query}" if profiled else query, parameters=params).consume()
+        if self.profiler is not None:
+            self.profiler.record(signature or type(composer).__name__, query, summary, profiled)
+
+    def __write_composer(self, composer):
+        """
+        Writes the rows buffered by a node or relationship composer. With a dead letter file, the rows rejected
+        by Neo4j are isolated and recorded instead of raising.
+        """
+        size = len(composer.query_params)
+        batches = [(0, size, False)]
+        if self.config.supernode_threshold and isinstance(composer, RelationshipQueryComposer):
+            # The relationships of the supernodes are written last, in a sorted sub-batch of their own
+            split = composer.schedule_supernodes(self.config.supernode_threshold)
+            size = len(composer.query_params)
+            batches = [(0, split, False), (split, size, True)]
+        written = True
+        for start, stop, supernodes in batches:
+            if start == stop:
+                continue
+            if not self.track_sources:
+                self.__query_database(query=self.__batch_query(composer, supernodes),
+                                      params=composer.get_query_parameters(start, stop), composer=composer)
+            elif not self.__write_isolating_errors(composer, composer.write_query(), start, stop):
+                written = False
+        # The nodes of the rows that failed don't exist, so the composer is only recorded if every row was written
+        if written:
+            self.__mark_seen(composer)
+
+    def __batch_query(self, composer, supernodes):
+        """
+        Returns the query writing the rows of a composer, committed by the server in transactions of
+        server_batch_size rows when set. The transactions of the supernode sub-batch run one after the other,
+        so that they never wait for each other on the lock of a supernode.
+        """
+        query = composer.write_query()
+        if self.config.server_batch_size:
+            query = in_transactions(query, composer.query_params, self.config.server_batch_size,
+                                    0 if supernodes else self.config.server_batch_concurrency)
+        return query
+
+    def __write_isolating_errors(self, composer, query, start, stop) -> bool:
+        """
+        Writes the rows between start and stop of a composer. If Neo4j rejects them, they are split in halves
+        and retried, until the failing rows are isolated and sent to the dead letter file.
+        Each query runs in a single transaction (server_batch_size is not applied), so a failed one leaves nothing
+        behind and retrying its rows never writes them twice.
+
+        Returns:
+            bool: True if every row was written.
+        """
+        try:
+            self.__run(query, composer.get_query_parameters(start, stop), composer)
+            return True
+        except Exception as e:
+            # Only errors caused by the values of the rows can be isolated, anything else (e.g. a missing procedure,
+            # a syntax error or a lost connection) would fail every half as well, and is raised
+            row_error = getattr(e, "code", None) in NEO4J_ROW_ERROR_CODES
+            e = handle_neo4j_driver_exception(e)
+            if not row_error and not isinstance(e, CypherMultipleTypesMultiValueException):
+                logging.error(e)
+                raise e
+            if stop - start == 1:
+                self.__dead_letter(composer, query, start, e)
+                return False
+            middle = (start + stop) // 2
+            first_written = self.__write_isolating_errors(composer, query, start, middle)
+            return self.__write_isolating_errors(composer, query, middle, stop) and first_written
+
+    def __dead_letter(self, composer, query, index, error):
+        """
+        Appends a row that could not be written to the dead letter file, as a JSON line with its source triples.
+        """
+        record = {
+            "error": str(error),
+            "query": query,
+            "graph": composer.context,
+            "row": composer.query_params.row(index),
+            "triples": [_nt_row(triple).rstrip("\n") for triple in composer.row_sources(index)]
+        }
+        with open(self.config.dead_letter_file, "a", encoding="utf-8") as dead_letter:
+            dead_letter.write(json.dumps(record, default=str) + "\n")
+        self.dead_letter_count += 1
+        logging.error(f"Row written to the dead letter file: {error}")
+
+    def __query_database(self, query, params, composer=None, signature=None):
         """
         Executes a Cypher query on the Neo4j database.
 
         Args:
             query (str): The Cypher query to execute.
-            params: The parameters to pass to the query.
+            params (dict): The parameters to pass to the query.
+            composer: The composer that wrote the query, used as its signature when profiling.
+            signature: The name the query is profiled under when it has no composer.
         """
         try:
-            self.session.run(query, params=params)
+            self.__run(query, params, composer, signature)
         except Exception as e:
             e = handle_neo4j_driver_exception(e)
             logging.error(e)
@@ -1,9 +1,10 @@
+import hashlib
 from collections import defaultdict
-from decimal import Decimal
-from typing import Dict, Set, List
+from typing import Any, Callable, Dict, Set, List, Optional, Tuple
 from rdflib import Literal, URIRef, RDF
 from rdflib.term import BNode, Node
-from rdflib_neo4j.utils import bnode_to_uri, handle_vocab_uri
+from rdflib_neo4j.utils import bnode_to_uri, handle_vocab_uri, literal_to_neo4j_value
+from rdflib_neo4j.config.CompiledConfig import CompiledConfig
 from rdflib_neo4j.config.const import HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
 
 
@@ -11,18 +12,30 @@ class Neo4jTriple:
     uri: Node
     labels: Set[str]
     props: Dict[str, Literal]
-    multi_props: Dict[str, List[Literal]]
+    multi_props: Dict[str, Dict[Tuple[type, Any], Any]]
     relationships: Dict[str, Set[URIRef]]
 
     """
     Represents a triple extracted from RDF data for use in a Neo4j database.
+
+    It accumulates the triples of one subject at a time. The store keeps a single instance and calls reset() when the
+    subject changes, instead of allocating a new one per subject.
     """
 
+    __slots__ = ("uri", "labels", "props", "multi_props", "relationships", "handle_vocab_uri_strategy",
+                 "handle_multival_strategy", "multival_props_names", "prefixes", "removal", "context", "intern_uri",
+                 "node_sources", "rel_sources", "compiled", "mappings")
+
     def __init__(self, uri: Node,
                  handle_vocab_uri_strategy: HANDLE_VOCAB_URI_STRATEGY,
                  handle_multival_strategy: HANDLE_MULTIVAL_STRATEGY,
                  multival_props_names: List[str],
-                 prefixes: Dict[str, str]):
+                 prefixes: Dict[str, str],
+                 removal: bool = False,
+                 context: Optional[str] = None,
+                 intern_uri: Optional[Callable[[Node], str]] = None,
+                 keep_sources: bool = False,
+                 compiled: Optional[CompiledConfig] = None):
         """
         Constructor for Neo4jTriple.
 
@@ -32,16 +45,54 @@ class Neo4jTriple:
             handle_multival_strategy: The strategy to handle multiple values.
             multival_props_names: A list containing URIs to be treated as multivalued.
             prefixes: A dictionary of namespace prefixes used for vocabulary URI handling.
+            removal: If the triples are being removed. Every value of a single valued property is then kept,
+                since any of them could be the one stored in the database. Default: False
+            context: The URI of the named graph the triples belong to, None for the default graph.
+            intern_uri: A function returning the interned str for the URI of a relationship target. Default: None
+            keep_sources: If the parsed triples are kept, so that the rows built from them can be traced back to
+                them. Default: False
+            compiled: The compiled configuration resolving the predicates, shared by the accumulators of a store.
+                Default: compiled from the strategies, multivalued properties and prefixes, without custom mappings
         """
         self.uri = uri
         self.labels = set()
         self.props = {}
-        self.multi_props = defaultdict(list)
+        # Values of a multivalued property, deduplicated in insertion order. They are keyed by type as well,
+        # so that e.g. 1 and True, which are equal in Python but not in Cypher, are both kept.
+        self.multi_props = defaultdict(dict)
         self.relationships = defaultdict(set)
         self.handle_vocab_uri_strategy = handle_vocab_uri_strategy
         self.handle_multival_strategy = handle_multival_strategy
         self.multival_props_names = multival_props_names
         self.prefixes = prefixes
+        self.removal = removal
+        self.context = context
+        self.intern_uri = intern_uri
+        # The triples giving the labels and properties, and the triple of each relationship by (type, target)
+        self.node_sources: Optional[List] = [] if keep_sources else None
+        self.rel_sources: Optional[Dict[str, Dict[str, tuple]]] = defaultdict(dict) if keep_sources else None
+        self.compiled = compiled if compiled is not None else CompiledConfig(
+            handle_vocab_uri_strategy, handle_multival_strategy, multival_props_names, prefixes)
+        # The last mappings passed to parse_triple, the compiled configuration was checked against them
+        self.mappings = None
+
+    def reset(self, uri: Node, context: Optional[str] = None):
+        """
+        Empties the Neo4jTriple object so that it can accumulate the triples of another subject.
+
+        Args:
+            uri (Node): The new subject URI.
+            context: The URI of the named graph of the new subject, None for the default graph.
+        """
+        self.uri = uri
+        self.context = context
+        self.labels.clear()
+        self.props.clear()
+        self.multi_props.clear()
+        self.relationships.clear()
+        if self.node_sources is not None:
+            self.node_sources.clear()
+            self.rel_sources.clear()
 
     def add_label(self, label: str):
         """
@@ -62,7 +113,9 @@ class Neo4jTriple:
             multi: If the property should be treated as multivalued. Default: False
         """
         if multi:
-            self.multi_props[prop_name].append(value)
+            self.multi_props[prop_name][(type(value), value)] = value
+        elif self.removal:
+            self.props.setdefault(prop_name, []).append(value)
         else:
             self.props[prop_name] = value
 
@@ -83,7 +136,7 @@ class Neo4jTriple:
         Returns:
             str: The extracted label key.
         """
-        res = ",".join(list(self.labels))
+        res = ",".join(sorted(self.labels))
         return res if res else "Resource"
 
     def extract_labels(self):
@@ -104,9 +157,53 @@ class Neo4jTriple:
         """
         res = {key: value for key, value in self.props.items()}
         res["uri"] = self.uri
-        res.update(self.multi_props)
+        res.update(self.extract_multi_props())
+        return res
+
+    def extract_multi_props(self):
+        """
+        Extracts the values of the multivalued properties, without duplicates and in the order they were added.
+
+        Returns:
+            dict: The list of values of each multivalued property.
+        """
+        return {key: list(values.values()) for key, values in self.multi_props.items()}
+
+    def emit_params(self):
+        """
+        Hands the accumulated properties over as a query parameter row, without copying them.
+        The Neo4jTriple object must be reset before accumulating the triples of another subject.
+
+        Returns:
+            dict: The query parameter row.
+        """
+        res = self.props
+        res["uri"] = self.uri
+        if self.multi_props:
+            res.update(self.extract_multi_props())
+        self.props = {}
         return res
 
+    def content_hash(self):
+        """
+        Computes a stable hash of the labels, properties and relationships of the subject, that doesn't depend on
+        the order its triples were added in.
+
+        Returns:
+            str: The hexadecimal digest.
+        """
+        # The context is part of the content, as under HANDLE_CONTEXT_STRATEGY.LABEL a node is shared by its graphs
+        content = (
+            self.context,
+            sorted(self.labels),
+            sorted((key, type(value).__name__, repr(value)) for key, value in self.props.items()),
+            sorted((key, sorted((type(value).__name__, repr(value)) for value in values.values()))
+                   for key, values in self.multi_props.items()),
+            sorted((key, sorted(str(to_resource) for to_resource in value))
+                   for key, value in self.relationships.items()),
+        )
+        return hashlib.blake2b(repr(content).encode("utf-8"), digest_size=16).hexdigest()
+
     def extract_props_names(self, multi=False):
         """
         Extracts property names from the Neo4jTriple object.
@@ -143,38 +240,43 @@ class Neo4jTriple:
         """
         return handle_vocab_uri(mappings, predicate, self.prefixes, self.handle_vocab_uri_strategy)
 
-    def parse_triple(self, triple, mappings):
+    def parse_triple(self, triple, mappings=None):
         """
         Parses a triple and updates the Neo4jTriple object accordingly.
 
         Args:
             triple: The triple to parse.
-            mappings: A dictionary of mappings for predicate URIs.
+            mappings: The custom mappings, by URI. When given, the configuration is compiled again with them if
+                they differ from the compiled ones. They are checked once per dict, so a dict changed in place after
+                being passed is not seen. Default: None, the mappings of the compiled configuration are used
         """
         (subject, predicate, object) = triple
+        if mappings is not None and mappings is not self.mappings:
+            self.mappings = mappings
+            if self.compiled.mappings != mappings:
+                self.compiled = CompiledConfig(self.handle_vocab_uri_strategy, self.handle_multival_strategy,
+                                               self.multival_props_names, self.prefixes, mappings)
+        compiled = self.compiled
 
         # Getting a property
         if isinstance(object, Literal):
-            # Neo4j Python driver does not support decimal params
-            value = float(object.toPython()) if isinstance(object.toPython(), Decimal) else object.toPython()
-            prop_name = self.handle_vocab_uri(mappings, predicate)
-
-            # If at least a name is defined and the predicate is one of the properties defined by the user
-            if self.handle_multival_strategy == HANDLE_MULTIVAL_STRATEGY.ARRAY and \
-                    str(predicate) in self.multival_props_names:
-                self.add_prop(prop_name, value, True)
-            # If the user doesn't define any predicate to manage as an array, then everything is an array
-            elif self.handle_multival_strategy == HANDLE_MULTIVAL_STRATEGY.ARRAY and not self.multival_props_names:
-                self.add_prop(prop_name, value, True)
-            else:
-                self.add_prop(prop_name, value)
+            prop_name, multi = compiled.plans.get(predicate) or compiled.property_plan(predicate)
+            self.add_prop(prop_name, literal_to_neo4j_value(object), multi)
+            if self.node_sources is not None:
+                self.node_sources.append(triple)
 
         # Getting a label
         elif predicate == RDF.type:
-            self.add_label(self.handle_vocab_uri(mappings, object))
+            self.add_label(compiled.names.get(object) or compiled.name(object))
+            if self.node_sources is not None:
+                self.node_sources.append(triple)
 
         # Getting its relationships
         else:
-            rel_type = self.handle_vocab_uri(mappings, predicate)
+            rel_type = compiled.names.get(predicate) or compiled.name(predicate)
             to_uri = bnode_to_uri(object) if isinstance(object, BNode) else object
+            if self.intern_uri is not None:
+                to_uri = self.intern_uri(to_uri)
             self.add_rel(rel_type, to_uri)
+            if self.rel_sources is not None:
+                self.rel_sources[rel_type][to_uri] = triple
@@ -0,0 +1,122 @@
+import os
+import time
+from typing import Callable, Optional
+
+# The clock is only read once every CHECK_EVERY triples, so that tracking the progress costs a comparison per triple
+CHECK_EVERY = 4096
+
+
+class ProgressEvent:
+    """
+    A snapshot of the progress of an import into a Neo4jStore.
+
+    Attributes:
+        triples: The number of triples added.
+        subjects: The number of subjects added (a subject is counted again if its triples are not contiguous).
+        flushed_rows: The number of nodes and relationships written to (or removed from) Neo4j.
+        elapsed: The seconds elapsed since the store was opened.
+        triples_per_second: The average number of triples added per second.
+        subjects_per_second: The average number of subjects added per second.
+        bytes_read: The position in the tracked input, None if no input is tracked.
+        total_bytes: The size of the tracked input, None if it is unknown.
+        eta: The estimated seconds left to consume the tracked input, None if its size is unknown.
+        done: If the store was closed.
+    """
+
+    __slots__ = ("triples", "subjects", "flushed_rows", "elapsed", "triples_per_second", "subjects_per_second",
+                 "bytes_read", "total_bytes", "eta", "done")
+
+    def __init__(self, triples, subjects, flushed_rows, elapsed, bytes_read=None, total_bytes=None, done=False):
+        self.triples = triples
+        self.subjects = subjects
+        self.flushed_rows = flushed_rows
+        self.elapsed = elapsed
+        self.triples_per_second = triples / elapsed if elapsed > 0 else 0.0
+        self.subjects_per_second = subjects / elapsed if elapsed > 0 else 0.0
+        self.bytes_read = bytes_read
+        self.total_bytes = total_bytes
+        self.eta = None
+        if bytes_read and total_bytes:
+            self.eta = max(elapsed * (total_bytes - bytes_read) / bytes_read, 0.0)
+        self.done = done
+
+    def __repr__(self):
+        res = f"{self.triples} triples ({self.triples_per_second:.0f}/s), " \
+              f"{self.subjects} subjects ({self.subjects_per_second:.0f}/s), {self.flushed_rows} rows flushed"
+        if self.total_bytes:
+            res += f", {100 * (self.bytes_read or 0) / self.total_bytes:.1f}% of the input"
+        if self.eta is not None and not self.done:
+            res += f", ETA {self.eta:.0f}s"
+        return res
+
+
+class ProgressTracker:
+    """
+    Reports the progress of an import to a callback, at most once every `interval` seconds.
+
+    The store calls report() when its triple count reaches next_check, so the clock is read once every CHECK_EVERY
+    triples and the callback is never called on the hot path.
+    """
+
+    def __init__(self, callback: Optional[Callable[[ProgressEvent], None]], interval: float):
+        """
+        Initializes a ProgressTracker object.
+
+        Args:
+            callback: The function receiving the progress events, None to only poll them.
+            interval: The minimum number of seconds between two events.
+        """
+        self.callback = callback
+        self.interval = interval
+        self.stream = None
+        self.total_bytes = None
+        self.restart()
+
+    def restart(self):
+        """
+        Starts tracking a new import.
+        """
+        self.start = self.last_report = time.monotonic()
+        self.next_check = CHECK_EVERY if self.callback is not None else float("inf")
+
+    def track_input(self, stream, total_bytes: Optional[int] = None):
+        """
+        Tracks the position in the input being parsed, to report the bytes consumed and an ETA.
+
+        Args:
+            stream: The binary file object being parsed.
+            total_bytes: The size of the input. Default: the size of the file behind the stream, if any
+        """
+        if total_bytes is None:
+            try:
+                total_bytes = os.fstat(stream.fileno()).st_size
+            except (AttributeError, OSError, ValueError):
+                total_bytes = None
+        self.stream = stream
+        self.total_bytes = total_bytes
+
+    def event(self, triples, subjects, flushed_rows, done=False) -> ProgressEvent:
+        """
+        Returns a snapshot of the progress.
+        """
+        bytes_read = None
+        if self.stream is not None:
+            try:
+                bytes_read = self.stream.tell()
+            except (OSError, ValueError):
+                bytes_read = None
+        return ProgressEvent(triples, subjects, flushed_rows, time.monotonic() - self.start,
+                             bytes_read=bytes_read, total_bytes=self.total_bytes, done=done)
+
+    def report(self, triples, subjects, flushed_rows, done=False):
+        """
+        Sends a progress event to the callback if the interval has elapsed since the last one (or the import is done),
+        and schedules the next check.
+        """
+        self.next_check = triples + CHECK_EVERY
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if done or now - self.last_report >= self.interval:
+            self.last_report = now
+            self.callback(self.event(triples, subjects, flushed_rows, done=done))
@@ -0,0 +1,97 @@
+import random
+from typing import Dict, List, Optional
+
+COUNTERS = ("nodes_created", "relationships_created", "properties_set", "labels_added",
+            "nodes_deleted", "relationships_deleted", "labels_removed")
+
+
+def plan_tree(profile: Dict) -> Dict:
+    """
+    Simplifies a profiled plan, as returned by the driver in ResultSummary.profile, to its operators,
+    db hits and rows.
+    """
+    return {"operator": profile.get("operatorType"),
+            "db_hits": profile.get("dbHits", 0),
+            "rows": profile.get("rows", 0),
+            "children": [plan_tree(child) for child in profile.get("children", [])]}
+
+
+def plan_total(profile: Dict, key: str) -> int:
+    """
+    Sums a metric (dbHits, rows) over every operator of a profiled plan.
+    """
+    return profile.get(key, 0) + sum(plan_total(child, key) for child in profile.get("children", []))
+
+
+class QueryProfiler:
+    """
+    Aggregates the cost of the queries written by a Neo4jStore, by composer signature (the composer class and the
+    generated query, which is the same for every flush of a composer).
+
+    The counters and server-side timing of the ResultSummary are recorded for every query. A sampled fraction of
+    the queries is run with PROFILE, to also record their db hits, rows and operator tree.
+    """
+
+    def __init__(self, sample_rate: float, seed: Optional[int] = None):
+        """
+        Initializes a QueryProfiler object.
+
+        Args:
+            sample_rate: The fraction of the queries run with PROFILE, between 0 and 1.
+            seed: The seed of the sampling, for reproducible runs. Default: None
+        """
+        self.sample_rate = sample_rate
+        self.random = random.Random(seed)
+        self.stats: Dict[str, Dict] = {}
+
+    def should_profile(self) -> bool:
+        """
+        Checks if the next query is sampled to run with PROFILE.
+        """
+        return self.sample_rate >= 1 or self.random.random() < self.sample_rate
+
+    def record(self, composer: str, query: str, summary, profiled: bool):
+        """
+        Records the ResultSummary of a query.
+
+        Args:
+            composer: The name of the composer class that wrote the query.
+            query: The query, without the PROFILE prefix.
+            summary: The ResultSummary returned by the driver.
+            profiled: If the query was run with PROFILE.
+        """
+        stats = self.stats.get(query)
+        if stats is None:
+            stats = self.stats[query] = {"composer": composer, "query": query, "runs": 0, "profiled_runs": 0,
+                                         "db_hits": 0, "rows": 0, "time_ms": 0, "plan": None,
+                                         **{counter: 0 for counter in COUNTERS}}
+        stats["runs"] += 1
+        stats["time_ms"] += (summary.result_available_after or 0) + (summary.result_consumed_after or 0)
+        for counter in COUNTERS:
+            stats[counter] += getattr(summary.counters, counter)
+        if profiled and summary.profile:
+            stats["profiled_runs"] += 1
+            stats["db_hits"] += plan_total(summary.profile, "dbHits")
+            stats["rows"] += plan_total(summary.profile, "rows")
+            stats["plan"] = plan_tree(summary.profile)
+
+    def summary(self) -> List[Dict]:
+        """
+        Returns the statistics of every composer signature, the most expensive first: by db hits per profiled run,
+        then by server-side time.
+        """
+        return sorted(self.stats.values(), reverse=True,
+                      key=lambda stats: (stats["db_hits"] / max(stats["profiled_runs"], 1), stats["time_ms"]))
+
+    def report(self) -> str:
+        """
+        Returns a human-readable report of the summary.
+        """
+        lines = []
+        for stats in self.summary():
+            lines.append(f"{stats['composer']}: {stats['runs']} runs, {stats['time_ms']} ms, "
+                         f"{stats['db_hits']} db hits in {stats['profiled_runs']} profiled runs, "
+                         f"{stats['nodes_created']} nodes and {stats['relationships_created']} relationships created, "
+                         f"{stats['properties_set']} properties set")
+            lines.append(f"    {stats['query'].strip()}")
+        return "\n".join(lines)
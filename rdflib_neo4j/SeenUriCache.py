@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from typing import Hashable, Iterable
+
+
+class SeenUriCache:
+    """
+    Bounded LRU set of the nodes known to exist in the database, because they were written by a flush of this store.
+
+    Relationships whose endpoints are all known can MATCH them instead of MERGE-ing them again.
+    When the cache is full, the least recently used URI is evicted, which only means that it will be MERGEd again.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Initializes a SeenUriCache object.
+
+        Args:
+            max_size: The maximum number of URIs kept.
+        """
+        self.max_size = max_size
+        self.entries: OrderedDict = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+        Checks if a node is known to exist, refreshing it as the most recently used.
+        A single operation on the entries, so that it is safe while another thread updates the cache.
+        """
+        try:
+            self.entries.move_to_end(key)
+            return True
+        except KeyError:
+            return False
+
+    def update(self, keys: Iterable[Hashable]):
+        """
+        Records nodes that are known to exist, evicting the least recently used ones past max_size.
+
+        Args:
+            keys: The nodes that were written.
+        """
+        entries = self.entries
+        for key in keys:
+            entries[key] = None
+            entries.move_to_end(key)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
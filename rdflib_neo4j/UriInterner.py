@@ -0,0 +1,46 @@
+from typing import Dict
+
+
+class UriInterner:
+    """
+    Interning table for the URIs written by a Neo4jStore.
+
+    The same URI is the uri of a node, the start of some relationships and the end of others, and reaches the store
+    as separate URIRef (or bnode:// string) objects. Interning converts each of them to a plain str and returns
+    the same object every time, so a URI buffered many times is held in memory once.
+    The table is pruned when the buffers are flushed, once it grows past its maximum size.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Initializes a UriInterner object.
+
+        Args:
+            max_size: The number of URIs above which the table is emptied at the next prune.
+        """
+        self.max_size = max_size
+        self.table: Dict[str, str] = {}
+
+    def intern(self, uri) -> str:
+        """
+        Returns the interned plain str for a URI.
+
+        Args:
+            uri: The URI, as a URIRef or a str.
+        """
+        plain = uri if type(uri) is str else str(uri)
+        res = self.table.get(plain)
+        if res is None:
+            res = self.table[plain] = plain
+        return res
+
+    def prune(self):
+        """
+        Empties the table if it holds more than max_size URIs. Called after a flush, when the buffers no longer
+        reference the URIs, so that they can be freed.
+        """
+        if len(self.table) > self.max_size:
+            self.table = {}
+
+    def __len__(self):
+        return len(self.table)
@@ -1,8 +1,24 @@
 from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
 from rdflib_neo4j.Neo4jStore import Neo4jStore
-from rdflib_neo4j.config.const import HANDLE_MULTIVAL_STRATEGY,HANDLE_VOCAB_URI_STRATEGY
+from rdflib_neo4j.config.const import HANDLE_MULTIVAL_STRATEGY,HANDLE_VOCAB_URI_STRATEGY, HANDLE_CONTEXT_STRATEGY, \
+    HANDLE_MULTIVAL_APPEND_STRATEGY
+from rdflib_neo4j.sparql import neo4j_custom_eval
+from rdflib_neo4j.loader import load_file, sync, bulk_load
+from rdflib_neo4j.exporter import export_rdf
+from rdflib_neo4j.utils import register_literal_converter
+from rdflib.plugins.sparql import CUSTOM_EVALS
+
+# BGPs evaluated on a Neo4jStore are compiled to Cypher, any other graph is left to rdflib
+CUSTOM_EVALS["rdflib_neo4j"] = neo4j_custom_eval
 
 __all__ = ["Neo4jStore",
            "Neo4jStoreConfig",
            "HANDLE_VOCAB_URI_STRATEGY",
-           "HANDLE_MULTIVAL_STRATEGY"]
\ No newline at end of file
+           "HANDLE_MULTIVAL_STRATEGY",
+           "HANDLE_CONTEXT_STRATEGY",
+           "HANDLE_MULTIVAL_APPEND_STRATEGY",
+           "load_file",
+           "sync",
+           "bulk_load",
+           "export_rdf",
+           "register_literal_converter"]
\ No newline at end of file
@@ -0,0 +1,80 @@
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+from rdflib import URIRef
+from rdflib_neo4j.config.const import HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
+from rdflib_neo4j.utils import handle_vocab_uri
+
+
+class CompiledConfig:
+    """
+    Frozen form of the parts of a Neo4jStoreConfig used for every parsed triple.
+
+    The multivalued predicates are a frozenset, the custom mappings and prefixes are read-only, and the name of every
+    vocabulary URI (property, relationship type or label) as well as the plan of every literal predicate
+    (property name, single or multivalued) are resolved once and cached, so that parsing a triple is a dict lookup.
+    The caches grow with the vocabulary of the data (predicates and classes), not with the number of triples.
+
+    Parameters:
+    - handle_vocab_uri_strategy: The strategy to handle vocabulary URIs.
+    - handle_multival_strategy: The strategy to handle multiple values.
+    - multival_props_names: The URIs of the predicates treated as multivalued.
+    - prefixes: The prefixes of the namespaces, by namespace URI.
+    - mappings: The custom mappings, by URI (default: None).
+    """
+
+    __slots__ = ("handle_vocab_uri_strategy", "handle_multival_strategy", "multival_predicates", "all_multival",
+                 "array", "prefixes", "mappings", "names", "plans")
+
+    def __init__(self, handle_vocab_uri_strategy: HANDLE_VOCAB_URI_STRATEGY,
+                 handle_multival_strategy: HANDLE_MULTIVAL_STRATEGY,
+                 multival_props_names: List[str],
+                 prefixes: Dict[str, str],
+                 mappings: Optional[Dict[URIRef, str]] = None):
+        array = handle_multival_strategy == HANDLE_MULTIVAL_STRATEGY.ARRAY
+        multival_predicates = frozenset(str(name) for name in multival_props_names)
+        for key, value in (("handle_vocab_uri_strategy", handle_vocab_uri_strategy),
+                           ("handle_multival_strategy", handle_multival_strategy),
+                           ("multival_predicates", multival_predicates),
+                           # If the user doesn't define any predicate to manage as an array, then everything is an array
+                           ("all_multival", array and not multival_predicates),
+                           ("array", array),
+                           ("prefixes", MappingProxyType(dict(prefixes))),
+                           ("mappings", MappingProxyType(dict(mappings or {}))),
+                           ("names", {}),
+                           ("plans", {})):
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("A CompiledConfig is frozen, compile the Neo4jStoreConfig again to change it.")
+
+    def name(self, uri) -> str:
+        """
+        Returns the name of a vocabulary URI according to the handle_vocab_uri_strategy, resolving it once.
+
+        Parameters:
+        - uri: The URI of a predicate or class.
+
+        Returns:
+        The property name, relationship type or label.
+        """
+        res = self.names.get(uri)
+        if res is None:
+            # A URI that can't be shortened raises every time, since nothing is cached for it
+            res = self.names[uri] = handle_vocab_uri(self.mappings, uri, self.prefixes, self.handle_vocab_uri_strategy)
+        return res
+
+    def property_plan(self, predicate) -> Tuple[str, bool]:
+        """
+        Returns how the literals of a predicate are stored, resolving it once.
+
+        Parameters:
+        - predicate: The URI of the predicate.
+
+        Returns:
+        A tuple (property name, multivalued).
+        """
+        plan = self.plans.get(predicate)
+        if plan is None:
+            multi = self.all_multival or (self.array and str(predicate) in self.multival_predicates)
+            plan = self.plans[predicate] = (self.name(predicate), multi)
+        return plan
@@ -1,9 +1,10 @@
-from typing import List, Tuple
+from typing import Callable, List, Tuple
 from rdflib import Namespace, URIRef
+from rdflib_neo4j.config.CompiledConfig import CompiledConfig
 from rdflib_neo4j.config.const import (
     DEFAULT_PREFIXES,
     PrefixNotFoundException,
-    HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
+    HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY, HANDLE_CONTEXT_STRATEGY, HANDLE_MULTIVAL_APPEND_STRATEGY
 )
 
 class Neo4jStoreConfig:
@@ -27,6 +28,46 @@ class Neo4jStoreConfig:
     - handle_multival_strategy: The strategy to handle multivalued properties (default: HANDLE_MULTIVAL_STRATEGY.OVERWRITE).
 
     - multival_props_names: A list of tuples containing the prefix and property names to be treated as multivalued in the form (prefix, property_name)
+
+    - fetch_size: The number of records fetched at a time by the driver when reading triples back (default: 1000).
+
+    - sparql_pushdown: A boolean indicating whether SPARQL basic graph patterns are compiled to a single Cypher query (default: True).
+
+    - handle_context_strategy: The strategy to handle the context (named graph) of quads (default: HANDLE_CONTEXT_STRATEGY.IGNORE).
+
+    - columnar_params: A boolean indicating whether batches are sent as parallel lists (one per key) instead of one map per row (default: False).
+
+    - group_rels_by_source: A boolean indicating whether relationships are sent as one row per start node with the list of its targets (default: False).
+
+    - uri_intern_limit: The number of interned URIs above which the interning table is emptied after a flush (default: 1000000).
+
+    - seen_uri_cache_size: The number of URIs of nodes known to exist that are remembered, so that relationships between them MATCH their ends instead of MERGE-ing them. 0 disables it (default: 0).
+
+    - initial_load: A boolean indicating whether the store loads data into an empty database, using CREATE instead of MERGE (default: False).
+
+    - handle_multival_append_strategy: The strategy to append the values of multivalued properties to the ones already stored, when handle_multival_strategy is ARRAY (default: HANDLE_MULTIVAL_APPEND_STRATEGY.REDUCE).
+
+    - dead_letter_file: A path to a file where the rows that fail to be written are recorded with their source triples, instead of aborting the import. Only the errors caused by the values of the rows (type errors and constraint violations) are recorded, the others abort the import (default: None).
+
+    - profile_sample_rate: The fraction of the write queries run with PROFILE. When above 0, the cost of every write query is recorded by composer signature and reported at close() (default: 0.0).
+
+    - progress_callback: A function called with a ProgressEvent while triples are added, at most once every progress_interval seconds, and when the store is closed (default: None).
+
+    - progress_interval: The minimum number of seconds between two calls of progress_callback (default: 10.0).
+
+    - skip_unchanged: A boolean indicating whether subjects whose content didn't change since the last import are skipped, using a hash stored on their node (default: False).
+
+    - create_relationships: A boolean indicating whether relationships are CREATEd instead of MERGEd, for inputs known to hold no duplicate or already loaded relationship (default: False).
+
+    - supernode_threshold: The number of relationships of an endpoint in a flushed batch from which its relationships are written in a sorted sub-batch of their own, 0 to disable (default: 0).
+
+    - server_batch_size: The number of rows committed per server-side transaction, with the rows of every flushed query wrapped in CALL { ... } IN TRANSACTIONS, 0 to commit each query in one transaction (default: 0).
+
+    - server_batch_concurrency: The number of server-side transactions run concurrently when server_batch_size is set, 0 to run them one after the other (default: 0).
+
+    - thread_safe: A boolean indicating whether add() and remove() can be called from several threads at once, e.g. to parse several files into one store (default: False).
+
+    - initial_load_uri_limit: The number of created nodes the initial_load mode keeps track of. Past it, the rest of the load MERGEs its nodes (default: 10000000).
     """
 
     def __init__(
@@ -38,7 +79,27 @@ class Neo4jStoreConfig:
             batch_size=5000,
             handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.SHORTEN,
             handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
-            multival_props_names: List[Tuple[str, str]] = []
+            multival_props_names: List[Tuple[str, str]] = [],
+            fetch_size=1000,
+            sparql_pushdown=True,
+            handle_context_strategy=HANDLE_CONTEXT_STRATEGY.IGNORE,
+            columnar_params=False,
+            group_rels_by_source=False,
+            uri_intern_limit=1000000,
+            seen_uri_cache_size=0,
+            initial_load=False,
+            handle_multival_append_strategy=HANDLE_MULTIVAL_APPEND_STRATEGY.REDUCE,
+            dead_letter_file=None,
+            profile_sample_rate=0.0,
+            progress_callback=None,
+            progress_interval=10.0,
+            skip_unchanged=False,
+            create_relationships=False,
+            supernode_threshold=0,
+            server_batch_size=0,
+            server_batch_concurrency=0,
+            thread_safe=False,
+            initial_load_uri_limit=10000000
     ):
         self.default_prefixes = DEFAULT_PREFIXES
         self.auth_data = auth_data
@@ -53,6 +114,26 @@ class Neo4jStoreConfig:
         self.multival_props_names = []
         for prop_name in multival_props_names:
             self.set_multival_prop_name(prefix_name=prop_name[0], prop_name=prop_name[1])
+        self.fetch_size = fetch_size
+        self.sparql_pushdown = sparql_pushdown
+        self.handle_context_strategy = handle_context_strategy
+        self.columnar_params = columnar_params
+        self.group_rels_by_source = group_rels_by_source
+        self.uri_intern_limit = uri_intern_limit
+        self.seen_uri_cache_size = seen_uri_cache_size
+        self.initial_load = initial_load
+        self.handle_multival_append_strategy = handle_multival_append_strategy
+        self.dead_letter_file = dead_letter_file
+        self.profile_sample_rate = profile_sample_rate
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self.skip_unchanged = skip_unchanged
+        self.create_relationships = create_relationships
+        self.supernode_threshold = supernode_threshold
+        self.server_batch_size = server_batch_size
+        self.server_batch_concurrency = server_batch_concurrency
+        self.thread_safe = thread_safe
+        self.initial_load_uri_limit = initial_load_uri_limit
 
     def set_handle_vocab_uri_strategy(self, val: HANDLE_VOCAB_URI_STRATEGY):
         """
@@ -72,6 +153,15 @@ class Neo4jStoreConfig:
         """
         self.handle_multival_strategy = val
 
+    def set_handle_context_strategy(self, val: HANDLE_CONTEXT_STRATEGY):
+        """
+        Set the strategy to handle the context of quads.
+
+        Parameters:
+        - val: The handle_context_strategy value to be set.
+        """
+        self.handle_context_strategy = val
+
     def set_default_prefix(self, name: str, value: str):
         """
         Set a default prefix.
@@ -210,6 +300,191 @@ class Neo4jStoreConfig:
         """
         self.batch_size = val
 
+    def set_fetch_size(self, val: int):
+        """
+        Set the number of records fetched at a time when reading triples.
+
+        Parameters:
+        - val: An integer representing the fetch size.
+        """
+        self.fetch_size = val
+
+    def set_sparql_pushdown(self, val: bool):
+        """
+        Set SPARQL push-down.
+
+        Parameters:
+        - val: A boolean indicating whether SPARQL basic graph patterns are compiled to Cypher.
+        """
+        self.sparql_pushdown = val
+
+    def set_columnar_params(self, val: bool):
+        """
+        Set columnar parameter buffers.
+
+        Parameters:
+        - val: A boolean indicating whether batches are sent as parallel lists instead of one map per row.
+        """
+        self.columnar_params = val
+
+    def set_group_rels_by_source(self, val: bool):
+        """
+        Set the grouping of relationships by start node.
+
+        Parameters:
+        - val: A boolean indicating whether relationships are sent as one row per start node with the list of its targets.
+        """
+        self.group_rels_by_source = val
+
+    def set_uri_intern_limit(self, val: int):
+        """
+        Set the size limit of the URI interning table.
+
+        Parameters:
+        - val: The number of interned URIs above which the table is emptied after a flush.
+        """
+        self.uri_intern_limit = val
+
+    def set_seen_uri_cache_size(self, val: int):
+        """
+        Set the size of the cache of nodes known to exist.
+
+        Parameters:
+        - val: The number of URIs remembered, 0 to disable the cache.
+        """
+        self.seen_uri_cache_size = val
+
+    def set_initial_load(self, val: bool):
+        """
+        Set the initial load mode.
+
+        Parameters:
+        - val: A boolean indicating whether the store loads data into an empty database using CREATE instead of MERGE.
+        """
+        self.initial_load = val
+
+    def set_initial_load_uri_limit(self, val: int):
+        """
+        Set the number of created nodes the initial load mode keeps track of.
+
+        Parameters:
+        - val: The number of URIs tracked, past which the rest of the load MERGEs its nodes.
+        """
+        self.initial_load_uri_limit = val
+
+    def set_handle_multival_append_strategy(self, val: HANDLE_MULTIVAL_APPEND_STRATEGY):
+        """
+        Set the strategy to append the values of multivalued properties to the ones already stored.
+
+        Parameters:
+        - val: The handle_multival_append_strategy value to be set.
+        """
+        self.handle_multival_append_strategy = val
+
+    def set_dead_letter_file(self, val: str):
+        """
+        Set the file where the rows that fail to be written are recorded.
+
+        Parameters:
+        - val: The path of the dead letter file, None to abort the import on errors.
+        """
+        self.dead_letter_file = val
+
+    def set_profile_sample_rate(self, val: float):
+        """
+        Set the fraction of the write queries run with PROFILE.
+
+        Parameters:
+        - val: The fraction, between 0 and 1. 0 disables profiling.
+        """
+        self.profile_sample_rate = val
+
+    def set_progress_callback(self, val: Callable):
+        """
+        Set the function receiving the progress of the import.
+
+        Parameters:
+        - val: A function taking a ProgressEvent, None to disable the reports.
+        """
+        self.progress_callback = val
+
+    def set_progress_interval(self, val: float):
+        """
+        Set the minimum number of seconds between two progress reports.
+
+        Parameters:
+        - val: The number of seconds.
+        """
+        self.progress_interval = val
+
+    def set_skip_unchanged(self, val: bool):
+        """
+        Set the skip unchanged mode.
+
+        Parameters:
+        - val: A boolean indicating whether subjects whose content hash is already stored on their node are skipped.
+        """
+        self.skip_unchanged = val
+
+    def set_create_relationships(self, val: bool):
+        """
+        Set the create relationships mode.
+
+        Parameters:
+        - val: A boolean indicating whether relationships are CREATEd instead of MERGEd.
+        """
+        self.create_relationships = val
+
+    def set_supernode_threshold(self, val: int):
+        """
+        Set the supernode threshold.
+
+        Parameters:
+        - val: The number of relationships of an endpoint in a batch from which it is handled as a supernode, 0 to disable.
+        """
+        self.supernode_threshold = val
+
+    def set_server_batch_size(self, val: int):
+        """
+        Set the server batch size.
+
+        Parameters:
+        - val: The number of rows committed per server-side transaction, 0 to disable.
+        """
+        self.server_batch_size = val
+
+    def set_server_batch_concurrency(self, val: int):
+        """
+        Set the server batch concurrency.
+
+        Parameters:
+        - val: The number of server-side transactions run concurrently, 0 to run them one after the other.
+        """
+        self.server_batch_concurrency = val
+
+    def set_thread_safe(self, val: bool):
+        """
+        Set the thread safe mode.
+
+        Parameters:
+        - val: A boolean indicating whether the store can be written from several threads at once.
+        """
+        self.thread_safe = val
+
+    def compile(self):
+        """
+        Get the frozen form of the configuration used to parse triples, with the naming of every predicate cached.
+        Later changes to the configuration are not reflected in it.
+
+        Returns:
+        A CompiledConfig.
+        """
+        return CompiledConfig(handle_vocab_uri_strategy=self.handle_vocab_uri_strategy,
+                              handle_multival_strategy=self.handle_multival_strategy,
+                              multival_props_names=self.multival_props_names,
+                              prefixes={value: key for key, value in self.get_prefixes().items()},
+                              mappings=self.custom_mappings)
+
     def get_config_dict(self):
         """
         Get the configuration dictionary.
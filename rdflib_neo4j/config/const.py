@@ -50,6 +50,16 @@ class WrongAuthenticationException(Exception):
         return f"""Missing {self.param_name} key inside the authentication definition. Remember that it should contain the following keys:
                 : [uri, database, user, pwd]"""
 
+class DatabaseNotEmptyException(Exception):
+
+    # Constructor or Initializer
+    def __init__(self):
+        super().__init__()
+
+    def __str__(self):
+        return """The initial_load mode requires an empty database, but it already contains nodes."""
+
+
 class CypherMultipleTypesMultiValueException(Exception):
 
     # Constructor or Initializer
@@ -61,6 +71,10 @@ class CypherMultipleTypesMultiValueException(Exception):
 
 NEO4J_DRIVER_MULTIPLE_TYPE_ERROR_MESSAGE = """{code: Neo.ClientError.Statement.TypeError} {message: Neo4j only supports a subset of Cypher types for storage as singleton or array properties. Please refer to section cypher/syntax/values of the manual for more details.}"""
 NEO4J_DRIVER_DICT_MESSAGE = {NEO4J_DRIVER_MULTIPLE_TYPE_ERROR_MESSAGE: CypherMultipleTypesMultiValueException}
+# Codes of the errors caused by the values of some rows, which the dead letter path isolates by splitting the batch.
+# Any other error (e.g. a missing procedure, a syntax or permission error) fails every row the same way
+NEO4J_ROW_ERROR_CODES = frozenset(("Neo.ClientError.Statement.TypeError",
+                                   "Neo.ClientError.Schema.ConstraintValidationFailed"))
 
 class HANDLE_VOCAB_URI_STRATEGY(Enum):
     """
@@ -89,3 +103,46 @@ class HANDLE_MULTIVAL_STRATEGY(Enum):
     """
     OVERWRITE = 1  # Strategy to overwrite multiple values
     ARRAY = 2  # Strategy to treat multiple values as an array
+
+
+class HANDLE_MULTIVAL_APPEND_STRATEGY(Enum):
+    """
+    Enum class defining different strategies for appending the values of a multivalued property (HANDLE_MULTIVAL_STRATEGY.ARRAY) to the ones already stored.
+
+    - REDUCE: Strategy to append the new values one at a time with a Cypher REDUCE, skipping the ones already in the array
+    - LIST_COMPREHENSION: Strategy to append the new values missing from the array with a single list comprehension
+    - APOC_UNION: Strategy to merge the arrays with apoc.coll.union (requires APOC). The order of the values is not preserved
+    - ON_CREATE_OVERWRITE: Strategy to set the array as is on the nodes created by the query, and to append with a list comprehension on the existing ones
+
+    The values sent by the store are always deduplicated client side, in the order they were added.
+    """
+    REDUCE = "REDUCE"  # Strategy to append one value at a time with REDUCE
+    LIST_COMPREHENSION = "LIST_COMPREHENSION"  # Strategy to append the missing values with a list comprehension
+    APOC_UNION = "APOC_UNION"  # Strategy to merge the arrays with apoc.coll.union
+    ON_CREATE_OVERWRITE = "ON_CREATE_OVERWRITE"  # Strategy to overwrite on the created nodes, append on the others
+
+
+class HANDLE_CONTEXT_STRATEGY(Enum):
+    """
+    Enum class defining different strategies for handling the context (named graph) of quads.
+
+    - IGNORE: Strategy to ignore the context, quads from every graph are merged together
+    - PROPERTY: Strategy to store the graph URI in the graphUri property. Nodes are identified by (uri, graphUri), so every named graph gets its own copy of a resource
+    - LABEL: Strategy to add a `graph:<graph uri>` label to the nodes, relationships are identified by their graphUri property
+
+    Triples in the default graph (or added through a plain Graph) are stored in the DEFAULT_GRAPH_URI graph: under
+    PROPERTY their nodes have it as graphUri, under LABEL their relationships do (their nodes get no graph label).
+    """
+    IGNORE = "IGNORE"  # Strategy to ignore the context
+    PROPERTY = "PROPERTY"  # Strategy to store the graph URI as a property
+    LABEL = "LABEL"  # Strategy to store the graph as a label on the nodes
+
+
+GRAPH_URI_PROPERTY = "graphUri"
+GRAPH_LABEL_PREFIX = "graph:"
+# The graphUri of the default graph, the identifier rdflib gives to the default graph of a Dataset.
+# A sentinel instead of a missing graphUri keeps the default graph out of the named graphs and under the (uri, graphUri) index
+DEFAULT_GRAPH_URI = "urn:x-rdflib:default"
+CONTENT_HASH_PROPERTY = "contentHash"
+# Properties written by the store that don't represent triples
+INTERNAL_PROPERTIES = frozenset(("uri", GRAPH_URI_PROPERTY, CONTENT_HASH_PROPERTY))
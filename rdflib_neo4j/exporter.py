@@ -0,0 +1,116 @@
+import queue
+import threading
+
+from rdflib import URIRef
+from rdflib.plugins.serializers.nquads import _nq_row
+from rdflib.plugins.serializers.nt import _nt_row
+
+from rdflib_neo4j.Neo4jStore import Neo4jStore
+from rdflib_neo4j.query_composers.ExportQueryComposer import ExportQueryComposer
+
+DEFAULT_PAGE_SIZE = 10000  # Nodes read per query
+DEFAULT_QUEUE_SIZE = 4  # Pages read ahead of the writer
+EXPORT_FORMATS = ("nt", "nquads")
+
+
+def prefetch(iterator, queue_size):
+    """
+    Consumes an iterator on a separate thread, at most queue_size items ahead, and yields its items.
+    Errors raised by the iterator are raised to the consumer.
+    """
+    items = queue.Queue(maxsize=queue_size)
+    done = object()
+    stopped = threading.Event()
+    error = []
+
+    def put(item):
+        # Waits for room in the queue, unless the consumer is gone
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def pump():
+        try:
+            for item in iterator:
+                if stopped.is_set():
+                    break
+                put(item)
+        except BaseException as e:
+            error.append(e)
+        finally:
+            put(done)
+
+    thread = threading.Thread(target=pump, name="rdflib-neo4j-export", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                break
+            yield item
+        if error:
+            raise error[0]
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def read_pages(store: Neo4jStore, composer: ExportQueryComposer):
+    """
+    Yields the pages of records of the graph, following the keyset cursor until a page comes back short.
+    """
+    after = None
+    while True:
+        query, params = composer.write_page_query(after)
+        page = list(store.stream_query(query=query, params=params))
+        if page:
+            yield page
+        after = composer.next_cursor(page)
+        if after is None:
+            return
+
+
+def export_rdf(graph, out, format="nt", page_size=DEFAULT_PAGE_SIZE, queue_size=DEFAULT_QUEUE_SIZE) -> int:
+    """
+    Writes the content of a Neo4jStore as N-Triples or N-Quads to a text file-like object.
+
+    Nodes are read one page at a time with keyset pagination on their uri, on a separate thread that stays at most
+    queue_size pages ahead of the writer, so the memory used doesn't depend on the size of the graph.
+    Labels, properties and relationship types are turned back into URIs according to the handle_vocab_uri_strategy,
+    prefixes and mappings of the store configuration. Under IGNORE (and MAP for the unmapped names) the namespaces were
+    not stored, so the bare names are written as URIs.
+
+    Args:
+        graph: The Neo4jStore, or a Graph backed by it.
+        out: The text file-like object to write to.
+        format: "nt" or "nquads". The graph of each quad is given by the handle_context_strategy, N-Triples drop it.
+            Default: "nt"
+        page_size: The number of nodes read per query, of uris with every graph copy of their node under
+            HANDLE_CONTEXT_STRATEGY.PROPERTY. Default: 10000
+        queue_size: The maximum number of pages read ahead of the writer. Default: 4
+
+    Returns:
+        int: The number of triples (or quads) written.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {format!r}, expected one of {EXPORT_FORMATS}.")
+    store = getattr(graph, "store", graph)
+    assert isinstance(store, Neo4jStore) and store.is_open(), "The Store must be an open Neo4jStore."
+    # Pending writes are flushed, so that the export reflects every triple added
+    store.commit()
+    composer = ExportQueryComposer(store.config, page_size)
+    count = 0
+    for page in prefetch(read_pages(store, composer), queue_size):
+        lines = []
+        for record in page:
+            for subject, predicate, object, graph_uri in composer.read_quads(record):
+                if format == "nt":
+                    lines.append(_nt_row((subject, predicate, object)))
+                else:
+                    lines.append(_nq_row((subject, predicate, object), URIRef(graph_uri) if graph_uri else None))
+        out.write("".join(lines))
+        count += len(lines)
+    return count
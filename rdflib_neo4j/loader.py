@@ -0,0 +1,502 @@
+import bz2
+import concurrent.futures
+import contextlib
+import gzip
+import heapq
+import io
+import itertools
+import logging
+import lzma
+import os
+import queue
+import tempfile
+import threading
+from typing import Dict, Tuple, Union
+
+from rdflib import Dataset, Graph
+from rdflib.util import guess_format
+
+from rdflib_neo4j.Neo4jStore import Neo4jStore
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # Bytes decompressed at a time
+DEFAULT_QUEUE_SIZE = 8  # Decompressed chunks buffered ahead of the parser
+DEFAULT_RUN_SIZE = 1000000  # Statements sorted in memory before being spilled to disk
+DEFAULT_DELTA_SIZE = 10000  # Changed statements parsed and applied at a time
+LINE_FORMATS = ("nt", "nquads")
+QUAD_FORMATS = ("nquads", "trig", "trix")
+
+# Magic numbers of the supported codecs, checked before the file extension
+COMPRESSIONS = {
+    "gzip": (b"\x1f\x8b", (".gz", ".gzip")),
+    "bz2": (b"BZh", (".bz2",)),
+    "xz": (b"\xfd7zXZ\x00", (".xz", ".lzma")),
+    "zstd": (b"\x28\xb5\x2f\xfd", (".zst", ".zstd")),
+}
+
+
+def detect_compression(path, head=b""):
+    """
+    Returns the codec a file is compressed with (gzip, bz2, xz or zstd), None if it isn't compressed.
+
+    Args:
+        path: The path of the file.
+        head: The first bytes of the file. Default: empty, so that only the extension is checked
+    """
+    for codec, (magic, _) in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return codec
+    for codec, (_, extensions) in COMPRESSIONS.items():
+        if str(path).lower().endswith(extensions):
+            return codec
+    return None
+
+
+def rdf_format(path):
+    """
+    Guesses the RDF format of a file from its extension, ignoring the extension of the compression (e.g. data.nt.gz).
+    """
+    name = str(path)
+    if detect_compression(name):
+        name = os.path.splitext(name)[0]
+    return guess_format(name)
+
+
+def decompress(stream, codec):
+    """
+    Returns a binary file object decompressing a stream on the fly.
+    """
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if codec == "bz2":
+        return bz2.BZ2File(stream, mode="rb")
+    if codec == "xz":
+        return lzma.LZMAFile(stream, mode="rb")
+    if codec == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading zstd files requires the zstandard package: pip install rdflib-neo4j[zstd]")
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    return stream
+
+
+class ThreadedReader(io.RawIOBase):
+    """
+    Reads a binary stream on a separate thread, handing its chunks to the consumer through a bounded queue.
+
+    zlib, bz2, lzma and zstandard release the GIL while decompressing, so the decompression of the next chunks
+    overlaps with the parsing of the current one, while at most queue_size chunks are held in memory.
+    """
+
+    EOF = object()
+
+    def __init__(self, stream, chunk_size=DEFAULT_CHUNK_SIZE, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        Initializes a ThreadedReader object and starts reading the stream.
+
+        Args:
+            stream: The binary stream to read.
+            chunk_size: The number of bytes read at a time.
+            queue_size: The maximum number of chunks read ahead.
+        """
+        super().__init__()
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.chunks = queue.Queue(maxsize=queue_size)
+        self.current = memoryview(b"")
+        self.error = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.__pump, name="rdflib-neo4j-reader", daemon=True)
+        self.thread.start()
+
+    def __pump(self):
+        try:
+            while not self.stopped.is_set():
+                chunk = self.stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                self.__put(chunk)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.__put(ThreadedReader.EOF)
+
+    def __put(self, item):
+        # Waits for room in the queue, unless the consumer is closed
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.current:
+            chunk = self.chunks.get()
+            if chunk is ThreadedReader.EOF:
+                # Keeps returning EOF to the following calls
+                self.chunks.put(ThreadedReader.EOF)
+                if self.error is not None:
+                    raise self.error
+                return 0
+            self.current = memoryview(chunk)
+        size = min(len(buffer), len(self.current))
+        buffer[:size] = self.current[:size]
+        self.current = self.current[size:]
+        return size
+
+    def close(self):
+        self.stopped.set()
+        # The reading thread must be done with the stream before it is closed
+        self.thread.join()
+        super().close()
+
+
+@contextlib.contextmanager
+def open_rdf_source(path, threaded=True, chunk_size=DEFAULT_CHUNK_SIZE, queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Opens an RDF file, decompressing it on the fly if it is compressed with gzip, bz2, xz or zstd.
+
+    Yields:
+        A tuple (stream, raw): the binary stream of the decompressed content, and the underlying file, whose position
+        is the number of compressed bytes consumed.
+
+    Args:
+        path: The path of the file.
+        threaded: If the file is decompressed on a separate thread, overlapping with the parsing. Default: True
+        chunk_size: The number of bytes decompressed at a time. Default: 1 MiB
+        queue_size: The maximum number of decompressed chunks buffered ahead of the parser. Default: 8
+    """
+    with contextlib.ExitStack() as stack:
+        raw = stack.enter_context(open(path, "rb"))
+        codec = detect_compression(path, raw.peek(8)[:8])
+        stream = stack.enter_context(decompress(raw, codec)) if codec else raw
+        if threaded and codec:
+            stream = stack.enter_context(io.BufferedReader(ThreadedReader(stream, chunk_size, queue_size),
+                                                           buffer_size=chunk_size))
+        yield stream, raw
+
+
+def load_file(graph: Graph, path, format=None, threaded=True, chunk_size=DEFAULT_CHUNK_SIZE,
+              queue_size=DEFAULT_QUEUE_SIZE) -> Graph:
+    """
+    Parses an RDF file into a graph, streaming the decompression of .gz, .bz2, .xz and .zst files instead of
+    decompressing them to disk first.
+
+    Line-based formats (N-Triples, N-Quads) are parsed as they are decompressed, in bounded memory. When the graph is
+    backed by a Neo4jStore, the compressed file is tracked by its progress, for the bytes consumed and the ETA.
+
+    Args:
+        graph: The graph (or Dataset, for N-Quads and TriG) to parse the file into.
+        path: The path of the file.
+        format: The RDF format. Default: guessed from the extension, ignoring the one of the compression
+        threaded: If the file is decompressed on a separate thread, overlapping with the parsing. Default: True
+        chunk_size: The number of bytes decompressed at a time. Default: 1 MiB
+        queue_size: The maximum number of decompressed chunks buffered ahead of the parser. Default: 8
+
+    Returns:
+        Graph: The graph.
+    """
+    format = format or rdf_format(path)
+    with open_rdf_source(path, threaded=threaded, chunk_size=chunk_size, queue_size=queue_size) as (stream, raw):
+        if isinstance(graph.store, Neo4jStore):
+            graph.store.track_input(raw)
+        graph.parse(source=stream, format=format)
+    return graph
+
+
+def dump_lines(stream):
+    """
+    Yields the statements of a binary N-Triples or N-Quads stream, one per line without the surrounding whitespace,
+    skipping the blank lines and comments.
+    """
+    for line in io.TextIOWrapper(stream, encoding="utf-8"):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def unique(lines):
+    """
+    Drops the consecutive duplicates of a sorted stream of lines.
+    """
+    previous = None
+    for line in lines:
+        if line != previous:
+            yield line
+            previous = line
+
+
+def check_sorted(lines, name):
+    """
+    Yields the lines of a stream, raising a ValueError as soon as one is lower than the previous one.
+    """
+    previous = ""
+    for line in lines:
+        if line < previous:
+            raise ValueError(f"{name} is not sorted: {line!r} follows {previous!r}.")
+        yield line
+        previous = line
+
+
+def sorted_lines(lines, stack: contextlib.ExitStack, run_size=DEFAULT_RUN_SIZE, tmp_dir=None):
+    """
+    Sorts a stream of lines in bounded memory: runs of run_size lines are sorted and spilled to temporary files,
+    which are then merged lazily. The files are deleted when the stack is closed.
+    """
+    runs = []
+    while True:
+        run = sorted(itertools.islice(lines, run_size))
+        if not run:
+            break
+        spilled = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8", dir=tmp_dir))
+        spilled.writelines(f"{line}\n" for line in run)
+        spilled.seek(0)
+        runs.append(line.rstrip("\n") for line in spilled)
+    return heapq.merge(*runs)
+
+
+def diff_sorted(old, new):
+    """
+    Merges two sorted streams of unique lines, yielding (line, added) for the lines found in only one of them.
+    """
+    old_line, new_line = next(old, None), next(new, None)
+    while old_line is not None or new_line is not None:
+        if new_line is None or (old_line is not None and old_line < new_line):
+            yield old_line, False
+            old_line = next(old, None)
+        elif old_line is None or new_line < old_line:
+            yield new_line, True
+            new_line = next(new, None)
+        else:
+            old_line, new_line = next(old, None), next(new, None)
+
+
+def parsed_statements(data):
+    """
+    Yields the (triple, context) statements of a parsed graph, the context being None for a plain Graph.
+    """
+    if isinstance(data, Dataset):
+        for context in data.graphs():
+            for triple in context:
+                yield triple, context
+    else:
+        for triple in data:
+            yield triple, None
+
+
+def write_statements(graph: Graph, statements, remove=False) -> int:
+    """
+    Adds (or removes) (triple, context) statements to the store of a graph. The statements without context go to the
+    graph itself.
+
+    Returns:
+        int: The number of statements written.
+    """
+    store = graph.store
+    count = 0
+    for triple, context in statements:
+        if remove:
+            store.remove(triple, context=context if context is not None else graph)
+        else:
+            store.add(triple, context=context if context is not None else graph)
+        count += 1
+    return count
+
+
+def apply_lines(graph: Graph, lines, format, remove, batch_size=DEFAULT_DELTA_SIZE) -> int:
+    """
+    Parses statements batch_size at a time and adds them to (or removes them from) the store of a graph,
+    in the named graphs of the quads for N-Quads.
+
+    Returns:
+        int: The number of statements applied.
+    """
+    count = 0
+    while True:
+        batch = list(itertools.islice(lines, batch_size))
+        if not batch:
+            return count
+        data = Dataset() if format == "nquads" else Graph()
+        data.parse(data="\n".join(batch), format=format)
+        count += write_statements(graph, parsed_statements(data), remove=remove)
+
+
+def sync(graph: Graph, old_source, new_source, format=None, presorted=False, run_size=DEFAULT_RUN_SIZE,
+         batch_size=DEFAULT_DELTA_SIZE, tmp_dir=None) -> Tuple[int, int]:
+    """
+    Applies to a graph the difference between two N-Triples or N-Quads dumps (e.g. two releases of an ontology),
+    so that only the statements that changed are written instead of reloading the new dump.
+
+    Each dump is sorted with an external merge sort (runs of run_size statements spilled to temporary files), unless
+    it is already sorted, and the two sorted streams are merged to find the statements found in only one of them.
+    The removed and added statements are spilled to disk as well, then the removals go through the batched delete path
+    of the store before the additions go through its batched add path. Memory use doesn't depend on the size of the
+    dumps. Compressed dumps are decompressed on the fly, as in load_file.
+
+    Statements are compared line by line, so both dumps must be written the same way (e.g. by the same serializer):
+    the same term written with other escapes or whitespace is seen as a change. Blank nodes get new ids when parsed,
+    so the dumps should be skolemized.
+
+    Args:
+        graph: The graph (or Dataset, for N-Quads) backed by the store holding the old dump.
+        old_source: The path of the dump currently in the store.
+        new_source: The path of the dump to sync the store to.
+        format: "nt" or "nquads". Default: guessed from the extension of the new dump
+        presorted: If both dumps are already sorted by code point (e.g. with LC_ALL=C sort), which skips the sort.
+            A ValueError is raised if they are not. Default: False
+        run_size: The number of statements sorted in memory at a time. Default: 1000000
+        batch_size: The number of changed statements parsed and applied at a time. Default: 10000
+        tmp_dir: The directory of the temporary files. Default: the system temporary directory
+
+    Returns:
+        tuple: The number of statements added and removed.
+    """
+    format = format or rdf_format(new_source)
+    if format not in LINE_FORMATS:
+        raise ValueError(f"Unsupported sync format {format!r}, expected one of {LINE_FORMATS}.")
+    with contextlib.ExitStack() as stack:
+        streams = []
+        for source in (old_source, new_source):
+            stream, _ = stack.enter_context(open_rdf_source(source))
+            lines = dump_lines(stream)
+            if presorted:
+                lines = check_sorted(lines, source)
+            else:
+                lines = sorted_lines(lines, stack, run_size=run_size, tmp_dir=tmp_dir)
+            streams.append(unique(lines))
+        removed = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8", dir=tmp_dir))
+        added = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8", dir=tmp_dir))
+        for line, is_added in diff_sorted(*streams):
+            (added if is_added else removed).write(f"{line}\n")
+        removed.seek(0)
+        added.seek(0)
+        # Removing first, so that a changed property value is removed before the new one is set
+        removed_count = apply_lines(graph, (line.rstrip("\n") for line in removed), format, True, batch_size)
+        added_count = apply_lines(graph, (line.rstrip("\n") for line in added), format, False, batch_size)
+    if isinstance(graph.store, Neo4jStore):
+        graph.store.commit()
+    return added_count, removed_count
+
+
+def parse_file(path, format=None) -> Graph:
+    """
+    Parses an RDF file (decompressing it on the fly) into an in-memory graph, a Dataset for the quad formats.
+    """
+    format = format or rdf_format(path)
+    data = Dataset() if format in QUAD_FORMATS else Graph()
+    with open_rdf_source(path, threaded=False) as (stream, _):
+        data.parse(source=stream, format=format)
+    return data
+
+
+def parse_file_statements(path, format=None):
+    """
+    Parses an RDF file into a list of (triple, graph identifier) statements that can be sent across processes,
+    the identifier being None for a triple file.
+    """
+    return [(triple, context.identifier if context is not None else None)
+            for triple, context in parsed_statements(parse_file(path, format))]
+
+
+def bulk_load(graph: Graph, paths, workers=4, processes=False, format=None) -> Dict[str, Union[int, Exception]]:
+    """
+    Loads many RDF files (e.g. thousands of small Turtle files) into one store, reusing its driver and session
+    instead of opening a store per file.
+
+    The workers parse the files into memory, in a pool of threads or, sidestepping the GIL, of processes, so a file
+    that fails to parse writes nothing. The calling thread writes the parsed files as they come, so the store doesn't
+    need thread_safe, and their rows are batched together: the store is committed every batch_size statements (of its
+    configuration), or after every file without batching.
+
+    When a commit (or adding a file) fails, the buffered rows are discarded (Neo4jStore.rollback) and the files of the batch are written
+    again one at a time, each followed by a commit, so that the error is reported for the file that caused it. Writes
+    being MERGEs, the rows of the batch flushed before the error are written again unchanged. Under initial_load or
+    create_relationships, which CREATE the relationships, the files are not written again and the error is reported
+    for every file of the batch.
+
+    Args:
+        graph: The graph (or Dataset, for the quad formats) backed by the store to load into.
+        paths: The paths of the files.
+        workers: The number of parsing threads or processes. Default: 4
+        processes: If the files are parsed in a pool of processes instead of threads. Default: False
+        format: The RDF format of every file. Default: guessed from the extension of each file
+
+    Returns:
+        dict: The number of triples loaded for every path, or the exception raised while loading it.
+    """
+    store = graph.store
+    neo4j = isinstance(store, Neo4jStore)
+    if neo4j:
+        store.commit()
+    batch_size = store.config.batch_size if neo4j and store.batching else 0
+    rewrite = not neo4j or not (store.config.initial_load or store.config.create_relationships)
+    report = {}
+    contexts = {}
+    # The files whose rows are buffered since the last commit, and their number of statements
+    batch = []
+    batch_statements = 0
+
+    def statements(data):
+        if not processes:
+            return parsed_statements(data)
+        # The named graphs are rebuilt from their identifiers, once per graph
+        return ((triple, None if identifier is None else contexts.setdefault(identifier, Graph(identifier=identifier)))
+                for triple, identifier in data)
+
+    def fail(path, e):
+        logging.error(f"Failed to load {path}: {e}")
+        report[path] = e
+
+    def write_alone(path, data):
+        try:
+            report[path] = write_statements(graph, statements(data))
+            store.commit()
+        except Exception as e:
+            store.rollback()
+            fail(path, e)
+
+    def write_batch_again(e):
+        store.rollback()
+        for path, data in batch:
+            if rewrite:
+                write_alone(path, data)
+            else:
+                fail(path, e)
+        batch.clear()
+
+    def commit_batch():
+        try:
+            store.commit()
+        except Exception as e:
+            write_batch_again(e)
+        batch.clear()
+
+    pool = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+    with pool(max_workers=workers) as executor:
+        parse = parse_file_statements if processes else parse_file
+        futures = {executor.submit(parse, path, format): str(path) for path in paths}
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                fail(path, e)
+                continue
+            batch.append((path, data))
+            try:
+                report[path] = write_statements(graph, statements(data))
+            except Exception as e:
+                # The file can't be added, or a flush of the batch failed while adding it
+                batch_statements = 0
+                write_batch_again(e)
+                continue
+            batch_statements += report[path]
+            if batch_statements >= batch_size:
+                batch_statements = 0
+                commit_batch()
+        commit_batch()
+    return report
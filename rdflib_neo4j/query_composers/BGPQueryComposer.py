@@ -0,0 +1,356 @@
+import itertools
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from rdflib import Literal, RDF, URIRef
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.term import BNode, Variable
+
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import GRAPH_LABEL_PREFIX
+from rdflib_neo4j.query_composers.ReadQueryComposer import ReadQueryComposer
+from rdflib_neo4j.utils import bnode_to_uri, literal_to_neo4j_value, escape_identifier, uri_to_node, \
+    neo4j_value_to_literal
+
+NODE_KIND = "node"
+VALUE_KIND = "value"
+LABEL_KIND = "label"
+
+LABEL_TRIPLE = "label"
+PROP_TRIPLE = "prop"
+REL_TRIPLE = "rel"
+
+CYPHER_OPERATORS = {"=": "=", "!=": "<>", "<": "<", ">": ">", "<=": "<=", ">=": ">="}
+
+
+class EmptyPattern(Exception):
+    """
+    Raised while compiling a pattern that can't match anything in the graph (e.g. a predicate that was never written).
+    """
+
+
+class BGPQueryComposer(ReadQueryComposer):
+    """
+    Compiles a SPARQL basic graph pattern, together with the FILTER expressions and the LIMIT that can be pushed down,
+    into a single Cypher MATCH query, so that joins are executed by Neo4j instead of one triples() call per binding.
+
+    Compilation raises NotImplementedError for anything it can't translate faithfully (unbound predicates,
+    a variable used both as a node and as a value, ...) so that the caller can fall back to rdflib's evaluation.
+    """
+
+    def __init__(self, triples, config: Neo4jStoreConfig, bindings, graph_vocabulary: Callable[[], Tuple[Set, Set]]):
+        """
+        Initializes a BGPQueryComposer object.
+
+        Args:
+            triples: The triple patterns of the BGP.
+            config: The configuration the data was written with.
+            bindings: The variable bindings already fixed by the query context.
+            graph_vocabulary: Returns the (relationship types, property keys) of the database. Only called when a
+                predicate could be both a property or a relationship.
+        """
+        super().__init__(config)
+        self.triples = triples
+        self.bindings = bindings
+        self.graph_vocabulary = graph_vocabulary
+        self.__vocabulary = None
+        self.params: Dict = {}
+        self.kinds: Dict = {}
+        self.node_names: Dict = {}
+        self.var_names: Dict = {}
+        self.residual_filters: List = []
+        self.residual_offset = 0
+        # Whether a record can be read back as several solutions (see read_bindings)
+        self.expanding = False
+
+    def is_var(self, term) -> bool:
+        """
+        Checks whether a term is a variable that is not bound yet. Blank nodes in a BGP behave like variables.
+        """
+        return isinstance(term, (Variable, BNode)) and self.bindings.get(term) is None
+
+    def resolve(self, term):
+        """
+        Returns the value bound to a variable, or the term itself.
+        """
+        if isinstance(term, (Variable, BNode)) and self.bindings.get(term) is not None:
+            return self.bindings[term]
+        return term
+
+    def add_param(self, value) -> str:
+        name = f"p{len(self.params)}"
+        self.params[name] = value
+        return f"${name}"
+
+    def set_kind(self, var, kind) -> bool:
+        """
+        Records the kind of value a variable is bound to. Returns True if the kind is new.
+        """
+        current = self.kinds.get(var)
+        if current is None:
+            self.kinds[var] = kind
+            return True
+        if current != kind:
+            raise NotImplementedError(f"Variable {var} is used both as a {current} and as a {kind}.")
+        return False
+
+    def vocabulary(self):
+        if self.__vocabulary is None:
+            self.__vocabulary = self.graph_vocabulary()
+        return self.__vocabulary
+
+    def required_name(self, uri) -> str:
+        name = self.vocab_name(uri)
+        if name is None:
+            raise EmptyPattern()
+        return name
+
+    def classify(self) -> List[Tuple[str, object, object, object]]:
+        """
+        Decides for each triple pattern whether it matches a label, a property or a relationship,
+        and infers the kind of every variable.
+
+        Returns:
+            list: (triple kind, subject, predicate, object) tuples with the bound variables resolved.
+        """
+        resolved = [tuple(self.resolve(term) for term in triple) for triple in self.triples]
+        res: List = [None] * len(resolved)
+        changed = True
+        while changed:
+            changed = False
+            for i, (s, p, o) in enumerate(resolved):
+                if res[i] is not None:
+                    continue
+                if self.is_var(p) or not isinstance(p, URIRef):
+                    raise NotImplementedError("Unbound predicates are not pushed down.")
+                if isinstance(s, Literal):
+                    raise EmptyPattern()
+                if self.is_var(s):
+                    changed |= self.set_kind(s, NODE_KIND)
+                if p == RDF.type:
+                    kind = LABEL_TRIPLE
+                    if self.is_var(o):
+                        changed |= self.set_kind(o, LABEL_KIND)
+                    elif isinstance(o, Literal):
+                        raise EmptyPattern()
+                elif not self.is_var(o):
+                    kind = PROP_TRIPLE if isinstance(o, Literal) else REL_TRIPLE
+                elif o in self.kinds:
+                    if self.kinds[o] == LABEL_KIND:
+                        raise NotImplementedError(f"Variable {o} is used both as a label and as an object.")
+                    kind = PROP_TRIPLE if self.kinds[o] == VALUE_KIND else REL_TRIPLE
+                else:
+                    continue
+                if kind == PROP_TRIPLE and self.is_var(o):
+                    changed |= self.set_kind(o, VALUE_KIND)
+                elif kind == REL_TRIPLE and self.is_var(o):
+                    changed |= self.set_kind(o, NODE_KIND)
+                res[i] = (kind, s, p, o)
+                changed = True
+            if not changed:
+                # Nothing else can be inferred from the pattern itself: ask the database
+                for i, (s, p, o) in enumerate(resolved):
+                    if res[i] is not None:
+                        continue
+                    rel_types, prop_keys = self.vocabulary()
+                    name = self.required_name(p)
+                    if name in rel_types and name in prop_keys:
+                        raise NotImplementedError(f"{p} is used both as a property and as a relationship.")
+                    elif name in rel_types:
+                        self.set_kind(o, NODE_KIND)
+                        res[i] = (REL_TRIPLE, s, p, o)
+                    elif name in prop_keys:
+                        self.set_kind(o, VALUE_KIND)
+                        res[i] = (PROP_TRIPLE, s, p, o)
+                    else:
+                        raise EmptyPattern()
+                    changed = True
+                    break
+        return res
+
+    def node_key(self, term):
+        return term if self.is_var(term) else ("const", str(term))
+
+    def node(self, term, declared: Set) -> str:
+        """
+        Returns the Cypher pattern of a node, declaring it (with its uri when known) the first time it is used.
+        """
+        key = self.node_key(term)
+        if key not in self.node_names:
+            self.node_names[key] = f"n{len(self.node_names)}"
+        name = self.node_names[key]
+        if key in declared:
+            return f"({name})"
+        declared.add(key)
+        if self.is_var(term):
+            return f"({name}:Resource)"
+        uri = bnode_to_uri(term) if isinstance(term, BNode) else str(term)
+        return f"({name}:Resource{{ uri : {self.add_param(uri)} }})"
+
+    def var_name(self, var) -> str:
+        if var not in self.var_names:
+            self.var_names[var] = f"v{len(self.var_names)}"
+        return self.var_names[var]
+
+    def write_query(self, filters: List = (), offset: int = 0, limit: Optional[int] = None) -> str:
+        """
+        Writes the Cypher query for the BGP.
+
+        Args:
+            filters: SPARQL filter expressions, combined with AND. The ones that can't be translated are left in
+                `residual_filters` and must be evaluated by the caller.
+            offset: The number of solutions to skip. When a record can be read back as several solutions, it is left
+                in `residual_offset` and must be skipped by the caller, the query returning offset + limit records.
+            limit: The maximum number of solutions to return.
+
+        Returns:
+            str: The Cypher query. Raises EmptyPattern if it can't return anything.
+        """
+        classified = self.classify()
+        self.expanding = False
+        declared: Set = set()
+        matches, where, steps = [], [], []
+
+        # Seek the known nodes first, then walk the relationships
+        for kind, s, p, o in classified:
+            for term in (s, o) if kind == REL_TRIPLE else (s,):
+                if not self.is_var(term) and self.node_key(term) not in declared:
+                    matches.append(f"MATCH {self.node(term, declared)}")
+        for kind, s, p, o in classified:
+            if kind == REL_TRIPLE:
+                rel_type = escape_identifier(self.required_name(p))
+                matches.append(f"MATCH {self.node(s, declared)}-[:`{rel_type}`]->{self.node(o, declared)}")
+        for kind, s, p, o in classified:
+            if self.node_key(s) not in declared:
+                matches.append(f"MATCH {self.node(s, declared)}")
+
+        bound_vars: Set = set()
+        for kind, s, p, o in classified:
+            n = self.node_names[self.node_key(s)]
+            if kind == LABEL_TRIPLE:
+                if not self.is_var(o):
+                    where.append(f"{n}:`{escape_identifier(self.required_name(o))}`")
+                elif o in bound_vars:
+                    steps.append(f"WITH * WHERE {self.var_name(o)} IN labels({n})")
+                else:
+                    steps.append(f"UNWIND [l IN labels({n}) WHERE l <> 'Resource' "
+                                 f"AND NOT l STARTS WITH '{GRAPH_LABEL_PREFIX}'] AS {self.var_name(o)}")
+                    bound_vars.add(o)
+            elif kind == PROP_TRIPLE:
+                prop = f"{n}.`{escape_identifier(self.required_name(p))}`"
+                multi = self.is_multival(p)
+                if not self.is_var(o):
+                    value = self.add_param(literal_to_neo4j_value(o))
+                    where.append(f"{value} IN {prop}" if multi else f"{prop} = {value}")
+                elif o in bound_vars:
+                    v = self.var_name(o)
+                    steps.append(f"WITH * WHERE {v} IN {prop}" if multi else f"WITH * WHERE {prop} = {v}")
+                else:
+                    v = self.var_name(o)
+                    steps.append(f"UNWIND {prop} AS {v}" if multi else f"WITH *, {prop} AS {v} WHERE {v} IS NOT NULL")
+                    self.expanding |= not multi
+                    bound_vars.add(o)
+
+        q = " ".join(matches)
+        if where:
+            q += f" WHERE {' AND '.join(where)}"
+        if steps:
+            q += " " + " ".join(steps)
+        pushed = []
+        self.residual_filters = []
+        for expr in filters:
+            predicate = self.compile_filter(expr)
+            if predicate is None:
+                self.residual_filters.append(expr)
+            else:
+                pushed.append(predicate)
+        if pushed:
+            q += f" WITH * WHERE {' AND '.join(f'({predicate})' for predicate in pushed)}"
+        q += " RETURN " + (", ".join(f"{self.var_expression(var)} AS {self.var_name(var)}" for var in self.kinds)
+                           if self.kinds else "1 AS one")
+        self.residual_offset = 0
+        if offset and self.expanding:
+            # SKIP counts records, not solutions
+            self.residual_offset, offset = offset, 0
+            limit = None if limit is None else self.residual_offset + limit
+        if offset:
+            q += f" SKIP {self.add_param(offset)}"
+        if limit is not None:
+            q += f" LIMIT {self.add_param(limit)}"
+        return q
+
+    def var_expression(self, var) -> str:
+        """
+        Returns the Cypher expression holding the value of a variable.
+        """
+        if self.kinds[var] == NODE_KIND:
+            return f"{self.node_names[var]}.uri"
+        return self.var_name(var)
+
+    @staticmethod
+    def conjuncts(expr) -> List:
+        """
+        Splits a filter expression on its top level && operators, so that each part can be pushed down on its own.
+        """
+        if isinstance(expr, CompValue) and expr.name == "ConditionalAndExpression":
+            return [c for e in [expr.expr] + list(expr.other or []) for c in BGPQueryComposer.conjuncts(e)]
+        return [expr]
+
+    def compile_filter(self, expr) -> Optional[str]:
+        """
+        Translates a SPARQL filter expression into a Cypher predicate over the variables of the BGP.
+        Only comparisons between variables and constants, combined with &&, || and !, are supported.
+        Must be called after write_query, once the variables are known.
+
+        Returns:
+            str: The Cypher predicate, or None if the expression can't be pushed down.
+        """
+        if not isinstance(expr, CompValue):
+            return None
+        if expr.name in ("ConditionalAndExpression", "ConditionalOrExpression"):
+            parts = [self.compile_filter(e) for e in [expr.expr] + list(expr.other or [])]
+            if None in parts:
+                return None
+            op = " AND " if expr.name == "ConditionalAndExpression" else " OR "
+            return op.join(f"({part})" for part in parts)
+        if expr.name == "UnaryNot":
+            inner = self.compile_filter(expr.expr)
+            return None if inner is None else f"NOT ({inner})"
+        if expr.name == "RelationalExpression" and expr.op in CYPHER_OPERATORS:
+            return self.compile_comparison(expr.expr, CYPHER_OPERATORS[expr.op], expr.other)
+        return None
+
+    def compile_comparison(self, left, op, right) -> Optional[str]:
+        left, right = self.resolve(left), self.resolve(right)
+        if self.is_var(right) and not self.is_var(left):
+            left, right = right, left
+        if not self.is_var(left) or left not in self.kinds:
+            return None
+        kind = self.kinds[left]
+        if self.is_var(right):
+            if right not in self.kinds or self.kinds[right] != kind or (kind != VALUE_KIND and op not in ("=", "<>")):
+                return None
+            return f"{self.var_expression(left)} {op} {self.var_expression(right)}"
+        if kind == VALUE_KIND and isinstance(right, Literal):
+            return f"{self.var_expression(left)} {op} {self.add_param(literal_to_neo4j_value(right))}"
+        if kind == NODE_KIND and isinstance(right, URIRef) and op in ("=", "<>"):
+            return f"{self.var_expression(left)} {op} {self.add_param(str(right))}"
+        if kind == LABEL_KIND and isinstance(right, URIRef) and op in ("=", "<>"):
+            label = self.vocab_name(right)
+            return None if label is None else f"{self.var_expression(left)} {op} {self.add_param(label)}"
+        return None
+
+    def read_bindings(self, record) -> List[Dict]:
+        """
+        Converts a record returned by the query into the variable bindings it represents.
+        A list value (a property stored as an array but configured as single valued) yields one binding per element.
+        """
+        columns = []
+        for var, kind in self.kinds.items():
+            value = record[self.var_name(var)]
+            if kind == NODE_KIND:
+                columns.append([uri_to_node(value)])
+            elif kind == LABEL_KIND:
+                columns.append([self.reverse_name(value)])
+            else:
+                columns.append([neo4j_value_to_literal(v) for v in (value if isinstance(value, list) else [value])])
+        return [dict(zip(self.kinds, values)) for values in itertools.product(*columns)]
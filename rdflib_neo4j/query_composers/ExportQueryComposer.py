@@ -0,0 +1,105 @@
+from typing import Dict, Optional, Tuple
+
+from rdflib import RDF
+
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import HANDLE_CONTEXT_STRATEGY, GRAPH_URI_PROPERTY, GRAPH_LABEL_PREFIX, \
+    INTERNAL_PROPERTIES
+from rdflib_neo4j.query_composers.ReadQueryComposer import ReadQueryComposer
+from rdflib_neo4j.utils import uri_to_node, neo4j_value_to_literal, graph_uri_to_context
+
+
+class ExportQueryComposer(ReadQueryComposer):
+    """
+    Writes the queries reading the whole graph back as RDF, one page of :Resource nodes at a time.
+
+    Pages are read with keyset pagination on the uri, so every page is an index seek instead of a growing SKIP.
+    Under HANDLE_CONTEXT_STRATEGY.PROPERTY, where the same uri is a node per graph, a page holds page_size uris with
+    every graph copy of each of them, so that the cursor stays a range seek on the (uri, graphUri) index.
+    Each record holds a node with its labels, properties and outgoing relationships.
+    """
+
+    def __init__(self, config: Neo4jStoreConfig, page_size: int):
+        """
+        Initializes an ExportQueryComposer object.
+
+        Args:
+            config: The configuration the data was written with.
+            page_size: The number of nodes (uris under HANDLE_CONTEXT_STRATEGY.PROPERTY) read per query.
+        """
+        super().__init__(config)
+        self.page_size = page_size
+        self.by_graph = config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY
+
+    def write_page_query(self, after: Optional[str]) -> Tuple[str, Dict]:
+        """
+        Writes the query reading the page of nodes following a cursor.
+
+        Args:
+            after: The cursor returned by next_cursor for the previous page, None for the first page.
+
+        Returns:
+            tuple: The query and its parameters.
+        """
+        params = {"limit": self.page_size}
+        conditions = []
+        if after is not None:
+            params["after"] = after
+            conditions.append("s.uri > $after")
+        if self.by_graph:
+            # The store writes a graphUri on every node, the condition lets the planner seek the composite index
+            conditions.append(f"s.`{GRAPH_URI_PROPERTY}` IS NOT NULL")
+        q = "MATCH (s:Resource) "
+        if conditions:
+            q += f"WHERE {' AND '.join(conditions)} "
+        if self.by_graph:
+            q += "WITH DISTINCT s.uri AS uri ORDER BY uri LIMIT $limit "
+            q += f"MATCH (s:Resource {{uri: uri}}) WHERE s.`{GRAPH_URI_PROPERTY}` IS NOT NULL "
+        else:
+            q += "WITH s ORDER BY s.uri LIMIT $limit "
+        q += f"RETURN s.uri AS s, COALESCE(s.`{GRAPH_URI_PROPERTY}`, '') AS g, labels(s) AS labels, " \
+             f"properties(s) AS props, [(s)-[r]->(o:Resource) | [type(r), o.uri, r.`{GRAPH_URI_PROPERTY}`]] AS rels"
+        return q, params
+
+    def next_cursor(self, page) -> Optional[str]:
+        """
+        Returns the cursor to read the page following a page of records, None if it was the last one.
+        """
+        read = len({record["s"] for record in page}) if self.by_graph else len(page)
+        return page[-1]["s"] if page and read >= self.page_size else None
+
+    def read_quads(self, record):
+        """
+        Converts a record into the quads it represents, as (subject, predicate, object, graph URI) tuples
+        where the graph URI is None for the default graph.
+        """
+        subject = uri_to_node(record["s"])
+        strategy = self.config.handle_context_strategy
+        labels = [label for label in record["labels"] if label != "Resource"]
+        if strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+            node_graphs = [graph_uri_to_context(record["g"])]
+        elif strategy == HANDLE_CONTEXT_STRATEGY.LABEL:
+            # Under LABEL a node is shared by its graphs, so its labels and properties belong to each of them
+            node_graphs = [label[len(GRAPH_LABEL_PREFIX):] for label in labels
+                           if label.startswith(GRAPH_LABEL_PREFIX)] or [None]
+        else:
+            node_graphs = [None]
+        labels = [label for label in labels if not label.startswith(GRAPH_LABEL_PREFIX)]
+
+        for graph in node_graphs:
+            for label in labels:
+                yield subject, RDF.type, self.reverse_name(label), graph
+            for key, values in record["props"].items():
+                if key in INTERNAL_PROPERTIES:
+                    continue
+                prop = self.reverse_name(key)
+                for value in (values if isinstance(values, list) else [values]):
+                    yield subject, prop, neo4j_value_to_literal(value), graph
+        for rel_type, to_uri, rel_graph in record["rels"]:
+            if strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+                graph = graph_uri_to_context(record["g"])
+            elif strategy == HANDLE_CONTEXT_STRATEGY.LABEL:
+                graph = graph_uri_to_context(rel_graph)
+            else:
+                graph = None
+            yield subject, self.reverse_name(rel_type), uri_to_node(to_uri), graph
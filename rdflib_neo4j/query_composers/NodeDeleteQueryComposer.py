@@ -0,0 +1,46 @@
+from rdflib_neo4j.query_composers.NodeQueryComposer import NodeQueryComposer
+
+
+def prop_query_remove(prop, value=None):
+    value = value or f'param["{prop}"]'
+    return f"""n.`{prop}` = CASE WHEN n.`{prop}` IN COALESCE({value}, []) THEN NULL ELSE n.`{prop}` END"""
+
+
+def prop_query_remove_from_array(prop, value=None):
+    value = value or f'param["{prop}"]'
+    return f"""n.`{prop}` = CASE WHEN {value} IS NULL OR n.`{prop}` IS NULL THEN n.`{prop}` WHEN ALL(val IN n.`{prop}` WHERE val IN {value}) THEN NULL ELSE [val IN n.`{prop}` WHERE NOT val IN {value}] END"""
+
+
+class NodeDeleteQueryComposer(NodeQueryComposer):
+    """
+    Composes the batched query that retracts labels and property values from existing nodes.
+
+    Each query parameter holds the uri of the node and, for every property, the list of values to remove.
+    Single valued properties are removed if their value is in the list, arrays are shrunk
+    and removed once they are empty.
+    """
+
+    def write_query(self):
+        """
+        Writes the Neo4j query for removing labels and property values from nodes.
+
+        Returns:
+            str: The Neo4j query.
+        """
+        q = f''' {self.query_params.unwind()} MATCH {self.node_pattern()} '''
+        if self.labels:
+            q += f'''REMOVE {', '.join([f"""n:`{label}`""" for label in self.labels])} '''
+        props = [prop_query_remove(prop, self.query_params.ref(prop)) for prop in self.props]
+        props += [prop_query_remove_from_array(prop, self.query_params.ref(prop)) for prop in self.multi_props]
+        if props:
+            q += f'''SET {', '.join(props)}'''
+        return q
+
+    def is_redundant(self):
+        """
+        Checks if the NodeDeleteQueryComposer is redundant, i.e., if it has nothing to remove.
+
+        Returns:
+            bool: True if redundant, False otherwise.
+        """
+        return not self.query_params or (not self.labels and not self.props and not self.multi_props)
@@ -1,35 +1,96 @@
-from typing import Set, List, Dict
+from typing import Set
 
-from rdflib_neo4j.config.const import HANDLE_MULTIVAL_STRATEGY
+from rdflib_neo4j.config.const import HANDLE_MULTIVAL_STRATEGY, HANDLE_CONTEXT_STRATEGY, GRAPH_URI_PROPERTY, \
+    HANDLE_MULTIVAL_APPEND_STRATEGY
+from rdflib_neo4j.query_composers.ParamBuffer import RowParamBuffer, ColumnarParamBuffer
 
 
-def prop_query_append(prop):
-    return  f"""n.`{prop}` = CASE WHEN COALESCE(param["{prop}"], NULL) IS NULL THEN n.`{prop}` ELSE REDUCE(i=COALESCE(n.`{prop}`,[]), val IN param["{prop}"] | CASE WHEN val IN i THEN i ELSE i+val END) END """
+def prop_query_append(prop, value=None):
+    value = value or f'param["{prop}"]'
+    return  f"""n.`{prop}` = CASE WHEN COALESCE({value}, NULL) IS NULL THEN n.`{prop}` ELSE REDUCE(acc=COALESCE(n.`{prop}`,[]), val IN {value} | CASE WHEN val IN acc THEN acc ELSE acc+val END) END """
 
 
+def prop_query_append_missing(prop, value=None):
+    value = value or f'param["{prop}"]'
+    return f"""n.`{prop}` = CASE WHEN COALESCE({value}, NULL) IS NULL THEN n.`{prop}` ELSE COALESCE(n.`{prop}`,[]) + [val IN {value} WHERE n.`{prop}` IS NULL OR NOT val IN n.`{prop}`] END"""
 
-def prop_query_single(prop):
-    return f"""n.`{prop}` = COALESCE(param["{prop}"], n.`{prop}`)"""
+
+def prop_query_union(prop, value=None):
+    value = value or f'param["{prop}"]'
+    return f"""n.`{prop}` = CASE WHEN COALESCE({value}, NULL) IS NULL THEN n.`{prop}` ELSE apoc.coll.union(COALESCE(n.`{prop}`,[]), {value}) END"""
+
+
+def prop_query_multi(prop, value, handle_multival_append_strategy):
+    """
+    Returns the assignment appending the values of a multivalued property, according to the append strategy.
+    """
+    if handle_multival_append_strategy == HANDLE_MULTIVAL_APPEND_STRATEGY.APOC_UNION:
+        return prop_query_union(prop, value)
+    if handle_multival_append_strategy in (HANDLE_MULTIVAL_APPEND_STRATEGY.LIST_COMPREHENSION,
+                                           HANDLE_MULTIVAL_APPEND_STRATEGY.ON_CREATE_OVERWRITE):
+        return prop_query_append_missing(prop, value)
+    return prop_query_append(prop, value)
+
+
+def prop_query_single(prop, value=None):
+    value = value or f'param["{prop}"]'
+    return f"""n.`{prop}` = COALESCE({value}, n.`{prop}`)"""
+
+
+def prop_query_create(prop, value=None):
+    value = value or f'param["{prop}"]'
+    return f"""n.`{prop}` = {value}"""
+
+
+def resource_pattern(var, uri, context, handle_context_strategy):
+    """
+    Returns the pattern identifying a :Resource node. Under HANDLE_CONTEXT_STRATEGY.PROPERTY,
+    nodes of a named graph are identified by their uri and the $graph parameter.
+    """
+    if context is not None and handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+        return f"""({var}:Resource{{ uri : {uri}, {GRAPH_URI_PROPERTY} : $graph }})"""
+    return f"""({var}:Resource{{ uri : {uri} }})"""
 
 
 class NodeQueryComposer:
     labels: Set[str] = set()
     props: Set[str] = set()
-    query_params: List[Dict]
+    query_params: RowParamBuffer | ColumnarParamBuffer
 
-    def __init__(self, labels, handle_multival_strategy, multival_props_predicates):
+    def __init__(self, labels, handle_multival_strategy, multival_props_predicates, context=None,
+                 handle_context_strategy=HANDLE_CONTEXT_STRATEGY.IGNORE, columnar=False, create=False,
+                 handle_multival_append_strategy=HANDLE_MULTIVAL_APPEND_STRATEGY.REDUCE, track_sources=False):
         """
         Initializes a NodeQueryComposer object.
 
         Args:
             labels: The labels to assign to the nodes.
+            context: The URI of the named graph the nodes belong to, None for the default graph.
+            handle_context_strategy: The strategy to handle the context.
+            columnar: If the query parameters are buffered as parallel lists instead of rows. Default: False
+            create: If the nodes are new (initial load), so that they are CREATEd and their properties set
+                without merging them with existing values. Default: False
+            handle_multival_append_strategy: The strategy to append multiple values to the ones already stored.
+            track_sources: If the source triples of every row are kept, to report the rows that fail. Default: False
         """
         self.labels = labels
         self.props = set()
         self.multi_props = set()
-        self.query_params = []
+        self.columnar = columnar
+        self.create = create
+        self.query_params = self.new_param_buffer()
         self.handle_multival_strategy = handle_multival_strategy
         self.multival_props_predicates = multival_props_predicates
+        self.context = context
+        self.handle_context_strategy = handle_context_strategy
+        self.handle_multival_append_strategy = handle_multival_append_strategy
+        self.sources = [] if track_sources else None
+
+    def new_param_buffer(self):
+        """
+        Returns an empty buffer for the query parameters.
+        """
+        return ColumnarParamBuffer(("uri",)) if self.columnar else RowParamBuffer()
 
     def add_props(self, props, multi=False):
         """
@@ -44,14 +105,17 @@ class NodeQueryComposer:
         else:
             self.multi_props.update(props)
 
-    def add_query_param(self, param):
+    def add_query_param(self, param, sources=()):
         """
         Adds a query parameter.
 
         Args:
             param: The query parameter to add.
+            sources: The triples the query parameter was built from, kept if the sources are tracked.
         """
         self.query_params.append(param)
+        if self.sources is not None:
+            self.sources.append(list(sources))
 
     def write_query(self):
         """
@@ -61,13 +125,40 @@ class NodeQueryComposer:
             str: The Neo4j query.
         """
 
-        q = ''' UNWIND $params as param MERGE (n:Resource{ uri : param["uri"] }) '''
+        q = f''' {self.query_params.unwind()} {"CREATE" if self.create else "MERGE"} {self.node_pattern()} '''
+        if self.overwrites_on_create():
+            # ON CREATE SET and ON MATCH SET must directly follow the MERGE
+            ref = self.query_params.ref
+            q += f'''ON CREATE SET {', '.join([prop_query_create(prop, ref(prop)) for prop in self.multi_props])} '''
+            q += f'''ON MATCH SET {', '.join([prop_query_append_missing(prop, ref(prop)) for prop in self.multi_props])} '''
         if self.labels:
             q += f'''SET {', '.join([f"""n:`{label}`""" for label in self.labels])} '''
         if self.props or self.multi_props:
             q += self.write_prop_query()
         return q
 
+    def node_pattern(self):
+        """
+        Returns the pattern identifying the node of the current row.
+        """
+        return resource_pattern("n", self.query_params.ref("uri"), self.context, self.handle_context_strategy)
+
+    def get_query_parameters(self, start=0, stop=None):
+        """
+        Returns the parameters to send along with the query.
+
+        Args:
+            start: The index of the first row to send. Default: 0
+            stop: The index after the last row to send, None for every row. Default: None
+
+        Returns:
+            dict: The rows to UNWIND and, for a named graph, its URI.
+        """
+        res = {"params": self.query_params.payload(start, stop)}
+        if self.context is not None:
+            res["graph"] = self.context
+        return res
+
     def write_prop_query(self):
         """
         Generates a Cypher query to handle property updates based on the chosen strategy.
@@ -75,38 +166,75 @@ class NodeQueryComposer:
         Returns:
         The generated Cypher query.
         """
+        ref = self.query_params.ref
+        if self.create:
+            # New nodes have no value to keep or append to
+            return f'''SET {', '.join([prop_query_create(prop, ref(prop)) for prop in self.props | self.multi_props])}'''
         if self.handle_multival_strategy == HANDLE_MULTIVAL_STRATEGY.ARRAY:
             # Strategy to treat multiple values as an array
             if self.multival_props_predicates:
                 # If there are properties treated as multivalued, use SET query for each property
                 # and SET query for each property to append to the array
-                q = f'''SET {', '.join([prop_query_single(prop) for prop in self.props])}''' if self.props else ''
-                if self.multi_props:
-                    q += f''' SET {', '.join([prop_query_append(prop) for prop in self.multi_props])}'''
+                q = f'''SET {', '.join([prop_query_single(prop, ref(prop)) for prop in self.props])}''' if self.props else ''
+                if self.multi_props and not self.overwrites_on_create():
+                    q += f''' SET {self.multi_prop_assignments()}'''
             else:
-                # If all properties are treated as multivalued, use SET query to append to the array
-                q = f'''SET {', '.join([prop_query_append(prop) for prop in self.multi_props])}'''
+                # If all properties are treated as multivalued, use SET query to append to the array.
+                # The only single valued properties are the ones written by the store itself (e.g. the content hash)
+                q = f'''SET {', '.join([prop_query_single(prop, ref(prop)) for prop in self.props])} ''' if self.props else ''
+                if self.multi_props and not self.overwrites_on_create():
+                    q += f'''SET {self.multi_prop_assignments()}'''
         else:
             # Strategy to overwrite multiple values
             # Use SET query for each property
-            q = f'''SET {', '.join([prop_query_single(prop) for prop in self.props])}'''
+            q = f'''SET {', '.join([prop_query_single(prop, ref(prop)) for prop in self.props])}'''
         return q
 
+    def overwrites_on_create(self):
+        """
+        Checks if the multivalued properties are set as is on the nodes created by the MERGE.
+        """
+        return not self.create and bool(self.multi_props) and \
+            self.handle_multival_strategy == HANDLE_MULTIVAL_STRATEGY.ARRAY and \
+            self.handle_multival_append_strategy == HANDLE_MULTIVAL_APPEND_STRATEGY.ON_CREATE_OVERWRITE
+
+    def multi_prop_assignments(self):
+        """
+        Returns the assignments appending the values of the multivalued properties, according to the append strategy.
+        """
+        ref = self.query_params.ref
+        return ', '.join([prop_query_multi(prop, ref(prop), self.handle_multival_append_strategy)
+                          for prop in self.multi_props])
+
+    def written_uris(self):
+        """
+        Yields the URIs of the buffered nodes.
+        """
+        for row in self.query_params:
+            yield row["uri"]
+
     def is_redundant(self):
         """
-        Checks if the NodeQueryComposer is redundant, i.e., if it has no properties,labels and query parameters.
+        Checks if the NodeQueryComposer is redundant, i.e., if it has no query parameters left to write.
 
         Returns:
             bool: True if redundant, False otherwise.
         """
-        return not self.props and not self.labels and not self.query_params
+        return not self.query_params
 
     def empty_query_params(self):
         """
         Empties the query parameters list.
         """
-        del self.query_params
-        self.query_params = []
+        self.query_params = self.new_param_buffer()
+        if self.sources is not None:
+            self.sources = []
+
+    def row_sources(self, index):
+        """
+        Returns the source triples of a buffered row, an empty list if they are not tracked.
+        """
+        return self.sources[index] if self.sources is not None else []
 
     def __eq__(self, other):
         """
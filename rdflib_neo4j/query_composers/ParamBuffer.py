@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional, Tuple
+
+
+def in_transactions(query: str, buffer, rows: int, concurrency: int = 0) -> str:
+    """
+    Wraps a query starting with the UNWIND of a buffer in `CALL { ... } IN TRANSACTIONS`, so that the server commits
+    its rows in transactions of `rows` rows. The query must run in an implicit (auto-commit) transaction.
+
+    Parameters:
+    - query: The query, starting with buffer.unwind().
+    - buffer: The buffer holding the rows of the query.
+    - rows: The number of rows per transaction.
+    - concurrency: The number of transactions run concurrently, 0 to run them one after the other
+      (CONCURRENT transactions require Neo4j 5.21 or later).
+
+    Returns:
+    The wrapped query.
+    """
+    unwind = buffer.unwind()
+    body = query.strip()
+    assert body.startswith(unwind), "The query must start with the UNWIND of its buffer."
+    concurrent = f"{concurrency} CONCURRENT " if concurrency else ""
+    return f"{unwind} CALL {{ WITH {buffer.variable} {body[len(unwind):].strip()} }} " \
+           f"IN {concurrent}TRANSACTIONS OF {rows} ROWS"
+
+
+class RowParamBuffer(list):
+    """
+    Buffers the query parameters of a composer as a list of rows (one dict per node or relationship),
+    sent as is and consumed with `UNWIND $params as param`.
+    """
+
+    variable = "param"
+
+    def payload(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """
+        Returns the value of the $params parameter, restricted to the rows between start and stop if given.
+        """
+        return self if start == 0 and (stop is None or stop >= len(self)) else self[start:stop]
+
+    def row(self, index: int) -> Dict:
+        """
+        Returns a buffered row.
+        """
+        return self[index]
+
+    def unwind(self) -> str:
+        """
+        Returns the UNWIND clause iterating over the rows.
+        """
+        return "UNWIND $params as param"
+
+    def ref(self, key: str) -> str:
+        """
+        Returns the Cypher expression reading a key of the current row.
+        """
+        return f'param["{key}"]'
+
+
+class ColumnarParamBuffer:
+    """
+    Buffers the query parameters of a composer as parallel lists, one per key, consumed by index with
+    `UNWIND range(0, size(...) - 1) AS i`.
+
+    A column holds every value of a key instead of every row holding a dict, which takes much less memory
+    for large batches and is faster for the driver to pack.
+    """
+
+    variable = "i"
+
+    def __init__(self, key_columns: Tuple[str, ...]):
+        """
+        Initializes a ColumnarParamBuffer object.
+
+        Args:
+            key_columns: The keys present in every row. The first one is used to size the UNWIND.
+        """
+        self.key_columns = key_columns
+        self.columns: Dict[str, List] = {key: [] for key in key_columns}
+        self.size = 0
+
+    def append(self, row: Dict):
+        """
+        Adds a row to the buffer. Columns missing from the row are padded with nulls.
+
+        Args:
+            row: The row to add.
+        """
+        size = self.size
+        for key, value in row.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * size
+            elif len(column) < size:
+                column.extend([None] * (size - len(column)))
+            column.append(value)
+        self.size = size + 1
+
+    def payload(self, start: int = 0, stop: Optional[int] = None) -> Dict[str, List]:
+        """
+        Returns the value of the $params parameter, padding the columns that are shorter than the buffer.
+        The columns are sliced to the rows between start and stop if given.
+        """
+        for column in self.columns.values():
+            if len(column) < self.size:
+                column.extend([None] * (self.size - len(column)))
+        if start == 0 and (stop is None or stop >= self.size):
+            return self.columns
+        return {key: column[start:stop] for key, column in self.columns.items()}
+
+    def row(self, index: int) -> Dict:
+        """
+        Returns a buffered row, rebuilt as a dict without the missing values.
+        """
+        columns = self.payload()
+        return {key: column[index] for key, column in columns.items() if column[index] is not None}
+
+    def unwind(self) -> str:
+        """
+        Returns the UNWIND clause iterating over the row indexes.
+        """
+        return f'UNWIND range(0, size($params["{self.key_columns[0]}"]) - 1) AS i'
+
+    def ref(self, key: str) -> str:
+        """
+        Returns the Cypher expression reading a key of the current row.
+        """
+        return f'$params["{key}"][i]'
+
+    def clear(self):
+        """
+        Empties the buffer.
+        """
+        self.columns = {key: [] for key in self.key_columns}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """
+        Iterates over the buffered rows, rebuilt as dicts without the missing values.
+        """
+        for i in range(self.size):
+            yield self.row(i)
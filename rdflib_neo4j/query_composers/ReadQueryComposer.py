@@ -0,0 +1,52 @@
+from typing import Optional
+
+from rdflib import URIRef
+
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import HANDLE_MULTIVAL_STRATEGY, ShortenStrictException
+from rdflib_neo4j.utils import handle_vocab_uri, reverse_vocab_uri
+
+
+class ReadQueryComposer:
+    """
+    Base class for the composers of read queries. It knows how the store named labels, properties and relationships
+    so that URIs can be translated to graph names and back.
+    """
+
+    def __init__(self, config: Neo4jStoreConfig):
+        """
+        Initializes a ReadQueryComposer object.
+
+        Args:
+            config: The configuration the data was written with.
+        """
+        self.config = config
+        self.mappings = config.custom_mappings
+        self.reversed_mappings = {value: key for key, value in config.custom_mappings.items()}
+        self.namespaces = config.get_prefixes()
+        # Reversing the Prefix dictionary
+        self.prefixes = {value: key for key, value in self.namespaces.items()}
+
+    def vocab_name(self, uri) -> Optional[str]:
+        """
+        Applies the vocabulary strategy to a URI, returning None if it can't be named in the graph
+        (i.e. under SHORTEN with a namespace that has no prefix, nothing can have been written with it).
+        """
+        try:
+            return str(handle_vocab_uri(self.mappings, uri, self.prefixes, self.config.handle_vocab_uri_strategy))
+        except ShortenStrictException:
+            return None
+
+    def reverse_name(self, name: str) -> URIRef:
+        """
+        Turns a label, property name or relationship type back into a URI.
+        """
+        return reverse_vocab_uri(name, self.reversed_mappings, self.namespaces, self.config.handle_vocab_uri_strategy)
+
+    def is_multival(self, predicate) -> bool:
+        """
+        Checks whether a property is stored as an array according to the multival configuration.
+        """
+        if self.config.handle_multival_strategy != HANDLE_MULTIVAL_STRATEGY.ARRAY:
+            return False
+        return not self.config.multival_props_names or str(predicate) in self.config.multival_props_names
@@ -0,0 +1,23 @@
+from rdflib_neo4j.query_composers.RelationshipQueryComposer import RelationshipQueryComposer
+
+
+class RelationshipDeleteQueryComposer(RelationshipQueryComposer):
+    """
+    Composes the batched query that deletes relationships of a given type between existing nodes.
+    """
+
+    def write_query(self):
+        """
+        Writes the Neo4j query for deleting relationships.
+
+        Returns:
+            str: The Neo4j query.
+        """
+        if self.grouped:
+            return f''' {self.query_params.unwind()} 
+                 MATCH {self.node_pattern("from")}
+                 {self.unwind_targets()}MATCH (from)-{self.rel_pattern()}->{self.node_pattern("to")}
+                 DELETE r'''
+        return f''' {self.query_params.unwind()} 
+                 MATCH {self.node_pattern("from")}-{self.rel_pattern()}->{self.node_pattern("to")}
+                 DELETE r'''
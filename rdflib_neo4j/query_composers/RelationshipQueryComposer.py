@@ -1,21 +1,50 @@
-from typing import Set, List, Dict
+from collections import Counter
+from typing import Set
+
+from rdflib_neo4j.config.const import HANDLE_CONTEXT_STRATEGY, GRAPH_URI_PROPERTY
+from rdflib_neo4j.query_composers.NodeQueryComposer import resource_pattern
+from rdflib_neo4j.query_composers.ParamBuffer import RowParamBuffer, ColumnarParamBuffer
+
+
+def supernode_key(from_node, to_node, hot):
+    """
+    Returns the sort key of a supernode relationship: its supernode first (the target when both ends are), then its other end.
+    """
+    return (to_node, from_node) if to_node in hot else (from_node, to_node)
 
 
 class RelationshipQueryComposer:
     rel_type: str
     props: Set[str] = set()
-    query_params: List[Dict]
+    query_params: RowParamBuffer | ColumnarParamBuffer
 
-    def __init__(self, rel_type):
+    def __init__(self, rel_type, context=None, handle_context_strategy=HANDLE_CONTEXT_STRATEGY.IGNORE,
+                 columnar=False, grouped=False, match_endpoints=False, create=False, track_sources=False):
         """
         Initializes a RelationshipQueryComposer object.
 
         Args:
             rel_type (str): The type of the relationship.
+            context: The URI of the named graph the relationships belong to, None for the default graph.
+            handle_context_strategy: The strategy to handle the context.
+            columnar: If the query parameters are buffered as parallel lists instead of rows. Default: False
+            grouped: If the relationships are buffered as one {from, tos} row per start node, so that the start node
+                is merged once for all its targets. Default: False
+            match_endpoints: If both ends of every relationship are known to exist, so that they are MATCHed instead of
+                MERGEd. Default: False
+            create: If the relationships are new (initial load), so that they are CREATEd. Default: False
+            track_sources: If the source triples of every row are kept, to report the rows that fail. Default: False
         """
         self.rel_type = rel_type
         self.props = set()
-        self.query_params = []
+        self.grouped = grouped
+        self.columnar = columnar
+        self.match_endpoints = match_endpoints
+        self.create = create
+        self.query_params = self.new_param_buffer()
+        self.context = context
+        self.handle_context_strategy = handle_context_strategy
+        self.sources = [] if track_sources else None
 
     def add_props(self, props):
         """
@@ -27,7 +56,15 @@ class RelationshipQueryComposer:
         self.props.update(props)
         raise NotImplementedError("TO WORK ON THIS, WE NEED TEST DATA")
 
-    def add_query_param(self, from_node, to_node):
+    def new_param_buffer(self):
+        """
+        Returns an empty buffer for the query parameters.
+        """
+        if self.columnar:
+            return ColumnarParamBuffer(("from",) if self.grouped else ("from", "to"))
+        return RowParamBuffer()
+
+    def add_query_param(self, from_node, to_node, source=None):
         """
         Adds a query parameter consisting of 'from' (The URI of the node at the start of the relationship)
             and 'to' (The URI of the node at the end of the relationship).
@@ -35,8 +72,29 @@ class RelationshipQueryComposer:
         Args:
             from_node: The 'from' node (The URI of the node at the start of the relationship).
             to_node: The 'to' node (The URI of the node at the end of the relationship).
+            source: The triple the relationship was built from, kept if the sources are tracked.
         """
         self.query_params.append({"from": from_node, "to": to_node})
+        if self.sources is not None:
+            self.sources.append([source] if source is not None else [])
+
+    def add_query_params(self, from_node, to_nodes, sources=None):
+        """
+        Adds the relationships from a node to several nodes, as one row per relationship or,
+        when grouped, as a single row {'from', 'tos'}.
+
+        Args:
+            from_node: The URI of the node at the start of the relationships.
+            to_nodes: The URIs of the nodes at the end of the relationships.
+            sources: The triples the relationships were built from, by target URI, kept if the sources are tracked.
+        """
+        if self.grouped:
+            self.query_params.append({"from": from_node, "tos": list(to_nodes)})
+            if self.sources is not None:
+                self.sources.append([sources[to_node] for to_node in to_nodes if sources and to_node in sources])
+        else:
+            for to_node in to_nodes:
+                self.add_query_param(from_node, to_node, sources.get(to_node) if sources else None)
 
     def write_query(self):
         """
@@ -45,16 +103,68 @@ class RelationshipQueryComposer:
         Returns:
             str: The Neo4j query.
         """
-        q = ''' UNWIND $params as param 
-                 MERGE (from:Resource{ uri : param["from"] }) 
-                 MERGE (to:Resource{ uri : param["to"] })
+        endpoint = "MATCH" if self.match_endpoints else "MERGE"
+        q = f''' {self.query_params.unwind()} 
+                 {endpoint} {self.node_pattern("from")} 
+                 {self.unwind_targets()}{endpoint} {self.node_pattern("to")}
              '''
-        q += f''' MERGE (from)-[r:`{self.rel_type}`]->(to)'''
+        q += f''' {"CREATE" if self.create else "MERGE"} (from)-{self.rel_pattern()}->(to)'''
         if self.props:
             raise NotImplementedError
             # q += f'''SET {', '.join([f"""r.`{prop}` = coalesce(param["{prop}"],null)""" for prop in self.props])}'''
         return q
 
+    def node_pattern(self, end):
+        """
+        Returns the pattern identifying the node at one end ("from" or "to") of the relationship of the current row.
+        """
+        uri = "to_uri" if self.grouped and end == "to" else self.query_params.ref(end)
+        return resource_pattern(end, uri, self.context, self.handle_context_strategy)
+
+    def unwind_targets(self):
+        """
+        Returns the clause iterating over the targets of the current row when grouped, an empty string otherwise.
+        """
+        if not self.grouped:
+            return ""
+        return f"WITH * UNWIND {self.query_params.ref('tos')} AS to_uri "
+
+    def rel_pattern(self):
+        """
+        Returns the relationship pattern. Under HANDLE_CONTEXT_STRATEGY.LABEL, relationships of a named graph
+        are identified by their graphUri property.
+        """
+        if self.context is not None and self.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.LABEL:
+            return f"[r:`{self.rel_type}`{{ {GRAPH_URI_PROPERTY} : $graph }}]"
+        return f"[r:`{self.rel_type}`]"
+
+    def get_query_parameters(self, start=0, stop=None):
+        """
+        Returns the parameters to send along with the query.
+
+        Args:
+            start: The index of the first row to send. Default: 0
+            stop: The index after the last row to send, None for every row. Default: None
+
+        Returns:
+            dict: The rows to UNWIND and, for a named graph, its URI.
+        """
+        res = {"params": self.query_params.payload(start, stop)}
+        if self.context is not None:
+            res["graph"] = self.context
+        return res
+
+    def written_uris(self):
+        """
+        Yields the URIs of the nodes at both ends of the buffered relationships.
+        """
+        for row in self.query_params:
+            yield row["from"]
+            if self.grouped:
+                yield from row["tos"]
+            else:
+                yield row["to"]
+
     def is_redundant(self):
         """
         Checks if the RelationshipQueryComposer is redundant, i.e., if it has no query parameters.
@@ -68,8 +178,65 @@ class RelationshipQueryComposer:
         """
         Empties the query parameters list.
         """
-        del self.query_params
-        self.query_params = []
+        self.query_params = self.new_param_buffer()
+        if self.sources is not None:
+            self.sources = []
+
+    def schedule_supernodes(self, threshold) -> int:
+        """
+        Moves the relationships of the endpoints found at least `threshold` times in the buffer (supernodes, e.g.
+        classes, shared publishers or concept schemes) after the others, sorted by supernode, so that they are
+        written in a sub-batch of their own that takes the lock of every supernode in a consistent order.
+        When grouped, the rows are split so that each supernode relationship is a row of its own.
+
+        Args:
+            threshold: The number of relationships of an endpoint in the buffer from which it is a supernode.
+
+        Returns:
+            int: The index of the first row of the supernode sub-batch, the number of rows if there is none.
+        """
+        rows = list(self.query_params)
+        counts = Counter()
+        for row in rows:
+            for to_node in (row["tos"] if self.grouped else [row["to"]]):
+                counts[row["from"]] += 1
+                counts[to_node] += 1
+        hot = {uri for uri, count in counts.items() if count >= threshold}
+        if not hot:
+            return len(rows)
+        cold_rows, hot_rows = [], []
+        for index, row in enumerate(rows):
+            from_node, sources = row["from"], self.row_sources(index)
+            if not self.grouped:
+                if from_node in hot or row["to"] in hot:
+                    hot_rows.append((supernode_key(from_node, row["to"], hot), row, sources))
+                else:
+                    cold_rows.append((row, sources))
+                continue
+            cold_tos, cold_sources = [], []
+            for i, to_node in enumerate(row["tos"]):
+                # When tracked, the sources of a grouped row follow the order of its targets
+                source = sources[i:i + 1]
+                if from_node in hot or to_node in hot:
+                    hot_rows.append((supernode_key(from_node, to_node, hot), {"from": from_node, "tos": [to_node]}, source))
+                else:
+                    cold_tos.append(to_node)
+                    cold_sources.extend(source)
+            if cold_tos:
+                cold_rows.append(({"from": from_node, "tos": cold_tos}, cold_sources))
+        hot_rows.sort(key=lambda item: item[0])
+        self.empty_query_params()
+        for row, sources in cold_rows + [(row, sources) for _, row, sources in hot_rows]:
+            self.query_params.append(row)
+            if self.sources is not None:
+                self.sources.append(sources)
+        return len(cold_rows)
+
+    def row_sources(self, index):
+        """
+        Returns the source triples of a buffered row, an empty list if they are not tracked.
+        """
+        return self.sources[index] if self.sources is not None else []
 
     def __eq__(self, other):
         """
@@ -0,0 +1,207 @@
+from typing import Dict, List, Optional, Tuple
+
+from rdflib import Literal, RDF
+from rdflib.term import BNode
+
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import HANDLE_CONTEXT_STRATEGY, GRAPH_URI_PROPERTY, GRAPH_LABEL_PREFIX, \
+    INTERNAL_PROPERTIES, DEFAULT_GRAPH_URI
+from rdflib_neo4j.query_composers.ReadQueryComposer import ReadQueryComposer
+from rdflib_neo4j.utils import bnode_to_uri, literal_to_neo4j_value, escape_identifier, uri_to_node, \
+    neo4j_value_to_literal, graph_uri_to_context
+
+LABEL_SHAPE = "label"
+PROP_SHAPE = "prop"
+REL_SHAPE = "rel"
+
+
+class TripleQueryComposer(ReadQueryComposer):
+    """
+    Translates an rdflib triple pattern (s, p, o), where any position can be None, into the Cypher read queries
+    needed to match it against the graph written by the Neo4jStore.
+
+    A single pattern can be answered by up to three query shapes:
+        - label: rdf:type triples, stored as labels on the :Resource node.
+        - prop: triples with a literal object, stored as node properties.
+        - rel: triples with a resource object, stored as relationships between :Resource nodes.
+    """
+
+    def __init__(self, triple_pattern, config: Neo4jStoreConfig, context=None):
+        """
+        Initializes a TripleQueryComposer object.
+
+        Args:
+            triple_pattern: The (subject, predicate, object) pattern to match. None is a wildcard.
+            config: The configuration the data was written with.
+            context: The URI of the graph to read from (DEFAULT_GRAPH_URI for the default graph), None to read every graph.
+        """
+        super().__init__(config)
+        (self.subject, self.predicate, self.object) = triple_pattern
+        self.context = context
+
+    def subject_match(self, params: Dict, node_triples=True) -> str:
+        """
+        Returns the MATCH clause for the subject node, binding $s when the subject is known
+        and restricting the match to the graph being read.
+
+        Args:
+            params: The parameters of the query, completed with the ones of the clause.
+            node_triples: If the triples read are labels or properties of the node, which under
+                HANDLE_CONTEXT_STRATEGY.LABEL belong to the default graph only when the node has no graph label.
+        """
+        labels = ":Resource"
+        props = []
+        if self.subject is not None:
+            params["s"] = bnode_to_uri(self.subject) if isinstance(self.subject, BNode) else str(self.subject)
+            props.append("uri : $s")
+        if self.context is not None:
+            params["graph"] = self.context
+            if self.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+                props.append(f"{GRAPH_URI_PROPERTY} : $graph")
+            elif self.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.LABEL and self.context != DEFAULT_GRAPH_URI:
+                labels += f":`{escape_identifier(GRAPH_LABEL_PREFIX + self.context)}`"
+        q = f"MATCH (s{labels}{{ {', '.join(props)} }}) " if props else f"MATCH (s{labels}) "
+        if node_triples and self.context == DEFAULT_GRAPH_URI and \
+                self.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.LABEL:
+            q += f"WHERE NOT any(l IN labels(s) WHERE l STARTS WITH '{GRAPH_LABEL_PREFIX}') WITH s "
+        return q
+
+    def write_queries(self) -> List[Tuple[str, str, Dict]]:
+        """
+        Writes the Cypher queries needed to answer the triple pattern.
+
+        Returns:
+            list: (shape, query, params) tuples. An empty list means that the pattern cannot match anything.
+        """
+        if isinstance(self.subject, Literal):
+            return []
+        object_is_literal = isinstance(self.object, Literal)
+        object_is_resource = self.object is not None and not object_is_literal
+        res = []
+        if self.predicate is None or self.predicate == RDF.type:
+            if not object_is_literal:
+                res.append(self.write_label_query())
+        if self.predicate != RDF.type:
+            if not object_is_resource:
+                res.append(self.write_prop_query())
+            if not object_is_literal:
+                res.append(self.write_rel_query())
+        return [q for q in res if q is not None]
+
+    def write_label_query(self):
+        params = {}
+        q = self.subject_match(params)
+        if self.object is not None:
+            label = self.vocab_name(self.object)
+            if label is None:
+                return None
+            q += f"WHERE s:`{escape_identifier(label)}` RETURN s.uri AS s, [$label] AS labels{self.graphs_column(LABEL_SHAPE)}"
+            params["label"] = label
+        else:
+            q += f"WITH s, [l IN labels(s) WHERE l <> 'Resource' AND NOT l STARTS WITH '{GRAPH_LABEL_PREFIX}'] " \
+                 f"AS labels WHERE size(labels) > 0 RETURN s.uri AS s, labels{self.graphs_column(LABEL_SHAPE)}"
+        return LABEL_SHAPE, q, params
+
+    def write_prop_query(self):
+        params = {}
+        q = self.subject_match(params)
+        if self.predicate is None:
+            # Properties are filtered on the client side, the uri key is not a triple
+            q += f"RETURN s.uri AS s, properties(s) AS props{self.graphs_column(PROP_SHAPE)}"
+            return PROP_SHAPE, q, params
+        prop = self.vocab_name(self.predicate)
+        if prop is None:
+            return None
+        prop_ref = f"s.`{escape_identifier(prop)}`"
+        if self.object is None:
+            q += f"WHERE {prop_ref} IS NOT NULL "
+        elif self.is_multival(self.predicate):
+            q += f"WHERE $o IN {prop_ref} "
+            params["o"] = literal_to_neo4j_value(self.object)
+        else:
+            q += f"WHERE {prop_ref} = $o "
+            params["o"] = literal_to_neo4j_value(self.object)
+        q += f"RETURN s.uri AS s, {{`{escape_identifier(prop)}`: {prop_ref}}} AS props{self.graphs_column(PROP_SHAPE)}"
+        return PROP_SHAPE, q, params
+
+    def write_rel_query(self):
+        params = {}
+        q = self.subject_match(params, node_triples=False)
+        rel_type = ""
+        if self.predicate is not None:
+            name = self.vocab_name(self.predicate)
+            if name is None:
+                return None
+            rel_type = f":`{escape_identifier(name)}`"
+        # Under PROPERTY the object node belongs to the graph, under LABEL the relationship does
+        rel_props, object_props = "", []
+        if self.context is not None:
+            if self.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+                object_props.append(f"{GRAPH_URI_PROPERTY} : $graph")
+            elif self.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.LABEL:
+                rel_props = f"{{ {GRAPH_URI_PROPERTY} : $graph }}"
+        if self.object is not None:
+            params["o"] = bnode_to_uri(self.object) if isinstance(self.object, BNode) else str(self.object)
+            object_props.insert(0, "uri : $o")
+        object_map = f"{{ {', '.join(object_props)} }}" if object_props else ""
+        q += f"MATCH (s)-[r{rel_type}{rel_props}]->(o:Resource{object_map}) "
+        q += f"RETURN s.uri AS s, type(r) AS p, o.uri AS o{self.graphs_column(REL_SHAPE)}"
+        return REL_SHAPE, q, params
+
+    def graphs_column(self, shape) -> str:
+        """
+        Returns the column listing the stored graphs of the triples of a record when every graph is read,
+        an empty string when a single graph is read or under the IGNORE strategy.
+        """
+        if self.context is None:
+            if self.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+                return f", [s.`{GRAPH_URI_PROPERTY}`] AS graphs"
+            if self.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.LABEL:
+                # Under LABEL the relationships carry their graph, the nodes are shared by the graphs of their labels
+                if shape == REL_SHAPE:
+                    return f", [r.`{GRAPH_URI_PROPERTY}`] AS graphs"
+                return f", [l IN labels(s) WHERE l STARTS WITH '{GRAPH_LABEL_PREFIX}' " \
+                       f"| substring(l, {len(GRAPH_LABEL_PREFIX)})] AS graphs"
+        return ""
+
+    def read_graphs(self, record) -> List[Optional[str]]:
+        """
+        Returns the graphs the triples of a record belong to, as named graph URIs where None is the default graph.
+
+        Args:
+            record: The record returned by one of the queries.
+        """
+        if self.context is not None:
+            return [self.context]
+        graphs = [graph_uri_to_context(graph) for graph in record.get("graphs") or ()]
+        return graphs or [None]
+
+    def read_triples(self, shape, record):
+        """
+        Converts a record returned by one of the queries into the triples it represents.
+        Bound positions of the pattern are returned as they were given.
+
+        Args:
+            shape: The shape of the query that returned the record.
+            record: The record to convert.
+        """
+        subject = uri_to_node(record["s"])
+        if shape == LABEL_SHAPE:
+            for label in record["labels"]:
+                yield subject, RDF.type, self.object if self.object is not None else self.reverse_name(label)
+        elif shape == PROP_SHAPE:
+            expected = literal_to_neo4j_value(self.object) if self.object is not None else None
+            for key, values in record["props"].items():
+                if key in INTERNAL_PROPERTIES:
+                    continue
+                prop = self.predicate if self.predicate is not None else self.reverse_name(key)
+                for value in (values if isinstance(values, list) else [values]):
+                    literal = neo4j_value_to_literal(value)
+                    if self.object is None:
+                        yield subject, prop, literal
+                    elif literal_to_neo4j_value(literal) == expected:
+                        yield subject, prop, self.object
+        else:
+            yield (subject,
+                   self.predicate if self.predicate is not None else self.reverse_name(record["p"]),
+                   self.object if self.object is not None else uri_to_node(record["o"]))
@@ -0,0 +1,118 @@
+import itertools
+
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.plugins.sparql.evaluate import _ebv
+from rdflib.plugins.sparql.sparql import FrozenBindings
+
+from rdflib_neo4j.Neo4jStore import Neo4jStore
+from rdflib_neo4j.config.const import HANDLE_CONTEXT_STRATEGY
+from rdflib_neo4j.query_composers.BGPQueryComposer import BGPQueryComposer, EmptyPattern
+from rdflib_neo4j.utils import context_to_graph_uri
+
+GRAPH_VOCABULARY_QUERY = """
+    CALL db.relationshipTypes() YIELD relationshipType
+    WITH collect(relationshipType) AS rel_types
+    CALL db.propertyKeys() YIELD propertyKey
+    RETURN rel_types, collect(propertyKey) AS prop_keys
+    """
+
+
+def get_pushdown_store(ctx) -> Neo4jStore:
+    """
+    Returns the Neo4jStore behind the graph being queried, raising NotImplementedError when the query
+    is not running on an open Neo4jStore with SPARQL push-down enabled.
+    """
+    store = getattr(ctx.graph, "store", None)
+    if not isinstance(store, Neo4jStore) or not store.config.sparql_pushdown or not store.is_open():
+        raise NotImplementedError()
+    # Under PROPERTY every graph has its own node for a URI, while a BGP joins its variables on nodes: the union
+    # of the graphs is answered through triples(), which joins on the URIs
+    if store.config.handle_context_strategy == HANDLE_CONTEXT_STRATEGY.PROPERTY:
+        raise NotImplementedError()
+    # Queries scoped to a graph are answered through triples(), which knows how to filter by context
+    if store.config.handle_context_strategy != HANDLE_CONTEXT_STRATEGY.IGNORE and \
+            (context_to_graph_uri(ctx.graph) or getattr(ctx.graph, "identifier", None) == DATASET_DEFAULT_GRAPH_ID):
+        raise NotImplementedError()
+    return store
+
+
+def eval_bgp(ctx, store: Neo4jStore, triples, filters=(), offset=0, limit=None, strict=False):
+    """
+    Compiles a BGP into a single Cypher query and returns a generator of the solutions.
+
+    Compilation happens eagerly, so that NotImplementedError reaches rdflib's evalPart and the default
+    evaluation is used instead. The pending buffered data is committed first, so that the vocabulary the pattern is
+    compiled against, and the query, see everything added so far.
+
+    Args:
+        ctx: The SPARQL query context.
+        store: The store to run the query on.
+        triples: The triple patterns of the BGP.
+        filters: The filter conjuncts to push down.
+        offset: The number of solutions to skip.
+        limit: The maximum number of solutions to return.
+        strict: If True, raise NotImplementedError unless every filter can be pushed down.
+    """
+    def graph_vocabulary():
+        record = next(iter(store.stream_query(query=GRAPH_VOCABULARY_QUERY, params={})))
+        return set(record["rel_types"]), set(record["prop_keys"])
+
+    store.commit()
+    bindings = {var: ctx[var] for var in {term for triple in triples for term in triple}}
+    composer = BGPQueryComposer(triples=triples, config=store.config, bindings=bindings,
+                                graph_vocabulary=graph_vocabulary)
+    try:
+        query = composer.write_query(filters=filters, offset=offset, limit=limit)
+    except EmptyPattern:
+        return iter(())
+    if strict and composer.residual_filters:
+        raise NotImplementedError()
+    res = stream_bindings(ctx, store, composer, query)
+    return itertools.islice(res, composer.residual_offset, None) if composer.residual_offset else res
+
+
+def stream_bindings(ctx, store: Neo4jStore, composer: BGPQueryComposer, query):
+    """
+    Runs a compiled BGP query and yields the solutions, merged with the bindings of the context.
+    """
+    solution = dict(ctx.solution())
+    for record in store.stream_query(query=query, params=composer.params):
+        for bindings in composer.read_bindings(record):
+            yield FrozenBindings(ctx, {**solution, **bindings})
+
+
+def neo4j_custom_eval(ctx, part):
+    """
+    Custom evaluation function for rdflib.plugins.sparql (registered in CUSTOM_EVALS by the package).
+
+    It pushes down to Neo4j:
+        - BGPs, as one Cypher MATCH instead of one triples() call per binding.
+        - FILTERs over a BGP, translating the comparisons it can and evaluating the rest in Python.
+        - LIMIT/OFFSET over the projection of a BGP whose filters were fully translated.
+
+    Anything else raises NotImplementedError, and rdflib falls back to its default evaluation.
+    """
+    store = get_pushdown_store(ctx)
+
+    if part.name == "BGP":
+        return eval_bgp(ctx, store, part.triples)
+
+    if part.name == "Filter" and part.p.name == "BGP":
+        conjuncts = BGPQueryComposer.conjuncts(part.expr)
+        res = eval_bgp(ctx, store, part.p.triples, filters=conjuncts)
+        # Whatever couldn't be translated is checked in Python, with the same semantics as rdflib's evalFilter
+        return (c for c in res
+                if _ebv(part.expr, c.forget(ctx, _except=part._vars) if not part.no_isolated_scope else c))
+
+    if part.name == "Slice" and part.p.name == "Project":
+        inner = part.p.p
+        if inner.name == "BGP":
+            triples, filters = inner.triples, []
+        elif inner.name == "Filter" and inner.p.name == "BGP":
+            triples, filters = inner.p.triples, BGPQueryComposer.conjuncts(inner.expr)
+        else:
+            raise NotImplementedError()
+        res = eval_bgp(ctx, store, triples, filters=filters, offset=part.start, limit=part.length, strict=True)
+        return itertools.islice((row.project(part.p.PV) for row in res), part.length)
+
+    raise NotImplementedError()
@@ -1,14 +1,166 @@
+from datetime import timedelta
+from decimal import Decimal
 from functools import wraps
 from time import time
-from typing import Dict
-from rdflib import URIRef
-from rdflib.term import BNode
-from rdflib_neo4j.config.const import ShortenStrictException, HANDLE_VOCAB_URI_STRATEGY, NEO4J_DRIVER_DICT_MESSAGE
+from typing import Any, Callable, Dict, Optional
+from neo4j.time import Duration
+from rdflib import RDF, XSD, URIRef, Literal
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.term import BNode, Node
+from rdflib_neo4j.config.const import ShortenStrictException, HANDLE_VOCAB_URI_STRATEGY, NEO4J_DRIVER_DICT_MESSAGE, \
+    DEFAULT_GRAPH_URI
+
+
+BNODE_URI_PREFIX = "bnode://"
 
 
 def bnode_to_uri(bnode: BNode) -> str:
     """Convert a BNode to a bnode:// URI matching n10s behaviour."""
-    return f"bnode://{bnode}"
+    return f"{BNODE_URI_PREFIX}{bnode}"
+
+
+def uri_to_node(uri: str) -> Node:
+    """Convert a stored `uri` property back to an rdflib node, reversing bnode_to_uri."""
+    if uri.startswith(BNODE_URI_PREFIX):
+        return BNode(uri[len(BNODE_URI_PREFIX):])
+    return URIRef(uri)
+
+
+def context_to_graph_uri(context) -> Optional[str]:
+    """
+    Returns the URI of the named graph a triple is added to, or None for the default graph.
+
+    Parameters:
+    - context: The context passed by rdflib (a Graph) or None.
+
+    Returns:
+    The graph URI. Graphs identified by a BNode (e.g. a plain Graph) or by the Dataset default graph id have no URI.
+    """
+    identifier = getattr(context, "identifier", None)
+    if not isinstance(identifier, URIRef) or identifier == DATASET_DEFAULT_GRAPH_ID:
+        return None
+    return str(identifier)
+
+
+def graph_uri_to_context(graph_uri: Optional[str]) -> Optional[str]:
+    """
+    Returns the URI of the named graph a stored graphUri (or graph label) stands for, reversing context_to_graph_uri.
+
+    Parameters:
+    - graph_uri: The stored graph URI, None or empty when there is none.
+
+    Returns:
+    The named graph URI, or None for the default graph.
+    """
+    return graph_uri if graph_uri and graph_uri != DEFAULT_GRAPH_URI else None
+
+
+def literal_value(literal: Literal):
+    """
+    Converts a Literal to the python value rdflib parsed it to when it was created (int, float, bool, datetime...),
+    which the driver sends as the matching Neo4j type. Malformed lexical forms and unknown datatypes, which rdflib
+    doesn't parse, are kept as strings.
+
+    Parameters:
+    - literal: The Literal to be converted.
+
+    Returns:
+    The python value of the literal. Decimals are converted to float since the driver does not support them.
+    """
+    value = literal.value
+    if value is None:
+        return str(literal)
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def decimal_literal_value(literal: Literal):
+    """
+    Converts an xsd:decimal Literal to a float, since the driver does not support Decimal.
+    """
+    value = literal.value
+    return str(literal) if value is None else float(value)
+
+
+def duration_literal_value(literal: Literal):
+    """
+    Converts an xsd:duration Literal to a Neo4j Duration. rdflib parses the durations with years or months to its
+    own Duration type, which the driver can't send, and the others to a timedelta, which it can.
+    """
+    value = literal.value
+    if value is None:
+        return str(literal)
+    if isinstance(value, timedelta):
+        return value
+    tdelta = value.tdelta
+    return Duration(years=value.years, months=value.months, days=tdelta.days, seconds=tdelta.seconds,
+                    microseconds=tdelta.microseconds)
+
+
+# The converters of the Literals by datatype, the others go through literal_value.
+# Plain and language tagged strings (no datatype) are the most common literals, and only need their lexical form.
+LITERAL_CONVERTERS: Dict[Optional[URIRef], Callable[[Literal], Any]] = {
+    None: str,
+    XSD.string: str,
+    XSD.decimal: decimal_literal_value,
+    XSD.duration: duration_literal_value,
+    XSD.dayTimeDuration: duration_literal_value,
+    XSD.yearMonthDuration: duration_literal_value,
+    # Parsed by rdflib to DOM documents, which the driver can't send
+    RDF.XMLLiteral: str,
+    RDF.HTML: str,
+}
+
+
+def register_literal_converter(datatype: URIRef, converter: Callable[[Literal], Any]):
+    """
+    Registers the function converting the Literals of a datatype to the values sent to Neo4j.
+
+    Parameters:
+    - datatype: The URI of the datatype.
+    - converter: A function taking the Literal and returning a value the driver can send. It should fall back to
+      the lexical form (str(literal)) when the literal is malformed.
+    """
+    LITERAL_CONVERTERS[URIRef(datatype)] = converter
+
+
+def literal_to_neo4j_value(literal: Literal):
+    """
+    Converts an rdflib Literal to a value that can be sent as a Neo4j driver parameter,
+    with the converter registered for its datatype.
+
+    Parameters:
+    - literal: The Literal to be converted.
+
+    Returns:
+    The converted value.
+    """
+    return LITERAL_CONVERTERS.get(literal.datatype, literal_value)(literal)
+
+
+def neo4j_value_to_literal(value) -> Literal:
+    """
+    Converts a single (non-list) property value read from Neo4j back to an rdflib Literal.
+
+    Parameters:
+    - value: The value returned by the Neo4j driver.
+
+    Returns:
+    The Literal, with the datatype inferred from the python type. Neo4j temporal types are converted to their
+    native python equivalent first.
+    """
+    if isinstance(value, Duration):
+        # Durations have no native python equivalent with years and months
+        return Literal(value.iso_format(), datatype=XSD.duration)
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    return Literal(value)
+
+
+def escape_identifier(name: str) -> str:
+    """
+    Escapes a label, relationship type or property name to be used between backticks in a Cypher query.
+    """
+    return str(name).replace("`", "``")
 
 
 def timing(f):
@@ -171,6 +323,39 @@ def handle_vocab_uri(mappings: Dict[str, str],
     raise Exception(f"Strategy {strategy} not defined.")
 
 
+def reverse_vocab_uri(name: str,
+                      reversed_mappings: Dict[str, URIRef],
+                      prefixes: Dict[str, str],
+                      strategy: HANDLE_VOCAB_URI_STRATEGY) -> URIRef:
+    """
+    Reverses handle_vocab_uri, turning a label, property name or relationship type back into a URI.
+
+    Parameters:
+
+    - name: The label, property name or relationship type found in the graph.
+
+    - reversed_mappings: A dictionary mapping the mapped values back to the original URIs.
+
+    - prefixes: A dictionary containing prefix -> namespace.
+
+    - strategy: The strategy used when the data was written.
+
+    Returns:
+    The reconstructed URI. Under IGNORE (and MAP for unmapped names) the namespace is lost,
+    so the bare name is returned as the URI.
+    """
+    if strategy == HANDLE_VOCAB_URI_STRATEGY.SHORTEN:
+        prefix, sep, local_part = name.partition("__")
+        if sep and prefix in prefixes:
+            return URIRef(f"{prefixes[prefix]}{local_part}")
+        return URIRef(name)
+    elif strategy == HANDLE_VOCAB_URI_STRATEGY.MAP:
+        return reversed_mappings.get(name, URIRef(name))
+    elif strategy in (HANDLE_VOCAB_URI_STRATEGY.KEEP, HANDLE_VOCAB_URI_STRATEGY.IGNORE):
+        return URIRef(name)
+    raise Exception(f"Strategy {strategy} not defined.")
+
+
 def handle_neo4j_driver_exception(ex: Exception):
     """
     Handle exceptions raised by the Neo4j driver by providing custom error messages.
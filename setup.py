@@ -35,6 +35,9 @@ if __name__ == "__main__":
         install_requires=[
             'rdflib >= 7.1.1', 'neo4j >= 5.0.0',
         ],
+        extras_require={
+            'zstd': ['zstandard'],
+        },
         packages=["rdflib_neo4j", "rdflib_neo4j.config", "rdflib_neo4j.query_composers"],
         entry_points={
             'rdf.plugins.store': [
@@ -0,0 +1,63 @@
+from rdflib import Graph
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY, bulk_load
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_bulk_load(neo4j_driver, neo4j_connection_parameters, tmp_path, processes):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              batching=True)
+    paths = []
+    for part in range(10):
+        path = tmp_path / f"part{part}.ttl"
+        path.write_text("@prefix foaf: <http://xmlns.com/foaf/0.1/> .\n" + "".join(
+            f'<https://example.org/part{part}/person{i}> a foaf:Person ; foaf:name "{part}-{i}" .\n' for i in range(20)))
+        paths.append(path)
+    broken = tmp_path / "broken.ttl"
+    broken.write_text("<https://example.org/broken> <http://xmlns.com/foaf/0.1/name> .\n")
+
+    graph = Graph(store=Neo4jStore(config=config))
+    report = bulk_load(graph, paths + [broken], workers=4, processes=processes)
+    graph.close(True)
+
+    assert all(report[str(path)] == 40 for path in paths)
+    assert isinstance(report[str(broken)], Exception)
+    records, _, _ = neo4j_driver.execute_query("MATCH (n:Person) RETURN count(n) AS count")
+    assert records[0]["count"] == 200
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_bulk_load_reports_write_errors_per_file(neo4j_driver, neo4j_connection_parameters, tmp_path, processes):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                              batching=True,
+                              batch_size=1000)
+    paths = []
+    for part in range(4):
+        path = tmp_path / f"part{part}.ttl"
+        path.write_text("@prefix foaf: <http://xmlns.com/foaf/0.1/> .\n" + "".join(
+            f'<https://example.org/part{part}/person{i}> a foaf:Person ; foaf:name "{part}-{i}" .\n' for i in range(20)))
+        paths.append(path)
+    # Parses, but Neo4j can't store an array mixing strings and integers
+    mixed = tmp_path / "mixed.ttl"
+    mixed.write_text("@prefix foaf: <http://xmlns.com/foaf/0.1/> .\n"
+                     "<https://example.org/mixed> a foaf:Person ; foaf:name \"mixed\", 1 .\n")
+
+    graph = Graph(store=Neo4jStore(config=config))
+    report = bulk_load(graph, paths + [mixed], workers=2, processes=processes)
+    graph.close(True)
+
+    assert all(report[str(path)] == 40 for path in paths)
+    assert isinstance(report[str(mixed)], Exception)
+    records, _, _ = neo4j_driver.execute_query("MATCH (n:Person) RETURN count(n) AS count")
+    assert records[0]["count"] == 80
@@ -0,0 +1,161 @@
+from rdflib import Dataset, Literal, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.namespace import FOAF
+from test.integration.constants import RDFLIB_DB, N10S_CONSTRAINT_QUERY
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY, HANDLE_CONTEXT_STRATEGY
+from rdflib_neo4j.config.const import DEFAULT_GRAPH_URI
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+DONNA = URIRef("https://example.org/donna")
+EDWARD = URIRef("https://example.org/edward")
+G1 = URIRef("https://example.org/graphs/g1")
+G2 = URIRef("https://example.org/graphs/g2")
+
+NQUADS = f"""
+<{DONNA}> <{FOAF.name}> "Donna Fales" <{G1}> .
+<{DONNA}> <{FOAF.knows}> <{EDWARD}> <{G1}> .
+<{DONNA}> <{FOAF.nick}> "donna" <{G2}> .
+<{EDWARD}> <{FOAF.name}> "Edward" .
+"""
+
+
+def context_dataset(auth_data, strategy):
+    config = Neo4jStoreConfig(auth_data=auth_data,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              handle_context_strategy=strategy,
+                              batching=True)
+    return Dataset(store=Neo4jStore(config=config))
+
+
+def test_label_strategy_labels_nodes_by_graph(neo4j_driver, neo4j_connection_parameters):
+    dataset = context_dataset(neo4j_connection_parameters, HANDLE_CONTEXT_STRATEGY.LABEL)
+    dataset.parse(data=NQUADS, format="nquads")
+    dataset.commit()
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Resource{uri: $uri}) RETURN labels(n) AS labels, properties(n) AS props",
+        uri=str(DONNA), database_=RDFLIB_DB)
+    assert len(records) == 1
+    assert set(records[0]["labels"]) == {"Resource", f"graph:{G1}", f"graph:{G2}"}
+    assert records[0]["props"] == {"uri": str(DONNA), "name": "Donna Fales", "nick": "donna"}
+    rels, _, _ = neo4j_driver.execute_query("MATCH ()-[r:knows]->() RETURN r.graphUri AS graph", database_=RDFLIB_DB)
+    assert [r["graph"] for r in rels] == [str(G1)]
+    assert {g.identifier for g in dataset.store.contexts()} == {G1, G2}
+    dataset.close(True)
+
+
+def test_property_strategy_reads_back_by_graph(neo4j_driver, neo4j_connection_parameters):
+    # A resource has one node per graph, the store creates the (uri, graphUri) constraint instead
+    neo4j_driver.execute_query("DROP CONSTRAINT n10s_unique_uri IF EXISTS", database_=RDFLIB_DB)
+    dataset = context_dataset(neo4j_connection_parameters, HANDLE_CONTEXT_STRATEGY.PROPERTY)
+    dataset.parse(data=NQUADS, format="nquads")
+    dataset.commit()
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Resource{uri: $uri}) RETURN n.graphUri AS graph ORDER BY graph", uri=str(DONNA),
+        database_=RDFLIB_DB)
+    assert [r["graph"] for r in records] == [str(G1), str(G2)]
+    g1 = dataset.graph(G1)
+    assert set(g1.predicate_objects(DONNA)) == {(URIRef("name"), Literal("Donna Fales")),
+                                                (URIRef("knows"), EDWARD)}
+    dataset.close(True)
+    neo4j_driver.execute_query("MATCH (n) DETACH DELETE n", database_=RDFLIB_DB)
+    neo4j_driver.execute_query("DROP CONSTRAINT n10s_unique_uri_graph IF EXISTS", database_=RDFLIB_DB)
+    neo4j_driver.execute_query(N10S_CONSTRAINT_QUERY, database_=RDFLIB_DB)
+
+
+# Default graph triples about resources already written to a named graph
+NQUADS_DEFAULT_AFTER_NAMED = f"""
+<{DONNA}> <{FOAF.name}> "Donna Fales" <{G1}> .
+<{DONNA}> <{FOAF.knows}> <{EDWARD}> <{G1}> .
+<{DONNA}> <{FOAF.nick}> "donna" .
+<{DONNA}> <{FOAF.knows}> <{EDWARD}> .
+"""
+
+
+def test_property_strategy_keeps_default_graph_apart(neo4j_driver, neo4j_connection_parameters):
+    neo4j_driver.execute_query("DROP CONSTRAINT n10s_unique_uri IF EXISTS", database_=RDFLIB_DB)
+    dataset = context_dataset(neo4j_connection_parameters, HANDLE_CONTEXT_STRATEGY.PROPERTY)
+    dataset.parse(data=NQUADS_DEFAULT_AFTER_NAMED, format="nquads")
+    dataset.commit()
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Resource{uri: $uri}) RETURN n.graphUri AS graph, properties(n) AS props ORDER BY graph",
+        uri=str(DONNA), database_=RDFLIB_DB)
+    assert [(r["graph"], r["props"]) for r in records] == [
+        (str(G1), {"uri": str(DONNA), "graphUri": str(G1), "name": "Donna Fales"}),
+        (DEFAULT_GRAPH_URI, {"uri": str(DONNA), "graphUri": DEFAULT_GRAPH_URI, "nick": "donna"})]
+    rels, _, _ = neo4j_driver.execute_query(
+        "MATCH (a)-[:knows]->(b) RETURN a.graphUri AS a, b.graphUri AS b ORDER BY a", database_=RDFLIB_DB)
+    assert [(r["a"], r["b"]) for r in rels] == [(str(G1), str(G1)), (DEFAULT_GRAPH_URI, DEFAULT_GRAPH_URI)]
+    assert {g.identifier for g in dataset.store.contexts()} == {G1}
+    dataset.close(True)
+    neo4j_driver.execute_query("MATCH (n) DETACH DELETE n", database_=RDFLIB_DB)
+    neo4j_driver.execute_query("DROP CONSTRAINT n10s_unique_uri_graph IF EXISTS", database_=RDFLIB_DB)
+    neo4j_driver.execute_query(N10S_CONSTRAINT_QUERY, database_=RDFLIB_DB)
+
+
+def test_property_strategy_sparql_joins_across_graphs(neo4j_driver, neo4j_connection_parameters):
+    neo4j_driver.execute_query("DROP CONSTRAINT n10s_unique_uri IF EXISTS", database_=RDFLIB_DB)
+    dataset = context_dataset(neo4j_connection_parameters, HANDLE_CONTEXT_STRATEGY.PROPERTY)
+    dataset.parse(data=NQUADS, format="nquads")
+    dataset.commit()
+    # The nick of DONNA is in G2 and her relationship in G1, each graph has its own node for her
+    union = Dataset(store=dataset.store, default_union=True)
+    res = union.query(f"""
+        SELECT ?nick ?friend WHERE {{ ?p <{FOAF.nick}> ?nick ; <{FOAF.knows}> ?friend }}""")
+    assert [(str(r.nick), r.friend) for r in res] == [("donna", EDWARD)]
+    dataset.close(True)
+    neo4j_driver.execute_query("MATCH (n) DETACH DELETE n", database_=RDFLIB_DB)
+    neo4j_driver.execute_query("DROP CONSTRAINT n10s_unique_uri_graph IF EXISTS", database_=RDFLIB_DB)
+    neo4j_driver.execute_query(N10S_CONSTRAINT_QUERY, database_=RDFLIB_DB)
+
+
+def test_label_strategy_keeps_default_graph_relationships_apart(neo4j_driver, neo4j_connection_parameters):
+    dataset = context_dataset(neo4j_connection_parameters, HANDLE_CONTEXT_STRATEGY.LABEL)
+    dataset.parse(data=NQUADS_DEFAULT_AFTER_NAMED, format="nquads")
+    dataset.commit()
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Resource{uri: $uri}) RETURN labels(n) AS labels", uri=str(DONNA), database_=RDFLIB_DB)
+    assert len(records) == 1
+    assert set(records[0]["labels"]) == {"Resource", f"graph:{G1}"}
+    rels, _, _ = neo4j_driver.execute_query(
+        "MATCH ()-[r:knows]->() RETURN r.graphUri AS graph ORDER BY graph", database_=RDFLIB_DB)
+    assert [r["graph"] for r in rels] == [str(G1), DEFAULT_GRAPH_URI]
+    dataset.close(True)
+
+
+def test_property_strategy_quads_and_len_by_graph(neo4j_driver, neo4j_connection_parameters):
+    neo4j_driver.execute_query("DROP CONSTRAINT n10s_unique_uri IF EXISTS", database_=RDFLIB_DB)
+    dataset = context_dataset(neo4j_connection_parameters, HANDLE_CONTEXT_STRATEGY.PROPERTY)
+    dataset.parse(data=NQUADS, format="nquads")
+    dataset.commit()
+    quads = {(s, p, o, g or DATASET_DEFAULT_GRAPH_ID) for s, p, o, g in dataset.quads((None, None, None, None))}
+    assert quads == {(DONNA, URIRef("name"), Literal("Donna Fales"), G1),
+                     (DONNA, URIRef("knows"), EDWARD, G1),
+                     (DONNA, URIRef("nick"), Literal("donna"), G2),
+                     (EDWARD, URIRef("name"), Literal("Edward"), DATASET_DEFAULT_GRAPH_ID)}
+    assert len(dataset.graph(G1)) == 2
+    assert len(dataset.graph(G2)) == 1
+    # The default graph of the Dataset only holds the triples added without context
+    assert set(dataset.triples((None, None, None))) == {(EDWARD, URIRef("name"), Literal("Edward"))}
+    assert len(dataset.serialize(format="nquads").strip().splitlines()) == 4
+    dataset.close(True)
+    neo4j_driver.execute_query("MATCH (n) DETACH DELETE n", database_=RDFLIB_DB)
+    neo4j_driver.execute_query("DROP CONSTRAINT n10s_unique_uri_graph IF EXISTS", database_=RDFLIB_DB)
+    neo4j_driver.execute_query(N10S_CONSTRAINT_QUERY, database_=RDFLIB_DB)
+
+
+def test_label_strategy_quads_use_graph_labels(neo4j_driver, neo4j_connection_parameters):
+    dataset = context_dataset(neo4j_connection_parameters, HANDLE_CONTEXT_STRATEGY.LABEL)
+    dataset.parse(data=NQUADS, format="nquads")
+    dataset.commit()
+    quads = {(s, p, o, g or DATASET_DEFAULT_GRAPH_ID) for s, p, o, g in dataset.quads((None, None, None, None))}
+    # The node of Donna is shared by g1 and g2, so its properties are in both
+    assert (DONNA, URIRef("knows"), EDWARD, G1) in quads
+    assert (DONNA, URIRef("nick"), Literal("donna"), G1) in quads
+    assert (EDWARD, URIRef("name"), Literal("Edward"), DATASET_DEFAULT_GRAPH_ID) in quads
+    assert len(dataset.graph(G2)) == 2
+    dataset.close(True)
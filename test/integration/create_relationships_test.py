@@ -0,0 +1,37 @@
+from rdflib import Graph, RDF, URIRef
+from rdflib.namespace import FOAF
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+HUB = URIRef("https://example.org/hub")
+
+
+def knows_count(neo4j_driver):
+    records, _, _ = neo4j_driver.execute_query("MATCH ()-[r:knows]->() RETURN count(r) AS count")
+    return records[0]["count"]
+
+
+@pytest.mark.parametrize("batching", [False, True])
+def test_create_relationships_then_dedup(neo4j_driver, neo4j_connection_parameters, batching):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              batching=batching,
+                              create_relationships=True)
+    graph = Graph(store=Neo4jStore(config=config))
+    for i in range(20):
+        person = URIRef(f"https://example.org/person{i}")
+        graph.add((person, RDF.type, FOAF.Person))
+        graph.add((person, FOAF.knows, HUB))
+    # The same relationship in a second, non-contiguous group of triples is created again
+    graph.add((URIRef("https://example.org/person0"), FOAF.knows, HUB))
+    graph.commit()
+    assert knows_count(neo4j_driver) == 21
+
+    assert graph.store.dedup_relationships(batch_size=3) == 1
+    assert knows_count(neo4j_driver) == 20
+    graph.close(True)
@@ -0,0 +1,68 @@
+import json
+
+from rdflib import Graph, Literal, RDF, URIRef
+from neo4j.exceptions import ClientError
+from rdflib.namespace import FOAF
+from test.integration.constants import GET_DATA_QUERY, RDFLIB_DB
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY, \
+    HANDLE_MULTIVAL_APPEND_STRATEGY
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+PEOPLE = [URIRef(f"https://example.org/person{i}") for i in range(8)]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_failing_rows_go_to_the_dead_letter_file(neo4j_driver, neo4j_connection_parameters, tmp_path, columnar):
+    dead_letter_file = tmp_path / "dead_letter.jsonl"
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                              batching=True,
+                              columnar_params=columnar,
+                              dead_letter_file=str(dead_letter_file))
+    graph = Graph(store=Neo4jStore(config=config))
+    for i, person in enumerate(PEOPLE):
+        graph.add((person, RDF.type, FOAF.Person))
+        graph.add((person, FOAF.age, Literal(i)))
+        if i == 5:
+            # Neo4j arrays can't mix types
+            graph.add((person, FOAF.age, Literal("five")))
+    graph.close(True)
+
+    records, _, _ = neo4j_driver.execute_query(GET_DATA_QUERY, database_=RDFLIB_DB)
+    assert sorted(r["uri"] for r in records) == sorted(str(p) for i, p in enumerate(PEOPLE) if i != 5)
+    dead_letters = [json.loads(line) for line in dead_letter_file.read_text().splitlines()]
+    assert len(dead_letters) == 1
+    assert dead_letters[0]["row"]["uri"] == str(PEOPLE[5])
+    assert f'<{PEOPLE[5]}> <{FOAF.age}> "five" .' in dead_letters[0]["triples"]
+    assert len(dead_letters[0]["triples"]) == 3
+
+
+def test_query_errors_are_raised_without_isolating_rows(neo4j_driver, neo4j_connection_parameters, tmp_path):
+    dead_letter_file = tmp_path / "dead_letter.jsonl"
+    # APOC is not installed, so every batch fails the same way, whatever its rows
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                              handle_multival_append_strategy=HANDLE_MULTIVAL_APPEND_STRATEGY.APOC_UNION,
+                              batching=True,
+                              dead_letter_file=str(dead_letter_file))
+    graph = Graph(store=Neo4jStore(config=config))
+    for i, person in enumerate(PEOPLE):
+        graph.add((person, RDF.type, FOAF.Person))
+        graph.add((person, FOAF.age, Literal(i)))
+    with pytest.raises(ClientError):
+        graph.commit()
+    graph.close(False)
+
+    assert not dead_letter_file.exists()
+    records, _, _ = neo4j_driver.execute_query(GET_DATA_QUERY, database_=RDFLIB_DB)
+    assert not records
@@ -0,0 +1,33 @@
+import io
+
+from rdflib import Graph, Literal, RDF, URIRef
+from rdflib.namespace import FOAF
+from rdflib.compare import isomorphic
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY, export_rdf
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 10000])
+def test_export_round_trip(neo4j_driver, neo4j_connection_parameters, page_size):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={"foaf": str(FOAF)},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.SHORTEN,
+                              batching=True)
+    source = Graph()
+    for i in range(5):
+        person = URIRef(f"https://example.org/person{i}")
+        source.add((person, RDF.type, FOAF.Person))
+        source.add((person, FOAF.name, Literal(f"Person\n{i}")))
+        source.add((person, FOAF.knows, URIRef(f"https://example.org/person{(i + 1) % 5}")))
+    graph = Graph(store=Neo4jStore(config=config))
+    for triple in source:
+        graph.add(triple)
+
+    out = io.StringIO()
+    assert export_rdf(graph, out, format="nt", page_size=page_size) == len(source)
+    graph.close(True)
+    assert isomorphic(Graph().parse(data=out.getvalue(), format="nt"), source)
@@ -0,0 +1,46 @@
+from rdflib import Graph, Literal, RDF, URIRef
+from rdflib.namespace import FOAF
+from test.integration.constants import GET_DATA_QUERY, GET_RELS_QUERY, RDFLIB_DB
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY
+from rdflib_neo4j.config.const import DatabaseNotEmptyException
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+DONNA = URIRef("https://example.org/donna")
+EDWARD = URIRef("https://example.org/edward")
+
+
+def initial_load_store(auth_data, batch_size=5000, uri_limit=10000000):
+    config = Neo4jStoreConfig(auth_data=auth_data,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              batch_size=batch_size,
+                              initial_load=True,
+                              initial_load_uri_limit=uri_limit)
+    return Graph(store=Neo4jStore(config=config))
+
+
+@pytest.mark.parametrize("batch_size, uri_limit", [(1, 10000000), (5000, 10000000), (5000, 1), (1, 1)])
+def test_initial_load_creates_each_node_once(neo4j_driver, neo4j_connection_parameters, batch_size, uri_limit):
+    # Past uri_limit tracked nodes, the rest of the load is merged
+    graph = initial_load_store(neo4j_connection_parameters, batch_size, uri_limit)
+    graph.add((DONNA, RDF.type, FOAF.Person))
+    graph.add((DONNA, FOAF.knows, EDWARD))
+    graph.add((EDWARD, FOAF.name, Literal("Edward")))
+    graph.add((DONNA, FOAF.name, Literal("Donna Fales")))
+    graph.close(True)
+    records, _, _ = neo4j_driver.execute_query(GET_DATA_QUERY, database_=RDFLIB_DB)
+    assert [(r["uri"], r["props"]) for r in records] == [
+        (str(DONNA), {"uri": str(DONNA), "name": "Donna Fales"}),
+        (str(EDWARD), {"uri": str(EDWARD), "name": "Edward"})]
+    rels, _, _ = neo4j_driver.execute_query(GET_RELS_QUERY, database_=RDFLIB_DB)
+    assert len(rels) == 1
+
+
+def test_initial_load_requires_an_empty_database(neo4j_driver, neo4j_connection_parameters):
+    neo4j_driver.execute_query("CREATE (:Resource{uri: 'https://example.org/existing'})", database_=RDFLIB_DB)
+    with pytest.raises(DatabaseNotEmptyException):
+        initial_load_store(neo4j_connection_parameters)
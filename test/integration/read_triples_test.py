@@ -0,0 +1,41 @@
+from rdflib import Literal, RDF, URIRef
+from rdflib.namespace import FOAF
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+
+def add_donna(graph_store, commit=True):
+    donna = URIRef("https://example.org/donna")
+    graph_store.add((donna, RDF.type, FOAF.Person))
+    graph_store.add((donna, FOAF.name, Literal("Donna Fales")))
+    graph_store.add((donna, FOAF.age, Literal(30)))
+    graph_store.add((donna, FOAF.knows, URIRef("https://example.org/edward")))
+    if commit:
+        graph_store.commit()
+    return donna
+
+
+def test_read_all_triples(graph_store):
+    add_donna(graph_store)
+    assert len(graph_store) == 4
+    assert set(p for _, p, _ in graph_store) == {RDF.type, URIRef("name"), URIRef("age"), URIRef("knows")}
+
+
+def test_read_bound_predicate(graph_store):
+    donna = add_donna(graph_store)
+    assert graph_store.value(donna, FOAF.name) == Literal("Donna Fales")
+    assert graph_store.value(donna, FOAF.knows) == URIRef("https://example.org/edward")
+    assert list(graph_store.subjects(RDF.type, FOAF.Person)) == [donna]
+
+
+def test_read_bound_literal(graph_store):
+    donna = add_donna(graph_store)
+    assert list(graph_store.subjects(FOAF.age, Literal(30))) == [donna]
+    assert list(graph_store.subjects(FOAF.age, Literal(31))) == []
+
+
+def test_read_flushes_pending_batch(graph_store_batched):
+    donna = add_donna(graph_store_batched, commit=False)
+    assert (donna, FOAF.name, Literal("Donna Fales")) in graph_store_batched
+    graph_store_batched.close(True)
@@ -0,0 +1,69 @@
+from rdflib import Literal, RDF, URIRef, Graph
+from rdflib.namespace import FOAF
+from test.integration.constants import GET_DATA_QUERY, GET_RELS_QUERY, RDFLIB_DB
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+DONNA = URIRef("https://example.org/donna")
+EDWARD = URIRef("https://example.org/edward")
+
+
+def add_donna(graph_store):
+    graph_store.add((DONNA, RDF.type, FOAF.Person))
+    graph_store.add((DONNA, FOAF.name, Literal("Donna Fales")))
+    graph_store.add((DONNA, FOAF.knows, EDWARD))
+
+
+def test_remove_label_property_and_relationship(neo4j_driver, graph_store):
+    add_donna(graph_store)
+    graph_store.remove((DONNA, RDF.type, FOAF.Person))
+    graph_store.remove((DONNA, FOAF.name, Literal("Donna Fales")))
+    graph_store.remove((DONNA, FOAF.knows, EDWARD))
+    graph_store.commit()
+    records, _, _ = neo4j_driver.execute_query(GET_DATA_QUERY, database_=RDFLIB_DB)
+    assert len(records) == 2
+    assert set(records[0]["labels"]) == {"Resource"}
+    assert records[0]["props"] == {'uri': 'https://example.org/donna'}
+    rels, _, _ = neo4j_driver.execute_query(GET_RELS_QUERY, database_=RDFLIB_DB)
+    assert len(rels) == 0
+
+
+def test_remove_other_value_keeps_property(neo4j_driver, graph_store):
+    add_donna(graph_store)
+    graph_store.remove((DONNA, FOAF.name, Literal("Someone else")))
+    graph_store.commit()
+    records, _, _ = neo4j_driver.execute_query(GET_DATA_QUERY, database_=RDFLIB_DB)
+    assert records[0]["props"]["name"] == "Donna Fales"
+
+
+def test_remove_pattern_batched(neo4j_driver, graph_store_batched):
+    add_donna(graph_store_batched)
+    graph_store_batched.remove((DONNA, None, None))
+    graph_store_batched.close(True)
+    records, _, _ = neo4j_driver.execute_query(GET_DATA_QUERY, database_=RDFLIB_DB)
+    assert records[0]["props"] == {'uri': 'https://example.org/donna'}
+    rels, _, _ = neo4j_driver.execute_query(GET_RELS_QUERY, database_=RDFLIB_DB)
+    assert len(rels) == 0
+
+
+def test_remove_shrinks_array(neo4j_driver, neo4j_connection_parameters):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                              batching=False)
+    graph_store = Graph(store=Neo4jStore(config=config))
+    graph_store.add((DONNA, FOAF.nick, Literal("D")))
+    graph_store.add((DONNA, FOAF.nick, Literal("DF")))
+    graph_store.remove((DONNA, FOAF.nick, Literal("D")))
+    graph_store.commit()
+    records, _, _ = neo4j_driver.execute_query(GET_DATA_QUERY, database_=RDFLIB_DB)
+    assert records[0]["props"]["nick"] == ["DF"]
+    graph_store.remove((DONNA, FOAF.nick, Literal("DF")))
+    graph_store.commit()
+    records, _, _ = neo4j_driver.execute_query(GET_DATA_QUERY, database_=RDFLIB_DB)
+    assert "nick" not in records[0]["props"]
@@ -0,0 +1,30 @@
+from rdflib import Graph, Literal, RDF, URIRef
+from rdflib.namespace import FOAF
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("grouped", [False, True])
+def test_rows_are_committed_in_server_side_transactions(neo4j_driver, neo4j_connection_parameters, columnar, grouped):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              batching=True,
+                              columnar_params=columnar,
+                              group_rels_by_source=grouped,
+                              server_batch_size=3)
+    graph = Graph(store=Neo4jStore(config=config))
+    for i in range(10):
+        person = URIRef(f"https://example.org/person{i}")
+        graph.add((person, RDF.type, FOAF.Person))
+        graph.add((person, FOAF.name, Literal(f"Person {i}")))
+        graph.add((person, FOAF.knows, URIRef(f"https://example.org/person{(i + 1) % 10}")))
+    graph.close(True)
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Person) OPTIONAL MATCH (n)-[r:knows]->() RETURN count(DISTINCT n) AS nodes, count(r) AS rels")
+    assert (records[0]["nodes"], records[0]["rels"]) == (10, 10)
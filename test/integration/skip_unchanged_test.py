@@ -0,0 +1,62 @@
+from rdflib import Graph, Literal, RDF, URIRef
+from rdflib.namespace import FOAF
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY
+from rdflib_neo4j.config.const import CONTENT_HASH_PROPERTY
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+
+def load(config, ages):
+    graph = Graph(store=Neo4jStore(config=config))
+    for i, age in enumerate(ages):
+        person = URIRef(f"https://example.org/person{i}")
+        graph.add((person, RDF.type, FOAF.Person))
+        graph.add((person, FOAF.age, Literal(age)))
+        graph.add((person, FOAF.knows, URIRef("https://example.org/person0")))
+    graph.close(True)
+
+
+@pytest.mark.parametrize("batching", [False, True])
+def test_reimport_skips_unchanged_subjects(neo4j_driver, neo4j_connection_parameters, batching):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              batching=batching,
+                              skip_unchanged=True)
+    load(config, [30, 40, 50])
+    # A property set outside the store survives on the nodes that are not written again
+    neo4j_driver.execute_query("MATCH (n:Resource) SET n.touched = true")
+
+    load(config, [30, 41, 50])
+    records, _, _ = neo4j_driver.execute_query(
+        f"MATCH (n:Resource) WHERE n.`{CONTENT_HASH_PROPERTY}` IS NOT NULL "
+        "RETURN n.uri AS uri, n.age AS age, n.touched AS touched ORDER BY uri")
+    assert [(r["uri"][-7:], r["age"], r["touched"]) for r in records] == \
+           [("person0", 30, True), ("person1", 41, True), ("person2", 50, True)]
+    records, _, _ = neo4j_driver.execute_query("MATCH ()-[r:knows]->() RETURN count(r) AS count")
+    assert records[0]["count"] == 3
+
+
+def test_removal_drops_the_hash(neo4j_driver, neo4j_connection_parameters):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              batching=True,
+                              skip_unchanged=True)
+    load(config, [30])
+    graph = Graph(store=Neo4jStore(config=config))
+    graph.remove((URIRef("https://example.org/person0"), FOAF.age, Literal(30)))
+    graph.close(True)
+    records, _, _ = neo4j_driver.execute_query(
+        f"MATCH (n:Resource {{uri: 'https://example.org/person0'}}) RETURN n.`{CONTENT_HASH_PROPERTY}` AS hash, n.age AS age")
+    assert records[0]["hash"] is None and records[0]["age"] is None
+
+    load(config, [30])
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Resource {uri: 'https://example.org/person0'}) RETURN n.age AS age")
+    assert records[0]["age"] == 30
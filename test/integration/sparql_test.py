@@ -0,0 +1,54 @@
+from rdflib import Literal, RDF, URIRef
+from rdflib.namespace import FOAF
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+DONNA = URIRef("https://example.org/donna")
+EDWARD = URIRef("https://example.org/edward")
+
+
+def add_people(graph_store):
+    graph_store.add((DONNA, RDF.type, FOAF.Person))
+    graph_store.add((DONNA, FOAF.name, Literal("Donna Fales")))
+    graph_store.add((DONNA, FOAF.age, Literal(30)))
+    graph_store.add((DONNA, FOAF.knows, EDWARD))
+    graph_store.add((EDWARD, RDF.type, FOAF.Person))
+    graph_store.add((EDWARD, FOAF.name, Literal("Edward Scissorhands")))
+    graph_store.add((EDWARD, FOAF.age, Literal(40)))
+    graph_store.commit()
+
+
+def test_sparql_join(graph_store):
+    add_people(graph_store)
+    res = graph_store.query("""
+        PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+        SELECT ?name ?friend_name WHERE {
+            ?p a foaf:Person ; foaf:name ?name ; foaf:knows ?f .
+            ?f foaf:name ?friend_name
+        }""")
+    assert [(str(r.name), str(r.friend_name)) for r in res] == [("Donna Fales", "Edward Scissorhands")]
+
+
+def test_sparql_filter_and_limit(graph_store):
+    add_people(graph_store)
+    res = graph_store.query("""
+        PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+        SELECT ?p WHERE { ?p foaf:age ?age FILTER(?age > 35) } LIMIT 10""")
+    assert [r.p for r in res] == [EDWARD]
+
+
+def test_sparql_residual_filter(graph_store):
+    add_people(graph_store)
+    res = graph_store.query("""
+        PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+        SELECT ?p WHERE { ?p foaf:name ?name FILTER(STRSTARTS(?name, "Donna") && ?p != <https://example.org/x>) }""")
+    assert [r.p for r in res] == [DONNA]
+
+
+def test_sparql_sees_triples_added_without_commit(graph_store_batched):
+    graph_store_batched.add((DONNA, FOAF.nick, Literal("donna")))
+    res = graph_store_batched.query("""
+        PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+        SELECT ?p ?nick WHERE { ?p foaf:nick ?nick }""")
+    assert [(r.p, str(r.nick)) for r in res] == [(DONNA, "donna")]
@@ -0,0 +1,39 @@
+import gzip
+
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY, load_file, sync
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+
+def write_dump(path, people):
+    with gzip.open(path, "wt") as f:
+        for i, age in people.items():
+            person = f"<https://example.org/person{i}>"
+            f.write(f"{person} <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://xmlns.com/foaf/0.1/Person> .\n")
+            f.write(f'{person} <http://xmlns.com/foaf/0.1/age> "{age}"^^<http://www.w3.org/2001/XMLSchema#integer> .\n')
+            f.write(f"{person} <http://xmlns.com/foaf/0.1/knows> <https://example.org/person0> .\n")
+
+
+def test_sync_applies_the_delta(neo4j_driver, neo4j_connection_parameters, tmp_path):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              batching=True)
+    write_dump(tmp_path / "old.nt.gz", {0: 30, 1: 40, 2: 50})
+    write_dump(tmp_path / "new.nt.gz", {0: 30, 1: 41, 3: 60})
+    graph = Graph(store=Neo4jStore(config=config))
+    load_file(graph, tmp_path / "old.nt.gz")
+    graph.commit()
+
+    assert sync(graph, tmp_path / "old.nt.gz", tmp_path / "new.nt.gz", run_size=2, batch_size=2) == (4, 4)
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Person) RETURN n.uri AS uri, n.age AS age ORDER BY uri")
+    assert [(r["uri"][-7:], r["age"]) for r in records] == [("person0", 30), ("person1", 41), ("person3", 60)]
+    records, _, _ = neo4j_driver.execute_query("MATCH ()-[r:knows]->() RETURN count(r) AS count")
+    assert records[0]["count"] == 3
+    graph.close(True)
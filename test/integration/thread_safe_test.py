@@ -0,0 +1,81 @@
+import threading
+
+from rdflib import Graph, Literal, RDF, URIRef
+from rdflib.namespace import FOAF
+from rdflib_neo4j import Neo4jStoreConfig, Neo4jStore, HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
+import pytest
+from test.integration.fixtures import neo4j_container, neo4j_driver, graph_store, graph_store_batched, \
+    cleanup_databases, neo4j_connection_parameters
+
+
+def test_concurrent_parsers(neo4j_driver, neo4j_connection_parameters):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              batching=True,
+                              batch_size=50,
+                              thread_safe=True)
+    graph = Graph(store=Neo4jStore(config=config))
+
+    def parse(part):
+        data = "".join(f'<https://example.org/{part}/person{i}> <http://xmlns.com/foaf/0.1/name> "{part}-{i}" .\n'
+                       f'<https://example.org/{part}/person{i}> <http://xmlns.com/foaf/0.1/age> "{i}"^^<http://www.w3.org/2001/XMLSchema#integer> .\n'
+                       f'<https://example.org/{part}/person{i}> <{RDF.type}> <{FOAF.Person}> .\n'
+                       for i in range(200))
+        graph.parse(data=data, format="nt")
+
+    threads = [threading.Thread(target=parse, args=(f"part{part}",)) for part in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    graph.close(True)
+
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Person) RETURN n.uri AS uri, n.name AS name, n.age AS age")
+    assert len(records) == 800
+    for record in records:
+        part, person = record["uri"].split("/")[-2:]
+        assert record["name"] == f"{part}-{person[len('person'):]}"
+        assert record["age"] == int(person[len("person"):])
+
+
+def test_write_errors_reach_the_threads_with_rows_in_the_batch(neo4j_driver, neo4j_connection_parameters):
+    config = Neo4jStoreConfig(auth_data=neo4j_connection_parameters,
+                              custom_prefixes={},
+                              custom_mappings=[],
+                              multival_props_names=[],
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                              handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                              batching=True,
+                              batch_size=20,
+                              thread_safe=True)
+    graph = Graph(store=Neo4jStore(config=config))
+    errors = {}
+
+    def add(part, bad):
+        try:
+            for i in range(300):
+                person = URIRef(f"https://example.org/{part}/person{i}")
+                graph.add((person, FOAF.name, Literal(f"{part}-{i}")))
+                if bad and i == 150:
+                    # Neo4j arrays can't mix types
+                    graph.add((person, FOAF.name, Literal(i)))
+            graph.commit()
+        except Exception as e:
+            errors[part] = e
+
+    threads = [threading.Thread(target=add, args=(part, part == "bad")) for part in ("good", "bad")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    graph.close(True)
+
+    # A commit raises the errors of every thread, so the one of the bad thread may reach the good one
+    assert errors
+    records, _, _ = neo4j_driver.execute_query(
+        "MATCH (n:Resource) WHERE n.uri STARTS WITH 'https://example.org/good/' RETURN count(n) AS count")
+    assert "good" in errors or records[0]["count"] == 300
@@ -0,0 +1,107 @@
+"""Unit tests for the SPARQL BGP → Cypher compilation used by the custom evaluation hook."""
+
+import pytest
+from rdflib import Literal, URIRef
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.term import Variable
+
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
+from rdflib_neo4j.query_composers.BGPQueryComposer import BGPQueryComposer, EmptyPattern
+
+SCHEMA = "http://schema.org/"
+EX = "http://www.example.org/indiv/"
+PREFIXES = f"PREFIX sch: <{SCHEMA}> PREFIX ex: <{EX}> "
+
+
+def make_config(multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE):
+    return Neo4jStoreConfig(custom_prefixes={}, custom_mappings=[], multival_props_names=[],
+                            handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.SHORTEN,
+                            handle_multival_strategy=multival_strategy)
+
+
+def where_part(query):
+    """Returns the Filter (or BGP) below the projection of a SELECT query."""
+    return prepareQuery(PREFIXES + query).algebra.p.p
+
+
+def make_composer(bgp, bindings=None, vocabulary=(set(), set()), config=None):
+    return BGPQueryComposer(triples=bgp.triples, config=config or make_config(), bindings=bindings or {},
+                            graph_vocabulary=lambda: vocabulary)
+
+
+class TestBGPQueryComposer:
+    def test_join_is_a_single_match(self):
+        bgp = where_part("SELECT * WHERE { ?x a sch:Person ; sch:knows ex:b ; sch:name 'Bob' }")
+        composer = make_composer(bgp)
+        query = composer.write_query()
+        assert query.count("MATCH") == 2
+        assert "[:`sch__knows`]" in query
+        assert "n0:`sch__Person`" in query or "n1:`sch__Person`" in query
+        assert set(composer.params.values()) == {f"{EX}b", "Bob"}
+
+    def test_object_variable_resolved_with_database_vocabulary(self):
+        bgp = where_part("SELECT * WHERE { ?x sch:knows ?y . ?x sch:name ?n }")
+        composer = make_composer(bgp, vocabulary=({"sch__knows"}, {"sch__name"}))
+        query = composer.write_query()
+        assert "-[:`sch__knows`]->" in query
+        assert "n0.`sch__name` AS" in query
+
+    def test_multival_property_is_unwound(self):
+        bgp = where_part("SELECT * WHERE { ?x sch:name ?n }")
+        composer = make_composer(bgp, vocabulary=(set(), {"sch__name"}),
+                                 config=make_config(HANDLE_MULTIVAL_STRATEGY.ARRAY))
+        assert "UNWIND n0.`sch__name` AS" in composer.write_query()
+
+    def test_ambiguous_predicate_is_not_pushed_down(self):
+        bgp = where_part("SELECT * WHERE { ?x sch:knows ?y }")
+        composer = make_composer(bgp, vocabulary=({"sch__knows"}, {"sch__knows"}))
+        with pytest.raises(NotImplementedError):
+            composer.write_query()
+
+    def test_unbound_predicate_is_not_pushed_down(self):
+        with pytest.raises(NotImplementedError):
+            make_composer(where_part("SELECT * WHERE { ?x ?p ?y }")).write_query()
+
+    def test_unknown_predicate_matches_nothing(self):
+        with pytest.raises(EmptyPattern):
+            make_composer(where_part("SELECT * WHERE { ?x sch:unknown ?y }")).write_query()
+
+    def test_context_bindings_become_parameters(self):
+        bgp = where_part("SELECT * WHERE { ?x sch:knows ?y }")
+        composer = make_composer(bgp, bindings={Variable("x"): URIRef(f"{EX}a")},
+                                 vocabulary=({"sch__knows"}, set()))
+        query = composer.write_query()
+        assert "(n0:Resource{ uri : $p0 })" in query
+        assert composer.params["p0"] == f"{EX}a"
+
+    def test_filters_are_pushed_when_possible(self):
+        part = where_part("SELECT * WHERE { ?x sch:age ?a FILTER(?a > 3 && STRLEN(STR(?x)) > 2) }")
+        composer = make_composer(part.p, vocabulary=(set(), {"sch__age"}))
+        query = composer.write_query(filters=BGPQueryComposer.conjuncts(part.expr), limit=10)
+        assert "WITH * WHERE (v0 > $p0)" in query
+        assert query.endswith("LIMIT $p1")
+        assert len(composer.residual_filters) == 1
+
+    def test_offset_is_skipped_by_the_caller_when_records_expand(self):
+        bgp = where_part("SELECT * WHERE { ?x sch:age ?a }")
+        composer = make_composer(bgp, vocabulary=(set(), {"sch__age"}))
+        query = composer.write_query(offset=5, limit=10)
+        assert "SKIP" not in query and query.endswith("LIMIT $p0")
+        assert composer.params["p0"] == 15 and composer.residual_offset == 5
+        composer = make_composer(bgp, vocabulary=(set(), {"sch__age"}),
+                                 config=make_config(HANDLE_MULTIVAL_STRATEGY.ARRAY))
+        query = composer.write_query(offset=5, limit=10)
+        assert query.endswith("SKIP $p0 LIMIT $p1")
+        assert composer.residual_offset == 0
+
+    def test_records_are_read_back_as_bindings(self):
+        bgp = where_part("SELECT * WHERE { ?x a ?type ; sch:name ?n }")
+        composer = make_composer(bgp, vocabulary=(set(), {"sch__name"}))
+        composer.write_query()
+        record = {composer.var_name(Variable("x")): f"{EX}a",
+                  composer.var_name(Variable("type")): "sch__Person",
+                  composer.var_name(Variable("n")): "Alice"}
+        assert composer.read_bindings(record) == [{Variable("x"): URIRef(f"{EX}a"),
+                                                   Variable("type"): URIRef(f"{SCHEMA}Person"),
+                                                   Variable("n"): Literal("Alice")}]
@@ -0,0 +1,76 @@
+"""Unit tests for the compiled form of the store configuration."""
+
+import pytest
+from rdflib import Literal, RDF, URIRef
+
+from rdflib_neo4j.Neo4jTriple import Neo4jTriple
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY, ShortenStrictException
+
+SCHEMA = "http://schema.org/"
+
+
+def compile_config(**kwargs):
+    return Neo4jStoreConfig(custom_prefixes={"sch": SCHEMA}, custom_mappings=kwargs.pop("custom_mappings", []),
+                            **kwargs).compile()
+
+
+class TestCompiledConfig:
+    def test_is_frozen(self):
+        compiled = compile_config()
+        with pytest.raises(AttributeError):
+            compiled.all_multival = True
+        with pytest.raises(TypeError):
+            compiled.mappings[URIRef(f"{SCHEMA}name")] = "label"
+
+    def test_plans_are_cached(self):
+        compiled = compile_config(handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                                  multival_props_names=[("sch", "tag")])
+        assert compiled.property_plan(URIRef(f"{SCHEMA}tag")) == ("sch__tag", True)
+        assert compiled.property_plan(URIRef(f"{SCHEMA}name")) == ("sch__name", False)
+        assert compiled.plans[URIRef(f"{SCHEMA}tag")] == ("sch__tag", True)
+
+    def test_every_property_is_multivalued_without_names(self):
+        compiled = compile_config(handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY)
+        assert compiled.property_plan(URIRef(f"{SCHEMA}name")) == ("sch__name", True)
+
+    def test_mappings_are_resolved(self):
+        compiled = compile_config(handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.MAP,
+                                  custom_mappings=[("sch", "name", "title")])
+        assert str(compiled.name(URIRef(f"{SCHEMA}name"))) == "title"
+        assert compiled.name(URIRef(f"{SCHEMA}age")) == "age"
+
+    def test_unknown_namespace_is_not_cached(self):
+        compiled = compile_config()
+        for _ in range(2):
+            with pytest.raises(ShortenStrictException):
+                compiled.name(URIRef("http://unknown.org/name"))
+        assert not compiled.names
+
+    def test_accumulators_share_the_compiled_config(self):
+        compiled = compile_config(handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                                  multival_props_names=[("sch", "tag")])
+        subject = URIRef("http://www.example.org/indiv/a")
+        triple_obj = Neo4jTriple(uri=subject, prefixes={}, handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.SHORTEN,
+                                 handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY, multival_props_names=[],
+                                 compiled=compiled)
+        triple_obj.parse_triple((subject, URIRef(f"{SCHEMA}tag"), Literal("a")))
+        triple_obj.parse_triple((subject, URIRef(f"{SCHEMA}name"), Literal("A")))
+        triple_obj.parse_triple((subject, RDF.type, URIRef(f"{SCHEMA}Person")))
+        assert triple_obj.extract_params() == {"uri": subject, "sch__name": "A", "sch__tag": ["a"]}
+        assert triple_obj.labels == {"sch__Person"}
+        assert URIRef(f"{SCHEMA}Person") in compiled.names
+
+    def test_mappings_passed_to_parse_triple_are_compiled(self):
+        subject = URIRef("http://www.example.org/indiv/a")
+        triple_obj = Neo4jTriple(uri=subject, prefixes={SCHEMA: "sch"},
+                                 handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.MAP,
+                                 handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE, multival_props_names=[])
+        mappings = {URIRef(f"{SCHEMA}name"): "title"}
+        triple_obj.parse_triple((subject, URIRef(f"{SCHEMA}name"), Literal("A")), mappings=mappings)
+        compiled = triple_obj.compiled
+        triple_obj.parse_triple((subject, URIRef(f"{SCHEMA}age"), Literal(1)), mappings=mappings)
+        assert triple_obj.compiled is compiled
+        triple_obj.parse_triple((subject, URIRef(f"{SCHEMA}name"), Literal("B")), mappings={})
+        params = {str(key): value for key, value in triple_obj.extract_params().items()}
+        assert params == {"uri": subject, "title": "A", "age": 1, "name": "B"}
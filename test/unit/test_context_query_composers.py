@@ -0,0 +1,94 @@
+"""Unit tests for named-graph (context) aware query composition."""
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import HANDLE_CONTEXT_STRATEGY, HANDLE_MULTIVAL_STRATEGY, DEFAULT_GRAPH_URI
+from rdflib_neo4j.query_composers.NodeQueryComposer import NodeQueryComposer
+from rdflib_neo4j.query_composers.RelationshipQueryComposer import RelationshipQueryComposer
+from rdflib_neo4j.query_composers.TripleQueryComposer import TripleQueryComposer
+from rdflib_neo4j.utils import context_to_graph_uri
+
+GRAPH = "http://www.example.org/graphs/g1"
+EX = "http://www.example.org/indiv/"
+
+
+def make_node_composer(context=None, strategy=HANDLE_CONTEXT_STRATEGY.PROPERTY):
+    composer = NodeQueryComposer(labels={"Person"}, handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
+                                 multival_props_predicates=[], context=context, handle_context_strategy=strategy)
+    composer.add_props({"name"})
+    composer.add_query_param({"uri": f"{EX}a", "name": "A"})
+    return composer
+
+
+def make_triple_composer(pattern, strategy, context=GRAPH):
+    config = Neo4jStoreConfig(custom_prefixes={}, custom_mappings=[], multival_props_names=[],
+                              handle_context_strategy=strategy)
+    return TripleQueryComposer(triple_pattern=pattern, config=config, context=context)
+
+
+class TestContextToGraphUri:
+    def test_named_graph_has_its_uri(self):
+        assert context_to_graph_uri(Graph(identifier=URIRef(GRAPH))) == GRAPH
+
+    def test_default_graphs_have_no_uri(self):
+        assert context_to_graph_uri(None) is None
+        assert context_to_graph_uri(Graph()) is None
+        assert context_to_graph_uri(Graph(identifier=DATASET_DEFAULT_GRAPH_ID)) is None
+
+
+class TestWriteComposers:
+    def test_default_graph_is_unchanged(self):
+        composer = make_node_composer()
+        assert "graphUri" not in composer.write_query()
+        assert composer.get_query_parameters() == {"params": composer.query_params}
+
+    def test_property_strategy_identifies_nodes_by_graph(self):
+        composer = make_node_composer(context=GRAPH)
+        assert "MERGE (n:Resource{ uri : param[\"uri\"], graphUri : $graph })" in composer.write_query()
+        assert composer.get_query_parameters()["graph"] == GRAPH
+
+    def test_label_strategy_sets_graph_on_relationships(self):
+        composer = RelationshipQueryComposer("knows", context=GRAPH,
+                                             handle_context_strategy=HANDLE_CONTEXT_STRATEGY.LABEL)
+        composer.add_query_param(from_node=f"{EX}a", to_node=f"{EX}b")
+        query = composer.write_query()
+        assert "(from)-[r:`knows`{ graphUri : $graph }]->(to)" in query
+        assert "MERGE (from:Resource{ uri : param[\"from\"] })" in query
+        assert composer.get_query_parameters() == {"params": [{"from": f"{EX}a", "to": f"{EX}b"}], "graph": GRAPH}
+
+
+class TestReadComposer:
+    def test_property_strategy_filters_by_graph(self):
+        composer = make_triple_composer((None, URIRef("http://schema.org/name"), Literal("A")),
+                                        HANDLE_CONTEXT_STRATEGY.PROPERTY)
+        _, query, params = composer.write_queries()[0]
+        assert query.startswith("MATCH (s:Resource{ graphUri : $graph })")
+        assert params["graph"] == GRAPH
+
+    def test_label_strategy_filters_by_graph_label(self):
+        composer = make_triple_composer((URIRef(f"{EX}a"), None, None), HANDLE_CONTEXT_STRATEGY.LABEL)
+        queries = composer.write_queries()
+        assert all(f"MATCH (s:Resource:`graph:{GRAPH}`{{ uri : $s }})" in query for _, query, _ in queries)
+        label_query = queries[0][1]
+        assert "NOT l STARTS WITH 'graph:'" in label_query
+        assert "[r{ graphUri : $graph }]" in queries[-1][1]
+
+    def test_label_strategy_reads_default_graph_nodes_without_graph_label(self):
+        composer = make_triple_composer((URIRef(f"{EX}a"), None, None), HANDLE_CONTEXT_STRATEGY.LABEL,
+                                        context=DEFAULT_GRAPH_URI)
+        queries = composer.write_queries()
+        assert "graph:urn" not in queries[0][1]
+        assert "WHERE NOT any(l IN labels(s) WHERE l STARTS WITH 'graph:') WITH s" in queries[0][1]
+        assert "NOT any" not in queries[-1][1] and "[r{ graphUri : $graph }]" in queries[-1][1]
+
+    def test_every_graph_returns_the_graphs_of_the_records(self):
+        composer = make_triple_composer((None, None, None), HANDLE_CONTEXT_STRATEGY.PROPERTY, context=None)
+        assert all("[s.`graphUri`] AS graphs" in query for _, query, _ in composer.write_queries())
+        assert composer.read_graphs({"graphs": [GRAPH]}) == [GRAPH]
+        assert composer.read_graphs({"graphs": [DEFAULT_GRAPH_URI]}) == [None]
+        composer = make_triple_composer((None, None, None), HANDLE_CONTEXT_STRATEGY.LABEL, context=None)
+        assert "[r.`graphUri`] AS graphs" in composer.write_queries()[-1][1]
+        assert composer.read_graphs({"graphs": []}) == [None]
+        assert make_triple_composer((None, None, None), HANDLE_CONTEXT_STRATEGY.PROPERTY).read_graphs({}) == [GRAPH]
@@ -0,0 +1,69 @@
+"""Unit tests for the batched removal composers."""
+
+from rdflib import Literal, RDF, URIRef
+
+from rdflib_neo4j.Neo4jTriple import Neo4jTriple
+from rdflib_neo4j.config.const import HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
+from rdflib_neo4j.query_composers.NodeDeleteQueryComposer import NodeDeleteQueryComposer
+from rdflib_neo4j.query_composers.RelationshipDeleteQueryComposer import RelationshipDeleteQueryComposer
+
+EX = "http://www.example.org/indiv/"
+SCHEMA = "http://schema.org/"
+
+
+def make_removal(uri, multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE):
+    return Neo4jTriple(
+        uri=uri,
+        prefixes={},
+        handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+        handle_multival_strategy=multival_strategy,
+        multival_props_names=[],
+        removal=True,
+    )
+
+
+class TestNodeDeleteQueryComposer:
+    def test_removal_keeps_every_single_value(self):
+        removal = make_removal(URIRef(f"{EX}a"))
+        for value in ("A", "B"):
+            removal.parse_triple((URIRef(f"{EX}a"), URIRef(f"{SCHEMA}name"), Literal(value)), mappings={})
+        assert removal.extract_params() == {"uri": URIRef(f"{EX}a"), "name": ["A", "B"]}
+
+    def test_labels_and_props_are_removed(self):
+        removal = make_removal(URIRef(f"{EX}a"))
+        removal.parse_triple((URIRef(f"{EX}a"), RDF.type, URIRef(f"{SCHEMA}Person")), mappings={})
+        removal.parse_triple((URIRef(f"{EX}a"), URIRef(f"{SCHEMA}name"), Literal("A")), mappings={})
+        composer = NodeDeleteQueryComposer(labels=removal.labels,
+                                           handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
+                                           multival_props_predicates=[])
+        composer.add_props(removal.extract_props_names())
+        composer.add_query_param(removal.extract_params())
+        query = composer.write_query()
+        assert "MATCH (n:Resource{ uri : param[\"uri\"] })" in query
+        assert "REMOVE n:`Person`" in query
+        assert "n.`name` IN COALESCE(param[\"name\"], [])" in query
+
+    def test_array_props_are_shrunk(self):
+        composer = NodeDeleteQueryComposer(labels=set(),
+                                           handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                                           multival_props_predicates=[])
+        composer.add_props({"name"}, multi=True)
+        composer.add_query_param({"uri": f"{EX}a", "name": ["A"]})
+        assert "[val IN n.`name` WHERE NOT val IN param[\"name\"]]" in composer.write_query()
+
+    def test_nothing_to_remove_is_redundant(self):
+        composer = NodeDeleteQueryComposer(labels=set(),
+                                           handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
+                                           multival_props_predicates=[])
+        composer.add_query_param({"uri": f"{EX}a"})
+        assert composer.is_redundant()
+
+
+class TestRelationshipDeleteQueryComposer:
+    def test_relationship_is_deleted(self):
+        composer = RelationshipDeleteQueryComposer("knows")
+        composer.add_query_param(from_node=f"{EX}a", to_node=f"{EX}b")
+        query = composer.write_query()
+        assert "-[r:`knows`]->" in query
+        assert query.strip().endswith("DELETE r")
+        assert composer.query_params == [{"from": f"{EX}a", "to": f"{EX}b"}]
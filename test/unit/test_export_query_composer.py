@@ -0,0 +1,95 @@
+"""Unit tests for the paged export of the graph back to RDF."""
+
+import pytest
+from rdflib import Literal, RDF, URIRef, BNode
+
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import HANDLE_CONTEXT_STRATEGY, HANDLE_VOCAB_URI_STRATEGY, DEFAULT_GRAPH_URI
+from rdflib_neo4j.exporter import prefetch
+from rdflib_neo4j.query_composers.ExportQueryComposer import ExportQueryComposer
+
+EX = "http://www.example.org/indiv/"
+SCHEMA = "http://schema.org/"
+
+
+def composer(strategy=HANDLE_CONTEXT_STRATEGY.IGNORE):
+    config = Neo4jStoreConfig(custom_prefixes={"sch": SCHEMA},
+                              handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.SHORTEN,
+                              handle_context_strategy=strategy)
+    return ExportQueryComposer(config, page_size=2)
+
+
+def record(labels=("Resource",), props=None, rels=(), g=""):
+    return {"s": f"{EX}a", "g": g, "labels": list(labels), "props": {"uri": f"{EX}a", **(props or {})},
+            "rels": [list(rel) for rel in rels]}
+
+
+class TestExportQueries:
+    def test_keyset_pagination_on_uri(self):
+        first, params = composer().write_page_query(None)
+        assert "WHERE" not in first and params == {"limit": 2}
+        query, params = composer().write_page_query(f"{EX}a")
+        assert "WHERE s.uri > $after WITH s ORDER BY s.uri LIMIT $limit" in query
+        assert params["after"] == f"{EX}a"
+
+    def test_property_strategy_pages_on_uri_with_every_graph(self):
+        query, params = composer(HANDLE_CONTEXT_STRATEGY.PROPERTY).write_page_query(f"{EX}a")
+        # A range on the uri and an existence check on the graphUri: a seek on the (uri, graphUri) index
+        assert "WHERE s.uri > $after AND s.`graphUri` IS NOT NULL " \
+               "WITH DISTINCT s.uri AS uri ORDER BY uri LIMIT $limit" in query
+        assert "MATCH (s:Resource {uri: uri}) WHERE s.`graphUri` IS NOT NULL" in query
+        assert "COALESCE(s.uri" not in query and params == {"limit": 2, "after": f"{EX}a"}
+
+    def test_next_cursor(self):
+        page = [{"s": f"{EX}a", "g": "g1"}, {"s": f"{EX}b", "g": "g1"}]
+        assert composer().next_cursor(page) == f"{EX}b"
+        assert composer().next_cursor(page[:1]) is None and composer().next_cursor([]) is None
+        # Under PROPERTY the page size counts the uris, not their copies
+        by_graph = composer(HANDLE_CONTEXT_STRATEGY.PROPERTY)
+        assert by_graph.next_cursor(page) == f"{EX}b"
+        assert by_graph.next_cursor([{"s": f"{EX}a", "g": "g1"}, {"s": f"{EX}a", "g": "g2"}]) is None
+
+
+class TestExportQuads:
+    def test_names_are_reversed(self):
+        rec = record(labels=("Resource", "sch__Person"), props={"sch__name": "A", "sch__alt": ["B", "C"]},
+                     rels=[("sch__knows", "bnode://b1", None)])
+        quads = list(composer().read_quads(rec))
+        subject = URIRef(f"{EX}a")
+        assert (subject, RDF.type, URIRef(f"{SCHEMA}Person"), None) in quads
+        assert (subject, URIRef(f"{SCHEMA}name"), Literal("A"), None) in quads
+        assert (subject, URIRef(f"{SCHEMA}alt"), Literal("C"), None) in quads
+        assert (subject, URIRef(f"{SCHEMA}knows"), BNode("b1"), None) in quads
+        assert len(quads) == 5
+
+    def test_property_strategy_uses_the_graph_of_the_node(self):
+        rec = record(props={"graphUri": "http://g/1", "sch__name": "A"}, rels=[("sch__knows", f"{EX}b", None)],
+                     g="http://g/1")
+        quads = list(composer(HANDLE_CONTEXT_STRATEGY.PROPERTY).read_quads(rec))
+        assert {quad[3] for quad in quads} == {"http://g/1"} and len(quads) == 2
+
+    def test_label_strategy_repeats_node_triples_in_each_graph(self):
+        rec = record(labels=("Resource", "graph:http://g/1", "graph:http://g/2", "sch__Person"),
+                     rels=[("sch__knows", f"{EX}b", "http://g/2")])
+        quads = list(composer(HANDLE_CONTEXT_STRATEGY.LABEL).read_quads(rec))
+        assert [quad[3] for quad in quads if quad[1] == RDF.type] == ["http://g/1", "http://g/2"]
+        assert [quad[3] for quad in quads if quad[1] != RDF.type] == ["http://g/2"]
+
+    def test_default_graph_is_written_without_graph(self):
+        rec = record(props={"graphUri": DEFAULT_GRAPH_URI, "sch__name": "A"}, g=DEFAULT_GRAPH_URI)
+        assert [quad[3] for quad in composer(HANDLE_CONTEXT_STRATEGY.PROPERTY).read_quads(rec)] == [None]
+        rec = record(rels=[("sch__knows", f"{EX}b", DEFAULT_GRAPH_URI)])
+        assert [quad[3] for quad in composer(HANDLE_CONTEXT_STRATEGY.LABEL).read_quads(rec)] == [None]
+
+
+class TestPrefetch:
+    def test_items_are_yielded_in_order(self):
+        assert list(prefetch(iter(range(100)), queue_size=2)) == list(range(100))
+
+    def test_errors_reach_the_consumer(self):
+        def failing():
+            yield 1
+            raise ValueError("lost connection")
+
+        with pytest.raises(ValueError):
+            list(prefetch(failing(), queue_size=2))
@@ -0,0 +1,50 @@
+"""Unit tests for the conversion of literals to the values sent to Neo4j."""
+
+import datetime
+
+import pytest
+from neo4j.time import Duration
+from rdflib import Literal, RDF, URIRef, XSD
+
+from rdflib_neo4j.utils import LITERAL_CONVERTERS, literal_to_neo4j_value, neo4j_value_to_literal, \
+    register_literal_converter
+
+
+class TestLiteralConversion:
+    @pytest.mark.parametrize("literal, expected", [
+        (Literal("plain"), "plain"),
+        (Literal("tagged", lang="en"), "tagged"),
+        (Literal("typed", datatype=XSD.string), "typed"),
+        (Literal(5), 5),
+        (Literal(2.5), 2.5),
+        (Literal(True), True),
+        (Literal("1.25", datatype=XSD.decimal), 1.25),
+        (Literal("2020-01-02T03:04:05", datatype=XSD.dateTime), datetime.datetime(2020, 1, 2, 3, 4, 5)),
+        (Literal("2020-01-02", datatype=XSD.date), datetime.date(2020, 1, 2)),
+        (Literal("PT4H", datatype=XSD.dayTimeDuration), datetime.timedelta(hours=4)),
+        (Literal("P1Y2M3DT4H", datatype=XSD.duration), Duration(years=1, months=2, days=3, hours=4)),
+    ])
+    def test_common_datatypes(self, literal, expected):
+        value = literal_to_neo4j_value(literal)
+        assert value == expected and type(value) is type(expected)
+
+    @pytest.mark.parametrize("literal", [
+        Literal("abc", datatype=XSD.integer),
+        Literal("2020", datatype=XSD.gYear),
+        Literal("<b>x</b>", datatype=RDF.HTML),
+    ])
+    def test_unparsed_literals_keep_their_lexical_form(self, literal):
+        value = literal_to_neo4j_value(literal)
+        assert value == str(literal) and type(value) is str
+
+    def test_registered_converter_is_used(self):
+        datatype = URIRef("http://www.example.org/datatypes/celsius")
+        register_literal_converter(datatype, lambda literal: float(literal) + 273.15)
+        try:
+            assert literal_to_neo4j_value(Literal("10", datatype=datatype)) == 283.15
+        finally:
+            del LITERAL_CONVERTERS[datatype]
+
+    def test_durations_are_read_back_as_xsd_duration(self):
+        literal = neo4j_value_to_literal(Duration(years=1, days=3))
+        assert literal.datatype == XSD.duration and str(literal) == "P1Y3D"
@@ -0,0 +1,138 @@
+"""Unit tests for the streaming of compressed RDF files into a graph."""
+
+import bz2
+import contextlib
+import gzip
+import io
+import lzma
+
+import pytest
+from rdflib import Dataset, Graph
+from rdflib.compare import isomorphic
+
+from rdflib_neo4j.loader import ThreadedReader, bulk_load, detect_compression, diff_sorted, load_file, \
+    open_rdf_source, rdf_format, sorted_lines, sync
+
+NT = "".join(f'<http://www.example.org/indiv/s{i}> <http://schema.org/name> "name {i}" .\n' for i in range(500))
+
+
+class TestCompressionDetection:
+    def test_magic_numbers_win_over_the_extension(self):
+        assert detect_compression("data.nt", gzip.compress(b"x")[:8]) == "gzip"
+        assert detect_compression("data.nt.gz", b"<http://") == "gzip"
+        assert detect_compression("data.nt", b"<http://") is None
+
+    def test_format_ignores_the_compression_extension(self):
+        assert rdf_format("dump.nq.bz2") == "nquads"
+        assert rdf_format("dump.ttl.zst") == "turtle"
+        assert rdf_format("dump.nt") == "nt"
+
+
+class TestThreadedReader:
+    def test_reads_every_chunk(self):
+        reader = io.BufferedReader(ThreadedReader(io.BytesIO(NT.encode()), chunk_size=7, queue_size=2))
+        assert reader.read().decode() == NT
+        reader.close()
+
+    def test_errors_reach_the_consumer(self):
+        class Failing(io.RawIOBase):
+            def readinto(self, buffer):
+                raise ValueError("corrupted")
+
+        reader = ThreadedReader(Failing())
+        with pytest.raises(ValueError):
+            reader.read()
+        reader.close()
+
+
+class TestLoadFile:
+    @pytest.mark.parametrize("suffix, opener", [(".nt.gz", gzip.open), (".nt.bz2", bz2.open), (".nt.xz", lzma.open),
+                                                (".nt", open)])
+    @pytest.mark.parametrize("threaded", [True, False])
+    def test_compressed_files_are_streamed(self, tmp_path, suffix, opener, threaded):
+        path = tmp_path / f"data{suffix}"
+        with opener(path, "wt") as f:
+            f.write(NT)
+        graph = load_file(Graph(), path, threaded=threaded, chunk_size=64)
+        assert len(graph) == 500
+
+    def test_quads(self, tmp_path):
+        path = tmp_path / "data.nq.gz"
+        with gzip.open(path, "wt") as f:
+            f.write("<http://ex.org/s> <http://ex.org/p> <http://ex.org/o> <http://ex.org/g> .\n")
+        assert len(list(load_file(Dataset(), path).quads())) == 1
+
+    def test_raw_file_position_is_in_compressed_bytes(self, tmp_path):
+        path = tmp_path / "data.nt.gz"
+        with gzip.open(path, "wt") as f:
+            f.write(NT)
+        with open_rdf_source(path, threaded=False) as (stream, raw):
+            stream.read()
+            assert raw.tell() == path.stat().st_size
+
+
+def write_nt(path, lines):
+    with gzip.open(path, "wt") as f:
+        f.write("# a comment\n\n" + "".join(f"{line}\n" for line in lines))
+
+
+class TestSync:
+    def test_sort_spills_runs(self):
+        lines = [f"line {i % 37:03}" for i in range(100)]
+        with contextlib.ExitStack() as stack:
+            assert list(sorted_lines(iter(lines), stack, run_size=7)) == sorted(lines)
+
+    def test_diff_of_sorted_streams(self):
+        diff = list(diff_sorted(iter(["a", "b", "d"]), iter(["b", "c", "d", "e"])))
+        assert diff == [("a", False), ("c", True), ("e", True)]
+
+    @pytest.mark.parametrize("presorted", [False, True])
+    def test_graph_matches_the_new_dump(self, tmp_path, presorted):
+        old = sorted(f'<http://www.example.org/indiv/s{i:03}> <http://schema.org/name> "name {i}" .' for i in range(50))
+        new = sorted(line for i, line in enumerate(old) if i % 10) + \
+            ['<http://www.example.org/indiv/s999> <http://schema.org/name> "new" .']
+        write_nt(tmp_path / "old.nt.gz", old)
+        write_nt(tmp_path / "new.nt.gz", new)
+        graph = load_file(Graph(), tmp_path / "old.nt.gz")
+        added, removed = sync(graph, tmp_path / "old.nt.gz", tmp_path / "new.nt.gz", presorted=presorted,
+                              run_size=8, batch_size=3)
+        assert (added, removed) == (1, 5)
+        assert isomorphic(graph, load_file(Graph(), tmp_path / "new.nt.gz"))
+
+    def test_unsorted_dump_is_rejected_when_presorted(self, tmp_path):
+        write_nt(tmp_path / "old.nt.gz", ["<http://ex.org/b> <http://ex.org/p> <http://ex.org/o> .",
+                                          "<http://ex.org/a> <http://ex.org/p> <http://ex.org/o> ."])
+        with pytest.raises(ValueError):
+            sync(Graph(), tmp_path / "old.nt.gz", tmp_path / "old.nt.gz", presorted=True)
+
+    def test_quads_are_synced_in_their_graph(self, tmp_path):
+        quad = "<http://ex.org/s> <http://ex.org/p> <http://ex.org/o> <http://ex.org/g{}> ."
+        write_nt(tmp_path / "old.nq.gz", [quad.format(1)])
+        write_nt(tmp_path / "new.nq.gz", [quad.format(2)])
+        dataset = load_file(Dataset(), tmp_path / "old.nq.gz")
+        assert sync(dataset, tmp_path / "old.nq.gz", tmp_path / "new.nq.gz") == (1, 1)
+        assert [str(g) for _, _, _, g in dataset.quads()] == ["http://ex.org/g2"]
+
+
+class TestBulkLoad:
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_errors_are_reported_per_file(self, tmp_path, processes):
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"part{i}.ttl"
+            path.write_text(f"<http://ex.org/s{i}> <http://ex.org/p> {i}, {i + 10} .\n")
+            paths.append(path)
+        (tmp_path / "broken.ttl").write_text("<http://ex.org/s> <http://ex.org/p> .\n")
+        paths.append(tmp_path / "broken.ttl")
+        graph = Graph()
+        report = bulk_load(graph, paths, workers=1 if not processes else 2, processes=processes)
+        assert [report[str(path)] for path in paths[:4]] == [2, 2, 2, 2]
+        assert isinstance(report[str(paths[4])], Exception)
+        assert len(graph) == 8
+
+    def test_quads_keep_their_graph(self, tmp_path):
+        path = tmp_path / "data.nq"
+        path.write_text("<http://ex.org/s> <http://ex.org/p> <http://ex.org/o> <http://ex.org/g> .\n")
+        dataset = Dataset()
+        assert bulk_load(dataset, [path], workers=1, processes=True) == {str(path): 1}
+        assert [str(g) for _, _, _, g in dataset.quads()] == ["http://ex.org/g"]
@@ -0,0 +1,49 @@
+"""Unit tests for the strategies appending multivalued properties to the stored arrays."""
+
+import pytest
+
+from rdflib_neo4j.config.const import HANDLE_MULTIVAL_STRATEGY, HANDLE_MULTIVAL_APPEND_STRATEGY
+from rdflib_neo4j.query_composers.NodeQueryComposer import NodeQueryComposer
+
+EX = "http://www.example.org/indiv/"
+
+
+def write_query(append_strategy, multival_props_predicates=(), create=False):
+    composer = NodeQueryComposer(labels={"Concept"}, handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                                 multival_props_predicates=list(multival_props_predicates), create=create,
+                                 handle_multival_append_strategy=append_strategy)
+    composer.add_props({"altLabel"}, multi=True)
+    if multival_props_predicates:
+        composer.add_props({"prefLabel"})
+    composer.add_query_param({"uri": f"{EX}a", "altLabel": ["A", "B"], "prefLabel": "A"})
+    return composer.write_query()
+
+
+class TestMultivalAppendStrategies:
+    def test_reduce_is_the_default(self):
+        composer = NodeQueryComposer(labels={"Concept"}, handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                                     multival_props_predicates=[])
+        assert composer.handle_multival_append_strategy == HANDLE_MULTIVAL_APPEND_STRATEGY.REDUCE
+        assert "REDUCE" in write_query(HANDLE_MULTIVAL_APPEND_STRATEGY.REDUCE)
+
+    def test_list_comprehension_appends_missing_values(self):
+        query = write_query(HANDLE_MULTIVAL_APPEND_STRATEGY.LIST_COMPREHENSION)
+        assert "REDUCE" not in query
+        assert 'COALESCE(n.`altLabel`,[]) + [val IN param["altLabel"] WHERE ' in query
+
+    def test_apoc_union(self):
+        query = write_query(HANDLE_MULTIVAL_APPEND_STRATEGY.APOC_UNION)
+        assert 'apoc.coll.union(COALESCE(n.`altLabel`,[]), param["altLabel"])' in query
+
+    @pytest.mark.parametrize("predicates", [(), ("http://www.w3.org/2004/02/skos/core#altLabel",)])
+    def test_on_create_overwrite_follows_the_merge(self, predicates):
+        query = write_query(HANDLE_MULTIVAL_APPEND_STRATEGY.ON_CREATE_OVERWRITE, predicates)
+        merge = 'MERGE (n:Resource{ uri : param["uri"] }) '
+        assert f'{merge}ON CREATE SET n.`altLabel` = param["altLabel"] ON MATCH SET n.`altLabel` = ' in query
+        assert query.count("altLabel`,[])") == 1
+        if predicates:
+            assert 'n.`prefLabel` = COALESCE(param["prefLabel"], n.`prefLabel`)' in query
+
+    def test_created_nodes_ignore_the_append_strategy(self):
+        query = write_query(HANDLE_MULTIVAL_APPEND_STRATEGY.ON_CREATE_OVERWRITE, create=True)
+        assert "ON CREATE" not in query and "ON MATCH" not in query
@@ -0,0 +1,105 @@
+"""Unit tests for the reusable per-subject accumulator."""
+
+import pytest
+from rdflib import Literal, RDF, URIRef
+
+from rdflib_neo4j.Neo4jTriple import Neo4jTriple
+from rdflib_neo4j.config.const import HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
+
+EX = "http://www.example.org/indiv/"
+SCHEMA = "http://schema.org/"
+
+
+def make_triple(uri, multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE):
+    return Neo4jTriple(
+        uri=uri,
+        prefixes={},
+        handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+        handle_multival_strategy=multival_strategy,
+        multival_props_names=[],
+    )
+
+
+def parse(triple_obj, predicate, obj):
+    triple_obj.parse_triple((triple_obj.uri, predicate, obj), mappings={})
+
+
+class TestAccumulatorReuse:
+    def test_slots_prevent_new_attributes(self):
+        with pytest.raises(AttributeError):
+            make_triple(URIRef(f"{EX}a")).unknown = 1
+
+    def test_reset_empties_everything(self):
+        triple_obj = make_triple(URIRef(f"{EX}a"))
+        parse(triple_obj, RDF.type, URIRef(f"{SCHEMA}Person"))
+        parse(triple_obj, URIRef(f"{SCHEMA}name"), Literal("A"))
+        parse(triple_obj, URIRef(f"{SCHEMA}knows"), URIRef(f"{EX}b"))
+        triple_obj.reset(URIRef(f"{EX}b"), context="http://www.example.org/graphs/g1")
+        assert triple_obj.uri == URIRef(f"{EX}b")
+        assert triple_obj.context == "http://www.example.org/graphs/g1"
+        assert not triple_obj.labels and not triple_obj.props and not triple_obj.relationships
+        assert triple_obj.extract_label_key() == "Resource"
+
+    def test_emitted_row_survives_reuse(self):
+        triple_obj = make_triple(URIRef(f"{EX}a"), multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY)
+        parse(triple_obj, URIRef(f"{SCHEMA}name"), Literal("A"))
+        parse(triple_obj, URIRef(f"{SCHEMA}name"), Literal("B"))
+        row = triple_obj.emit_params()
+        triple_obj.reset(URIRef(f"{EX}b"))
+        parse(triple_obj, URIRef(f"{SCHEMA}name"), Literal("C"))
+        assert row == {"uri": URIRef(f"{EX}a"), "name": ["A", "B"]}
+        assert triple_obj.emit_params() == {"uri": URIRef(f"{EX}b"), "name": ["C"]}
+
+    def test_label_key_does_not_depend_on_insertion_order(self):
+        first, second = make_triple(URIRef(f"{EX}a")), make_triple(URIRef(f"{EX}b"))
+        for triple_obj, labels in ((first, ("Person", "Agent")), (second, ("Agent", "Person"))):
+            for label in labels:
+                parse(triple_obj, RDF.type, URIRef(f"{SCHEMA}{label}"))
+        assert first.extract_label_key() == second.extract_label_key() == "Agent,Person"
+
+
+class TestMultivalueDedup:
+    def test_duplicates_are_dropped_in_insertion_order(self):
+        triple_obj = make_triple(URIRef(f"{EX}a"), multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY)
+        for label in ("B", "A", "B", "C", "A"):
+            parse(triple_obj, URIRef(f"{SCHEMA}altLabel"), Literal(label))
+        assert triple_obj.emit_params()["altLabel"] == ["B", "A", "C"]
+
+    def test_values_equal_across_types_are_kept(self):
+        triple_obj = make_triple(URIRef(f"{EX}a"), multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY)
+        parse(triple_obj, URIRef(f"{SCHEMA}value"), Literal(1))
+        parse(triple_obj, URIRef(f"{SCHEMA}value"), Literal(True))
+        parse(triple_obj, URIRef(f"{SCHEMA}value"), Literal(1))
+        assert triple_obj.extract_params()["value"] == [1, True]
+
+
+class TestContentHash:
+    def test_does_not_depend_on_triple_order(self):
+        first, second = make_triple(URIRef(f"{EX}a")), make_triple(URIRef(f"{EX}a"))
+        triples = [(RDF.type, URIRef(f"{SCHEMA}Person")), (URIRef(f"{SCHEMA}name"), Literal("A")),
+                   (URIRef(f"{SCHEMA}knows"), URIRef(f"{EX}b")), (URIRef(f"{SCHEMA}knows"), URIRef(f"{EX}c"))]
+        for predicate, obj in triples:
+            parse(first, predicate, obj)
+        for predicate, obj in reversed(triples):
+            parse(second, predicate, obj)
+        assert first.content_hash() == second.content_hash()
+
+    @pytest.mark.parametrize("predicate, obj", [
+        (URIRef(f"{SCHEMA}name"), Literal("B")),
+        (URIRef(f"{SCHEMA}name"), Literal(1)),
+        (URIRef(f"{SCHEMA}knows"), URIRef(f"{EX}c")),
+        (RDF.type, URIRef(f"{SCHEMA}Thing")),
+    ])
+    def test_changes_with_the_content(self, predicate, obj):
+        base = make_triple(URIRef(f"{EX}a"), HANDLE_MULTIVAL_STRATEGY.ARRAY)
+        parse(base, URIRef(f"{SCHEMA}name"), Literal("A"))
+        changed = make_triple(URIRef(f"{EX}a"), HANDLE_MULTIVAL_STRATEGY.ARRAY)
+        parse(changed, URIRef(f"{SCHEMA}name"), Literal("A"))
+        parse(changed, predicate, obj)
+        assert base.content_hash() != changed.content_hash()
+
+    def test_equal_values_of_different_types_differ(self):
+        as_int, as_bool = make_triple(URIRef(f"{EX}a")), make_triple(URIRef(f"{EX}a"))
+        parse(as_int, URIRef(f"{SCHEMA}flag"), Literal(1))
+        parse(as_bool, URIRef(f"{SCHEMA}flag"), Literal(True))
+        assert as_int.content_hash() != as_bool.content_hash()
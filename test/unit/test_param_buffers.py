@@ -0,0 +1,175 @@
+"""Unit tests for the row and columnar query parameter buffers."""
+
+from rdflib_neo4j.config.const import HANDLE_MULTIVAL_STRATEGY
+from rdflib_neo4j.query_composers.NodeQueryComposer import NodeQueryComposer
+from rdflib_neo4j.query_composers.ParamBuffer import ColumnarParamBuffer, in_transactions
+from rdflib_neo4j.query_composers.RelationshipQueryComposer import RelationshipQueryComposer
+from rdflib_neo4j.query_composers.RelationshipDeleteQueryComposer import RelationshipDeleteQueryComposer
+
+EX = "http://www.example.org/indiv/"
+
+
+class TestColumnarParamBuffer:
+    def test_missing_values_are_padded(self):
+        buffer = ColumnarParamBuffer(("uri",))
+        buffer.append({"uri": f"{EX}a", "name": "A"})
+        buffer.append({"uri": f"{EX}b"})
+        buffer.append({"uri": f"{EX}c", "age": 3})
+        assert len(buffer) == 3
+        assert buffer.payload() == {"uri": [f"{EX}a", f"{EX}b", f"{EX}c"], "name": ["A", None, None],
+                                    "age": [None, None, 3]}
+
+    def test_rows_are_rebuilt(self):
+        buffer = ColumnarParamBuffer(("uri",))
+        buffer.append({"uri": f"{EX}a", "name": "A"})
+        buffer.append({"uri": f"{EX}b"})
+        assert list(buffer) == [{"uri": f"{EX}a", "name": "A"}, {"uri": f"{EX}b"}]
+        buffer.clear()
+        assert len(buffer) == 0 and buffer.payload() == {"uri": []}
+
+
+class TestColumnarComposers:
+    def test_node_query_reads_columns_by_index(self):
+        composer = NodeQueryComposer(labels={"Person"}, handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
+                                     multival_props_predicates=[], columnar=True)
+        composer.add_props({"name"})
+        composer.add_query_param({"uri": f"{EX}a", "name": "A"})
+        query = composer.write_query()
+        assert 'UNWIND range(0, size($params["uri"]) - 1) AS i' in query
+        assert 'MERGE (n:Resource{ uri : $params["uri"][i] })' in query
+        assert 'COALESCE($params["name"][i], n.`name`)' in query
+        assert composer.get_query_parameters() == {"params": {"uri": [f"{EX}a"], "name": ["A"]}}
+
+    def test_relationship_query_reads_columns_by_index(self):
+        composer = RelationshipQueryComposer("knows", columnar=True)
+        composer.add_query_param(from_node=f"{EX}a", to_node=f"{EX}b")
+        query = composer.write_query()
+        assert 'UNWIND range(0, size($params["from"]) - 1) AS i' in query
+        assert 'MERGE (to:Resource{ uri : $params["to"][i] })' in query
+        assert composer.get_query_parameters() == {"params": {"from": [f"{EX}a"], "to": [f"{EX}b"]}}
+
+    def test_row_buffer_is_the_default(self):
+        composer = RelationshipQueryComposer("knows")
+        composer.add_query_param(from_node=f"{EX}a", to_node=f"{EX}b")
+        assert "UNWIND $params as param" in composer.write_query()
+        assert composer.get_query_parameters() == {"params": [{"from": f"{EX}a", "to": f"{EX}b"}]}
+
+
+class TestGroupedRelationships:
+    def test_targets_are_grouped_by_start_node(self):
+        composer = RelationshipQueryComposer("knows", grouped=True)
+        composer.add_query_params(from_node=f"{EX}a", to_nodes=[f"{EX}b", f"{EX}c"])
+        query = composer.write_query()
+        assert query.count("MERGE (from:Resource") == 1
+        assert 'UNWIND param["tos"] AS to_uri MERGE (to:Resource{ uri : to_uri })' in query
+        assert composer.get_query_parameters() == {"params": [{"from": f"{EX}a", "tos": [f"{EX}b", f"{EX}c"]}]}
+
+    def test_ungrouped_rows_are_one_per_relationship(self):
+        composer = RelationshipQueryComposer("knows")
+        composer.add_query_params(from_node=f"{EX}a", to_nodes=[f"{EX}b", f"{EX}c"])
+        assert composer.get_query_parameters() == {"params": [{"from": f"{EX}a", "to": f"{EX}b"},
+                                                              {"from": f"{EX}a", "to": f"{EX}c"}]}
+
+    def test_grouped_delete_matches_the_start_node_once(self):
+        composer = RelationshipDeleteQueryComposer("knows", grouped=True, columnar=True)
+        composer.add_query_params(from_node=f"{EX}a", to_nodes=[f"{EX}b"])
+        query = composer.write_query()
+        assert 'UNWIND $params["tos"][i] AS to_uri MATCH (from)-[r:`knows`]->(to:Resource{ uri : to_uri })' in query
+        assert composer.get_query_parameters() == {"params": {"from": [f"{EX}a"], "tos": [[f"{EX}b"]]}}
+
+
+class TestCreateComposers:
+    def test_new_nodes_are_created_without_merging_values(self):
+        composer = NodeQueryComposer(labels={"Person"}, handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY,
+                                     multival_props_predicates=[], create=True)
+        composer.add_props({"name"}, multi=True)
+        composer.add_query_param({"uri": f"{EX}a", "name": ["A"]})
+        query = composer.write_query()
+        assert 'CREATE (n:Resource{ uri : param["uri"] })' in query
+        assert 'SET n.`name` = param["name"]' in query
+        assert "COALESCE" not in query and "REDUCE" not in query
+
+    def test_new_relationships_match_their_ends(self):
+        composer = RelationshipQueryComposer("knows", match_endpoints=True, create=True)
+        composer.add_query_param(from_node=f"{EX}a", to_node=f"{EX}b")
+        query = composer.write_query()
+        assert "MERGE" not in query
+        assert "CREATE (from)-[r:`knows`]->(to)" in query
+
+    def test_flushed_composer_is_redundant(self):
+        composer = NodeQueryComposer(labels={"Person"}, handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
+                                     multival_props_predicates=[])
+        composer.add_props({"name"})
+        composer.add_query_param({"uri": f"{EX}a", "name": "A"})
+        assert not composer.is_redundant()
+        composer.empty_query_params()
+        assert composer.is_redundant()
+
+
+class TestRowSources:
+    def test_payload_can_be_sliced(self):
+        for columnar in (False, True):
+            composer = NodeQueryComposer(labels=set(), handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
+                                         multival_props_predicates=[], columnar=columnar)
+            for i in range(4):
+                composer.add_query_param({"uri": f"{EX}{i}"})
+            payload = composer.get_query_parameters(1, 3)["params"]
+            assert (payload["uri"] if columnar else [row["uri"] for row in payload]) == [f"{EX}1", f"{EX}2"]
+            assert composer.query_params.row(3) == {"uri": f"{EX}3"}
+
+    def test_sources_follow_the_rows(self):
+        composer = RelationshipQueryComposer("knows", track_sources=True)
+        triple = (f"{EX}a", "knows", f"{EX}b")
+        composer.add_query_params(from_node=f"{EX}a", to_nodes=[f"{EX}b", f"{EX}c"], sources={f"{EX}b": triple})
+        assert composer.row_sources(0) == [triple] and composer.row_sources(1) == []
+        composer.empty_query_params()
+        assert composer.sources == []
+
+    def test_sources_are_not_kept_by_default(self):
+        composer = NodeQueryComposer(labels=set(), handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
+                                     multival_props_predicates=[])
+        composer.add_query_param({"uri": f"{EX}a"}, sources=[("s", "p", "o")])
+        assert composer.sources is None and composer.row_sources(0) == []
+
+
+class TestSupernodeScheduling:
+    def test_supernode_rows_come_last_sorted(self):
+        composer = RelationshipQueryComposer("type", track_sources=True)
+        for i in (3, 1, 2):
+            composer.add_query_param(f"{EX}s{i}", f"{EX}hub", source=f"t{i}")
+        composer.add_query_param(f"{EX}a", f"{EX}b", source="ab")
+        assert composer.schedule_supernodes(3) == 1
+        assert [row["from"] for row in composer.query_params] == [f"{EX}a", f"{EX}s1", f"{EX}s2", f"{EX}s3"]
+        assert [composer.row_sources(i) for i in range(4)] == [["ab"], ["t1"], ["t2"], ["t3"]]
+
+    def test_grouped_rows_are_split(self):
+        composer = RelationshipQueryComposer("type", grouped=True, columnar=True)
+        composer.add_query_params(f"{EX}a", [f"{EX}b", f"{EX}hub"])
+        composer.add_query_params(f"{EX}d", [f"{EX}hub"])
+        composer.add_query_params(f"{EX}c", [f"{EX}hub"])
+        assert composer.schedule_supernodes(3) == 1
+        assert list(composer.query_params) == [{"from": f"{EX}a", "tos": [f"{EX}b"]},
+                                               {"from": f"{EX}a", "tos": [f"{EX}hub"]},
+                                               {"from": f"{EX}c", "tos": [f"{EX}hub"]},
+                                               {"from": f"{EX}d", "tos": [f"{EX}hub"]}]
+
+    def test_buffer_is_untouched_without_supernodes(self):
+        composer = RelationshipQueryComposer("type")
+        composer.add_query_param(f"{EX}a", f"{EX}b")
+        assert composer.schedule_supernodes(2) == 1
+        assert composer.query_params.payload() is composer.query_params
+
+
+class TestInTransactions:
+    def test_row_query_is_wrapped_after_its_unwind(self):
+        composer = RelationshipQueryComposer("type")
+        query = in_transactions(composer.write_query(), composer.query_params, 500)
+        assert query.startswith("UNWIND $params as param CALL { WITH param MERGE (from:Resource")
+        assert query.endswith("} IN TRANSACTIONS OF 500 ROWS")
+
+    def test_columnar_query_imports_the_index(self):
+        composer = NodeQueryComposer({"Person"}, HANDLE_MULTIVAL_STRATEGY.OVERWRITE, [], columnar=True)
+        composer.add_props(["name"])
+        query = in_transactions(composer.write_query(), composer.query_params, 100, concurrency=4)
+        assert query.startswith('UNWIND range(0, size($params["uri"]) - 1) AS i CALL { WITH i MERGE')
+        assert query.endswith("} IN 4 CONCURRENT TRANSACTIONS OF 100 ROWS")
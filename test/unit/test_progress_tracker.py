@@ -0,0 +1,38 @@
+"""Unit tests for the progress reports of an import."""
+
+import io
+
+from rdflib_neo4j.ProgressTracker import ProgressTracker, ProgressEvent, CHECK_EVERY
+
+
+class TestProgressTracker:
+    def test_no_check_without_callback(self):
+        assert ProgressTracker(None, 0).next_check == float("inf")
+
+    def test_reports_are_throttled(self):
+        events = []
+        tracker = ProgressTracker(events.append, interval=3600)
+        assert tracker.next_check == CHECK_EVERY
+        tracker.report(CHECK_EVERY, 10, 0)
+        assert not events and tracker.next_check == 2 * CHECK_EVERY
+        tracker.report(2 * CHECK_EVERY, 20, 5, done=True)
+        assert len(events) == 1 and events[0].done and events[0].flushed_rows == 5
+
+    def test_reports_every_interval(self):
+        events = []
+        tracker = ProgressTracker(events.append, interval=0)
+        tracker.report(CHECK_EVERY, 10, 0)
+        assert events[0].triples == CHECK_EVERY and events[0].subjects == 10
+
+    def test_bytes_and_eta(self):
+        tracker = ProgressTracker(None, 0)
+        stream = io.BytesIO(b"x" * 100)
+        tracker.track_input(stream, total_bytes=100)
+        stream.read(25)
+        event = tracker.event(10, 1, 0)
+        assert event.bytes_read == 25 and event.total_bytes == 100
+
+    def test_eta_is_extrapolated_from_the_bytes_read(self):
+        event = ProgressEvent(1000, 100, 0, elapsed=10.0, bytes_read=25, total_bytes=100)
+        assert event.triples_per_second == 100 and event.eta == 30.0
+        assert "25.0% of the input" in repr(event)
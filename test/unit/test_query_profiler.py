@@ -0,0 +1,40 @@
+"""Unit tests for the aggregation of the ResultSummary of the write queries."""
+
+from types import SimpleNamespace
+
+from rdflib_neo4j.QueryProfiler import QueryProfiler, COUNTERS
+
+
+def summary(profile=None, nodes_created=0):
+    counters = SimpleNamespace(**{counter: 0 for counter in COUNTERS})
+    counters.nodes_created = nodes_created
+    return SimpleNamespace(counters=counters, profile=profile, result_available_after=2, result_consumed_after=1)
+
+
+PLAN = {"operatorType": "ProduceResults", "dbHits": 0, "rows": 2,
+        "children": [{"operatorType": "Merge", "dbHits": 10, "rows": 2, "children": []}]}
+
+
+class TestQueryProfiler:
+    def test_counters_are_summed_by_query(self):
+        profiler = QueryProfiler(1.0)
+        profiler.record("NodeQueryComposer", "q1", summary(PLAN, nodes_created=2), True)
+        profiler.record("NodeQueryComposer", "q1", summary(nodes_created=3), False)
+        [stats] = profiler.summary()
+        assert stats["runs"] == 2 and stats["profiled_runs"] == 1
+        assert stats["nodes_created"] == 5 and stats["time_ms"] == 6
+        assert stats["db_hits"] == 10 and stats["rows"] == 4
+        assert stats["plan"]["children"][0] == {"operator": "Merge", "db_hits": 10, "rows": 2, "children": []}
+
+    def test_most_expensive_first(self):
+        profiler = QueryProfiler(1.0)
+        profiler.record("RelationshipQueryComposer", "cheap", summary({"dbHits": 1}), True)
+        profiler.record("NodeQueryComposer", "expensive", summary(PLAN), True)
+        assert [stats["query"] for stats in profiler.summary()] == ["expensive", "cheap"]
+        assert profiler.report().startswith("NodeQueryComposer: 1 runs")
+
+    def test_sampling(self):
+        assert QueryProfiler(1.0).should_profile()
+        profiler = QueryProfiler(0.25, seed=7)
+        sampled = sum(profiler.should_profile() for _ in range(4000))
+        assert 800 < sampled < 1200
@@ -0,0 +1,32 @@
+"""Unit tests for the cache of nodes known to exist and the MATCH-based relationship composer."""
+
+from rdflib_neo4j.SeenUriCache import SeenUriCache
+from rdflib_neo4j.query_composers.RelationshipQueryComposer import RelationshipQueryComposer
+
+EX = "http://www.example.org/indiv/"
+
+
+class TestSeenUriCache:
+    def test_least_recently_used_is_evicted(self):
+        cache = SeenUriCache(max_size=2)
+        cache.update([f"{EX}a", f"{EX}b"])
+        assert f"{EX}a" in cache
+        cache.update([f"{EX}c"])
+        assert f"{EX}b" not in cache
+        assert f"{EX}a" in cache and f"{EX}c" in cache
+        assert len(cache) == 2
+
+
+class TestMatchEndpoints:
+    def test_known_endpoints_are_matched(self):
+        composer = RelationshipQueryComposer("knows", match_endpoints=True)
+        composer.add_query_param(from_node=f"{EX}a", to_node=f"{EX}b")
+        query = composer.write_query()
+        assert "MERGE (from:Resource" not in query and "MERGE (to:Resource" not in query
+        assert 'MATCH (from:Resource{ uri : param["from"] })' in query
+        assert "MERGE (from)-[r:`knows`]->(to)" in query
+
+    def test_written_uris_cover_both_ends(self):
+        composer = RelationshipQueryComposer("knows", grouped=True)
+        composer.add_query_params(from_node=f"{EX}a", to_nodes=[f"{EX}b", f"{EX}c"])
+        assert list(composer.written_uris()) == [f"{EX}a", f"{EX}b", f"{EX}c"]
@@ -0,0 +1,91 @@
+"""Unit tests for the triples() read path: pattern → Cypher translation and vocabulary reversal."""
+
+from rdflib import Literal, RDF, URIRef
+from rdflib.term import BNode
+
+from rdflib_neo4j.config.Neo4jStoreConfig import Neo4jStoreConfig
+from rdflib_neo4j.config.const import HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY, DEFAULT_PREFIXES
+from rdflib_neo4j.query_composers.TripleQueryComposer import TripleQueryComposer, LABEL_SHAPE, PROP_SHAPE, \
+    REL_SHAPE
+from rdflib_neo4j.utils import reverse_vocab_uri, uri_to_node, neo4j_value_to_literal
+
+SCHEMA = "http://schema.org/"
+EX = "http://www.example.org/indiv/"
+
+
+def make_composer(pattern, strategy=HANDLE_VOCAB_URI_STRATEGY.SHORTEN,
+                  multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE):
+    config = Neo4jStoreConfig(custom_prefixes={}, custom_mappings=[], multival_props_names=[],
+                              handle_vocab_uri_strategy=strategy, handle_multival_strategy=multival_strategy)
+    return TripleQueryComposer(triple_pattern=pattern, config=config)
+
+
+class TestWriteQueries:
+    def test_unbound_pattern_uses_every_shape(self):
+        shapes = [shape for shape, _, _ in make_composer((None, None, None)).write_queries()]
+        assert shapes == [LABEL_SHAPE, PROP_SHAPE, REL_SHAPE]
+
+    def test_literal_object_only_reads_properties(self):
+        queries = make_composer((None, URIRef(f"{SCHEMA}name"), Literal("Alice"))).write_queries()
+        assert [shape for shape, _, _ in queries] == [PROP_SHAPE]
+        _, query, params = queries[0]
+        assert "s.`sch__name` = $o" in query
+        assert params == {"o": "Alice"}
+
+    def test_multival_property_uses_list_membership(self):
+        composer = make_composer((None, URIRef(f"{SCHEMA}name"), Literal("Alice")),
+                                 multival_strategy=HANDLE_MULTIVAL_STRATEGY.ARRAY)
+        _, query, _ = composer.write_queries()[0]
+        assert "$o IN s.`sch__name`" in query
+
+    def test_rdf_type_reads_labels(self):
+        queries = make_composer((URIRef(f"{EX}a"), RDF.type, URIRef(f"{SCHEMA}Person"))).write_queries()
+        assert len(queries) == 1
+        shape, query, params = queries[0]
+        assert shape == LABEL_SHAPE
+        assert "s:`sch__Person`" in query
+        assert params == {"s": f"{EX}a", "label": "sch__Person"}
+
+    def test_resource_object_reads_relationships(self):
+        queries = make_composer((None, URIRef(f"{SCHEMA}knows"), BNode("b1"))).write_queries()
+        assert [shape for shape, _, _ in queries] == [REL_SHAPE]
+        _, query, params = queries[0]
+        assert "[r:`sch__knows`]" in query
+        assert params == {"o": "bnode://b1"}
+
+    def test_records_are_read_back_as_triples(self):
+        composer = make_composer((None, None, None))
+        triples = list(composer.read_triples(PROP_SHAPE, {"s": f"{EX}a", "props": {"uri": f"{EX}a",
+                                                                                   "sch__name": ["A", "B"]}}))
+        assert triples == [(URIRef(f"{EX}a"), URIRef(f"{SCHEMA}name"), Literal("A")),
+                           (URIRef(f"{EX}a"), URIRef(f"{SCHEMA}name"), Literal("B"))]
+
+    def test_literal_subject_matches_nothing(self):
+        assert make_composer((Literal("x"), None, None)).write_queries() == []
+
+    def test_unknown_namespace_under_shorten_matches_nothing(self):
+        pattern = (None, URIRef("http://unknown.org/p"), Literal("x"))
+        assert make_composer(pattern).write_queries() == []
+
+
+class TestReverseVocabUri:
+    def test_shorten_is_reversed_with_prefixes(self):
+        res = reverse_vocab_uri("sch__name", {}, DEFAULT_PREFIXES, HANDLE_VOCAB_URI_STRATEGY.SHORTEN)
+        assert res == URIRef(f"{SCHEMA}name")
+
+    def test_map_uses_reversed_mappings(self):
+        mappings = {"name": URIRef(f"{SCHEMA}name")}
+        res = reverse_vocab_uri("name", mappings, DEFAULT_PREFIXES, HANDLE_VOCAB_URI_STRATEGY.MAP)
+        assert res == URIRef(f"{SCHEMA}name")
+
+    def test_keep_returns_the_name(self):
+        res = reverse_vocab_uri(f"{SCHEMA}name", {}, DEFAULT_PREFIXES, HANDLE_VOCAB_URI_STRATEGY.KEEP)
+        assert res == URIRef(f"{SCHEMA}name")
+
+    def test_bnode_uri_is_reversed(self):
+        assert uri_to_node("bnode://b1") == BNode("b1")
+        assert uri_to_node(f"{EX}a") == URIRef(f"{EX}a")
+
+    def test_values_become_typed_literals(self):
+        assert neo4j_value_to_literal(30) == Literal(30)
+        assert neo4j_value_to_literal("Alice") == Literal("Alice")
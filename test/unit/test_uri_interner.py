@@ -0,0 +1,41 @@
+"""Unit tests for the store-scoped URI interning table."""
+
+from rdflib import URIRef
+from rdflib.term import BNode
+
+from rdflib_neo4j.Neo4jTriple import Neo4jTriple
+from rdflib_neo4j.UriInterner import UriInterner
+from rdflib_neo4j.config.const import HANDLE_VOCAB_URI_STRATEGY, HANDLE_MULTIVAL_STRATEGY
+
+EX = "http://www.example.org/indiv/"
+
+
+class TestUriInterner:
+    def test_uris_become_one_plain_str(self):
+        interner = UriInterner(max_size=10)
+        first = interner.intern(URIRef(f"{EX}a"))
+        second = interner.intern(f"{EX}" + "a")
+        assert type(first) is str
+        assert first is second
+        assert len(interner) == 1
+
+    def test_prune_only_past_max_size(self):
+        interner = UriInterner(max_size=2)
+        for name in "ab":
+            interner.intern(f"{EX}{name}")
+        interner.prune()
+        assert len(interner) == 2
+        interner.intern(f"{EX}c")
+        interner.prune()
+        assert len(interner) == 0
+
+    def test_relationship_targets_are_interned(self):
+        interner = UriInterner(max_size=10)
+        triple_obj = Neo4jTriple(uri=interner.intern(URIRef(f"{EX}a")), prefixes={},
+                                 handle_vocab_uri_strategy=HANDLE_VOCAB_URI_STRATEGY.IGNORE,
+                                 handle_multival_strategy=HANDLE_MULTIVAL_STRATEGY.OVERWRITE,
+                                 multival_props_names=[], intern_uri=interner.intern)
+        triple_obj.parse_triple((URIRef(f"{EX}a"), URIRef(f"{EX}knows"), BNode("b1")), mappings={})
+        triple_obj.parse_triple((URIRef(f"{EX}a"), URIRef(f"{EX}likes"), BNode("b1")), mappings={})
+        (knows,), (likes,) = triple_obj.relationships["knows"], triple_obj.relationships["likes"]
+        assert knows is likes is interner.intern("bnode://b1")